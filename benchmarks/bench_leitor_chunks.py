@@ -0,0 +1,211 @@
+"""Benchmark do leitor de chunks do upload: RSS e vazão do MediaFileUpload contra o MediaVideoMapeado
+
+Cada leitor roda num processo filho (o pico de RSS é por processo) que envia o mesmo vídeo
+sintético em N uploads simultâneos para o servidor falso, pela YouTube API de verdade
+(googleapiclient + httplib2). O RSS é amostrado durante o envio e separado em memória anônima
+(alocações do Python) e páginas do arquivo (mmap, que o kernel pode descartar a qualquer hora).
+
+Uso:
+    python benchmarks/bench_leitor_chunks.py --tamanho-mb 256 --chunks-mb 1,8,32 --uploads 4
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from simuladores import ServidorFalso, carregar_bot, criar_cliente_youtube
+
+LEITORES = ['padrao', 'mmap', 'arquivo']
+MB = 1024 * 1024
+
+# ========== MEMÓRIA DO PROCESSO ==========
+
+def memoria_residente():
+    """(RSS total, RSS anônimo) em bytes; no Linux vem de /proc, nos outros sistemas só o pico do getrusage"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            campos = dict(linha.split(':', 1) for linha in f if ':' in linha)
+        total = int(campos['VmRSS'].split()[0]) * 1024
+        anonima = int(campos.get('RssAnon', campos['VmRSS']).split()[0]) * 1024
+        return total, anonima
+    except (OSError, KeyError, ValueError):
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        pico *= 1 if sys.platform == 'darwin' else 1024
+        return pico, pico
+
+class AmostradorMemoria:
+    """Guarda o maior RSS visto enquanto o bloco with roda"""
+    def __init__(self, intervalo=0.002):
+        self.intervalo = intervalo
+        self.base = memoria_residente()
+        self.pico = self.base
+        self._parar = threading.Event()
+        self._thread = threading.Thread(target=self._amostrar, daemon=True)
+
+    def _amostrar(self):
+        while not self._parar.is_set():
+            total, anonima = memoria_residente()
+            self.pico = (max(self.pico[0], total), max(self.pico[1], anonima))
+            time.sleep(self.intervalo)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._parar.set()
+        self._thread.join()
+
+# ========== PROCESSO FILHO ==========
+
+def criar_media(bot_mod, leitor, caminho, chunk):
+    if leitor == 'padrao':
+        from googleapiclient.http import MediaFileUpload
+        return MediaFileUpload(caminho, chunksize=chunk, resumable=True)
+    return bot_mod.MediaVideoMapeado(caminho, chunksize=chunk, usar_mmap=leitor == 'mmap')
+
+def medir_leitor(args):
+    """Roda no filho: N uploads simultâneos do arquivo com um leitor, imprimindo as métricas em JSON"""
+    bot_mod = carregar_bot()
+    chunk = int(args.chunk_mb * MB)
+    clientes = [criar_cliente_youtube(args.url) for _ in range(args.uploads)]
+    erros = []
+
+    def enviar(cliente):
+        media = criar_media(bot_mod, args.leitor, args.arquivo, chunk)
+        try:
+            request = cliente.videos().insert(
+                part='snippet,status',
+                body={'snippet': {'title': 'bench'}, 'status': {'privacyStatus': 'private'}},
+                media_body=media
+            )
+            response = None
+            while response is None:
+                _, response = request.next_chunk()
+        except Exception as e:
+            erros.append(str(e))
+        finally:
+            if hasattr(media, 'fechar'):
+                media.fechar()
+
+    threads = [threading.Thread(target=enviar, args=(cliente,)) for cliente in clientes]
+    with AmostradorMemoria() as amostrador:
+        inicio = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duracao = time.perf_counter() - inicio
+
+    enviados = os.path.getsize(args.arquivo) * args.uploads
+    print(json.dumps({
+        'leitor': args.leitor,
+        'chunk_mb': args.chunk_mb,
+        'uploads': args.uploads,
+        'pico_rss_mb': (amostrador.pico[0] - amostrador.base[0]) / MB,
+        'pico_anonima_mb': (amostrador.pico[1] - amostrador.base[1]) / MB,
+        'mb_por_s': enviados / MB / duracao,
+        'erros': erros,
+    }))
+
+# ========== PROCESSO PRINCIPAL ==========
+
+def gerar_video(pasta, tamanho_mb):
+    caminho = os.path.join(pasta, "video_bench.mp4")
+    bloco = os.urandom(MB)
+    with open(caminho, 'wb') as f:
+        for i in range(tamanho_mb):
+            f.write(i.to_bytes(8, 'big') + bloco[8:])
+    return caminho
+
+def verificar_integridade(bot_mod, caminho, chunk=3 * MB + 17):
+    """Os dois modos do leitor novo entregam exatamente os bytes do arquivo (chunk ímpar de propósito)"""
+    with open(caminho, 'rb') as f:
+        esperado = hashlib.sha256(f.read()).hexdigest()
+    for usar_mmap in (True, False):
+        media = bot_mod.MediaVideoMapeado(caminho, chunksize=chunk, usar_mmap=usar_mmap)
+        obtido = hashlib.sha256()
+        for inicio in range(0, media.size(), chunk):
+            obtido.update(media.getbytes(inicio, chunk))
+        media.fechar()
+        if obtido.hexdigest() != esperado:
+            raise SystemExit(f"❌ Leitor {media.modo} devolveu bytes diferentes do arquivo")
+
+def verificar_truncamento(bot_mod, pasta, chunk=MB):
+    """Um vídeo truncado no meio do envio vira erro comum no modo mmap, sem SIGBUS derrubar o processo"""
+    caminho = os.path.join(pasta, "video_truncado.mp4")
+    with open(caminho, 'wb') as f:
+        f.write(os.urandom(4 * chunk))
+    media = bot_mod.MediaVideoMapeado(caminho, chunksize=chunk, usar_mmap=True)
+    try:
+        media.getbytes(0, chunk)
+        os.truncate(caminho, chunk)
+        try:
+            bytes(media.getbytes(2 * chunk, chunk))
+        except bot_mod.VideoAlteradoDuranteUpload:
+            return
+        raise SystemExit("❌ Leitor mmap não detectou o vídeo truncado")
+    finally:
+        media.fechar()
+
+def principal(args):
+    pasta = tempfile.mkdtemp(prefix="bench_leitor_")
+    servidor = ServidorFalso().iniciar()
+    resultados = []
+    try:
+        caminho = gerar_video(pasta, args.tamanho_mb)
+        bot_mod = carregar_bot()
+        verificar_integridade(bot_mod, caminho)
+        verificar_truncamento(bot_mod, pasta)
+        print(f"✅ Integridade conferida ({args.tamanho_mb} MB, mmap e arquivo) e truncamento detectado")
+
+        for chunk_mb in args.chunks_mb:
+            for leitor in LEITORES:
+                print(f"▶️ {leitor}: {args.uploads} upload(s) com chunks de {chunk_mb:g} MB...")
+                saida = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--filho', leitor, '--url', servidor.url,
+                     '--arquivo', caminho, '--chunk-mb', str(chunk_mb), '--uploads', str(args.uploads)],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                resultados.append(json.loads(saida.strip().splitlines()[-1]))
+    finally:
+        servidor.parar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print(f"\n{'leitor':>9} {'chunk MB':>9} {'uploads':>8} {'pico RSS MB':>12} {'anônima MB':>11} {'MB/s':>8}")
+    for r in resultados:
+        print(f"{r['leitor']:>9} {r['chunk_mb']:>9g} {r['uploads']:>8} {r['pico_rss_mb']:>12.1f} "
+              f"{r['pico_anonima_mb']:>11.1f} {r['mb_por_s']:>8.1f}" + (f"  ❌ {r['erros'][0]}" if r['erros'] else ""))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados salvos em {args.json}")
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark do leitor de chunks do upload")
+    parser.add_argument('--tamanho-mb', type=int, default=256, help="Tamanho do vídeo sintético")
+    parser.add_argument('--chunks-mb', type=lambda v: [float(x) for x in v.split(',')], default=[1, 8, 32],
+                        help="Tamanhos de chunk a comparar, separados por vírgula")
+    parser.add_argument('--uploads', type=int, default=4, help="Uploads simultâneos (como várias vagas)")
+    parser.add_argument('--json', help="Salva os resultados neste arquivo")
+    # Uso interno: processo filho que mede um leitor
+    parser.add_argument('--filho', choices=LEITORES, dest='leitor', help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    parser.add_argument('--arquivo', help=argparse.SUPPRESS)
+    parser.add_argument('--chunk-mb', type=float, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    argumentos = ler_argumentos()
+    if argumentos.leitor:
+        medir_leitor(argumentos)
+    else:
+        principal(argumentos)
@@ -0,0 +1,105 @@
+"""Benchmark da geração de metadados: uma requisição por episódio contra o modo em lote (!lote)
+
+Mede requisições, caracteres de prompt enviados e tempo total para gerar os metadados de vários
+episódios de um mesmo jogo, usando o DeepSeek simulado. Mede também o gerador local, sem rede.
+
+Uso:
+    python benchmarks/bench_lote.py --episodios 10 --latencia-deepseek 1.5
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from simuladores import ServidorFalso, carregar_bot
+
+CONTEXTO = "Neste episódio: exploramos a floresta, encontramos um tesouro antigo e enfrentamos o primeiro chefe.\n"
+
+def criar_pasta(pasta, jogo, episodios):
+    """Vídeos vazios com contexto: o lote só precisa dos nomes e dos .txt"""
+    for episodio in range(1, episodios + 1):
+        base = os.path.join(pasta, f"{jogo} Ep {episodio}")
+        open(f"{base}.mp4", 'wb').close()
+        with open(f"{base}.txt", 'w', encoding='utf-8') as f:
+            f.write(CONTEXTO * 3)
+
+async def medir_individual(bot_mod, pasta, jogo):
+    inicio = time.perf_counter()
+    for video_info in bot_mod.listar_arquivos_vinculados().values():
+        nome_jogo, episodio, _ = bot_mod.analisar_nome_arquivo(video_info['video'])
+        contexto = bot_mod.montar_contexto_video(video_info, nome_jogo, episodio)
+        await bot_mod.gerar_metadados_deepseek(contexto, nome_jogo, episodio)
+    return time.perf_counter() - inicio
+
+def medir_local(bot_mod, repeticoes=200):
+    """Tempo médio do gerador local por episódio (sem rede, então sem servidor)"""
+    contextos = []
+    for video_info in bot_mod.listar_arquivos_vinculados().values():
+        nome_jogo, episodio, _ = bot_mod.analisar_nome_arquivo(video_info['video'])
+        contextos.append((bot_mod.montar_contexto_video(video_info, nome_jogo, episodio), nome_jogo, episodio))
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for contexto, nome_jogo, episodio in contextos:
+            bot_mod.gerar_metadados_local(contexto, nome_jogo, episodio)
+    return (time.perf_counter() - inicio) / (repeticoes * len(contextos))
+
+async def medir_lote(bot_mod, pasta, jogo):
+    inicio = time.perf_counter()
+    resumo, _ = await bot_mod.preparar_lote_metadados(jogo)
+    return time.perf_counter() - inicio, resumo
+
+async def principal(args):
+    bot_mod = carregar_bot()
+    servidor = ServidorFalso(latencia_deepseek=args.latencia_deepseek).iniciar()
+    bot_mod.DEEPSEEK_API_URL = f"{servidor.url}/v1/chat/completions"
+    bot_mod.TAMANHO_LOTE_DEEPSEEK = args.tamanho_lote
+    pasta = tempfile.mkdtemp(prefix="bench_lote_")
+    try:
+        criar_pasta(pasta, args.jogo, args.episodios)
+        bot_mod.PASTA_VIDEOS = pasta
+        bot_mod.ARQUIVO_METADADOS = os.path.join(pasta, "metadados_gerados.json")
+        bot_mod.cache_metadados = None
+        bot_mod.ARQUIVO_GERADORES = os.path.join(pasta, "geradores_metadados.json")
+        bot_mod.config_geradores = None
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            t_individual = await medir_individual(bot_mod, pasta, args.jogo)
+        individual = (servidor.chamadas['deepseek.chat'], servidor.caracteres_prompt)
+        servidor.zerar_contadores()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            t_lote, resumo = await medir_lote(bot_mod, pasta, args.jogo)
+        lote = (servidor.chamadas['deepseek.chat'], servidor.caracteres_prompt)
+        gerados = sum(dados['gerados'] for dados in resumo.values())
+        t_local = medir_local(bot_mod)
+        if bot_mod.sessao_http is not None:
+            await bot_mod.sessao_http.close()
+    finally:
+        servidor.parar()
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    print(f"🧠 {args.episodios} episódios de {args.jogo} (latência do DeepSeek: {args.latencia_deepseek}s)")
+    print(f"   {'modo':<12}{'requisições':>12}{'chars prompt':>14}{'tempo s':>10}")
+    print(f"   {'individual':<12}{individual[0]:>12}{individual[1]:>14}{t_individual:>10.2f}")
+    print(f"   {'lote':<12}{lote[0]:>12}{lote[1]:>14}{t_lote:>10.2f}")
+    print(f"   episódios gerados no lote: {gerados}/{args.episodios}")
+    if lote[1]:
+        print(f"   prompt {individual[1] / lote[1]:.1f}x menor, {t_individual / t_lote:.1f}x mais rápido")
+    print(f"   gerador local (sem rede): {t_local * 1e6:.0f} µs por episódio")
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark da geração de metadados em lote")
+    parser.add_argument('--episodios', type=int, default=10, help="Episódios do mesmo jogo")
+    parser.add_argument('--jogo', default="Hollow Knight", help="Nome do jogo")
+    parser.add_argument('--tamanho-lote', type=int, default=5, help="Episódios por requisição no modo em lote")
+    parser.add_argument('--latencia-deepseek', type=float, default=1.0, help="Latência simulada do DeepSeek (s)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    asyncio.run(principal(ler_argumentos()))
@@ -0,0 +1,120 @@
+"""Benchmark do analisador de nomes de arquivo: precisão e velocidade contra o parser antigo
+
+Compara `analisar_nome_arquivo` (regex única pré-compilada, com cache) com a versão anterior de
+`extrair_info_arquivo` (até cinco re.search + re.sub por nome) num corpus de nomes reais.
+
+Uso:
+    python benchmarks/bench_parser.py --repeticoes 20000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests'))
+from corpus_nomes import CORPUS
+from simuladores import carregar_bot
+
+# ========== PARSER ANTIGO (referência) ==========
+
+def extrair_info_arquivo_legado(nome_arquivo):
+    """Cópia da versão anterior de extrair_info_arquivo, mantida só para comparação"""
+    nome_base = os.path.splitext(nome_arquivo)[0]
+    padroes_episodio = [
+        r'[Ee]p[._\s]*(\d+)',
+        r'[Ee]pisodio[._\s]*(\d+)',
+        r'[Pp]arte[._\s]*(\d+)',
+        r'[\._\-](\d+)[\._\-]',
+        r'\s(\d+)\s',
+    ]
+    numero_episodio = None
+    nome_jogo = nome_base
+    for padrao in padroes_episodio:
+        match = re.search(padrao, nome_base)
+        if match:
+            numero_episodio = int(match.group(1))
+            nome_jogo = re.sub(padrao, '', nome_base).strip()
+            nome_jogo = re.sub(r'[\._\-]\s*$', '', nome_jogo).strip()
+            break
+    if numero_episodio is None:
+        match = re.search(r'(\d+)$', nome_base)
+        if match:
+            numero_episodio = int(match.group(1))
+            nome_jogo = nome_base[:-len(match.group(1))].strip()
+            nome_jogo = re.sub(r'[\._\-]\s*$', '', nome_jogo).strip()
+    return nome_jogo, numero_episodio
+
+# ========== MEDIÇÕES ==========
+
+def medir_precisao(bot_mod):
+    """Conta acertos de (jogo, episódio) nos dois parsers e de (jogo, episódio, parte) no novo"""
+    acertos_legado = acertos_novo = acertos_novo_completo = 0
+    erros = []
+    for nome, jogo, episodio, parte in CORPUS:
+        esperado = (jogo, episodio if episodio is not None else parte)
+        legado = extrair_info_arquivo_legado(nome)
+        novo = bot_mod.analisar_nome_arquivo(nome)
+        acertos_legado += legado == esperado
+        acertos_novo += bot_mod.extrair_info_arquivo(nome) == esperado
+        acertos_novo_completo += novo == (jogo, episodio, parte)
+        if novo != (jogo, episodio, parte):
+            erros.append((nome, novo, (jogo, episodio, parte)))
+    return acertos_legado, acertos_novo, acertos_novo_completo, erros
+
+def gerar_nomes(repeticoes):
+    """Variações do corpus com números diferentes, para medir sem a ajuda do cache"""
+    nomes = []
+    for i in range(repeticoes):
+        nome = CORPUS[i % len(CORPUS)][0]
+        nomes.append(nome.replace("Ep 3", f"Ep {i}").replace("#5", f"#{i}") if i >= len(CORPUS) else nome)
+    # Nomes únicos: o sufixo impede que o cache devolva resultados prontos
+    return [f"{os.path.splitext(n)[0]} {chr(65 + i % 26)}{i}.mp4" for i, n in enumerate(nomes)]
+
+def cronometrar(funcao, nomes, rodadas=5, antes=None):
+    """Melhor tempo entre algumas rodadas (a máquina pode estar ocupada com outra coisa)"""
+    melhor = float('inf')
+    for _ in range(rodadas):
+        if antes:
+            antes()
+        inicio = time.perf_counter()
+        for nome in nomes:
+            funcao(nome)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def principal(args):
+    bot_mod = carregar_bot()
+
+    acertos_legado, acertos_novo, acertos_completo, erros = medir_precisao(bot_mod)
+    total = len(CORPUS)
+    print(f"🎯 Precisão em {total} nomes reais")
+    print(f"   parser antigo (jogo, episódio):        {acertos_legado:>3}/{total}")
+    print(f"   parser novo   (jogo, episódio):        {acertos_novo:>3}/{total}")
+    print(f"   parser novo   (jogo, episódio, parte): {acertos_completo:>3}/{total}")
+    for nome, obtido, esperado in erros:
+        print(f"   ❌ {nome!r}: {obtido} (esperado {esperado})")
+
+    nomes = gerar_nomes(args.repeticoes)
+    # O cache guarda 4096 nomes; a parte "em cache" mede os últimos já analisados
+    n_quente = min(len(nomes), 4096)
+    recentes = nomes[-n_quente:]
+    t_legado = cronometrar(extrair_info_arquivo_legado, nomes)
+    t_frio = cronometrar(bot_mod.analisar_nome_arquivo, nomes, antes=bot_mod.analisar_nome_arquivo.cache_clear)
+    t_quente = cronometrar(bot_mod.analisar_nome_arquivo, recentes)
+    t_lote = cronometrar(lambda lote: bot_mod.analisar_nomes_arquivos(lote), [recentes])
+
+    print(f"\n⏱️ Velocidade ({len(nomes)} nomes distintos)")
+    print(f"   parser antigo:            {t_legado / len(nomes) * 1e6:8.2f} µs/nome")
+    print(f"   parser novo (sem cache):  {t_frio / len(nomes) * 1e6:8.2f} µs/nome  ({t_legado / t_frio:.1f}x)")
+    print(f"   parser novo (em cache):   {t_quente / n_quente * 1e6:8.2f} µs/nome")
+    print(f"   lote de {n_quente} (em cache): {t_lote * 1000:8.2f} ms")
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark do analisador de nomes de arquivo")
+    parser.add_argument('--repeticoes', type=int, default=20000, help="Quantidade de nomes distintos cronometrados")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    principal(ler_argumentos())
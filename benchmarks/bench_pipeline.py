@@ -0,0 +1,291 @@
+"""Benchmark offline do pipeline completo do bot (listar → metadados → fila → upload → limpeza)
+
+Roda as funções reais do bot contra simuladores locais: um servidor HTTP que imita o upload
+resumível do YouTube e o DeepSeek, e um canal do Discord em memória.
+
+Uso:
+    python benchmarks/bench_pipeline.py --tamanhos 1,10,100,500 --tamanho-kb 512
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from simuladores import (AsyncioAcelerado, CanalFalso, ContextoFalso, ServidorFalso,
+                         carregar_bot, criar_cliente_youtube)
+
+JOGOS = ["Hollow Knight", "Elden Ring", "Celeste", "Outer Wilds", "Hades"]
+
+def percentil(valores, p):
+    """Percentil por posição mais próxima (valores não precisam estar ordenados)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+def _atomo(tipo, *filhos):
+    corpo = b"".join(filhos)
+    return struct.pack('>I4s', 8 + len(corpo), tipo) + corpo
+
+def cabecalho_mp4_sintetico(duracao_s=600, largura=1920, altura=1080):
+    """Monta ftyp + moov mínimos (mvhd, trak com tkhd/hdlr/stsd) que a sonda do bot aceita"""
+    ftyp = _atomo(b'ftyp', b'isom', struct.pack('>I', 512), b'isomavc1')
+    mvhd = _atomo(b'mvhd', struct.pack('>IIIII', 0, 0, 0, 1000, duracao_s * 1000), bytes(80))
+    tkhd = _atomo(b'tkhd', bytes(76), struct.pack('>II', largura << 16, altura << 16))
+    hdlr = _atomo(b'hdlr', bytes(8), b'vide', bytes(12), b'Video\x00')
+    stsd = _atomo(b'stsd', struct.pack('>II', 0, 1), struct.pack('>I4s', 16, b'avc1'), bytes(8))
+    trak = _atomo(b'trak', tkhd, _atomo(b'mdia', hdlr, _atomo(b'minf', _atomo(b'stbl', stsd))))
+    return ftyp + _atomo(b'moov', mvhd, trak)
+
+def jpeg_sintetico(largura=1280, altura=720, preenchimento_kb=32):
+    """JPEG com cabeçalho SOF0 válido seguido de dados aleatórios"""
+    sof0 = b"\xff\xc0" + struct.pack('>HBHHB', 11, 8, altura, largura, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + sof0 + b"\xff\xda\x00\x02" + os.urandom(preenchimento_kb * 1024) + b"\xff\xd9"
+
+def gerar_videos_sinteticos(pasta, quantidade, tamanho_kb):
+    """Cria pacotes vídeo + contexto + thumbnail com nomes no padrão usado pelos canais"""
+    bloco = os.urandom(64 * 1024)
+    cabecalho = cabecalho_mp4_sintetico()
+    for i in range(quantidade):
+        jogo = JOGOS[i % len(JOGOS)]
+        nome_base = f"{jogo} Ep {i // len(JOGOS) + 1}"
+        with open(os.path.join(pasta, f"{nome_base}.mp4"), 'wb') as f:
+            f.write(cabecalho)
+            restante = max(0, tamanho_kb * 1024 - len(cabecalho) - 8)
+            f.write(struct.pack('>I4s', restante + 8, b'mdat'))
+            # Conteúdo distinto por episódio, senão o bot recusa os vídeos como duplicados
+            bloco_video = i.to_bytes(8, 'big') + bloco[8:]
+            while restante > 0:
+                f.write(bloco_video[:min(restante, len(bloco_video))])
+                restante -= len(bloco_video)
+        with open(os.path.join(pasta, f"{nome_base}.txt"), 'w', encoding='utf-8') as f:
+            f.write(f"Neste episódio de {jogo}: exploramos uma nova área e enfrentamos um chefe.\n")
+        with open(os.path.join(pasta, f"{nome_base}.jpg"), 'wb') as f:
+            f.write(jpeg_sintetico())
+
+class Cronometro:
+    """Envolve funções assíncronas do bot e guarda a duração de cada chamada"""
+    def __init__(self):
+        self.duracoes = defaultdict(list)
+
+    def envolver(self, modulo, nome, ao_terminar=None):
+        original = getattr(modulo, nome)
+
+        async def envolvida(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return await original(*args, **kwargs)
+            finally:
+                self.duracoes[nome].append(time.perf_counter() - inicio)
+                if ao_terminar:
+                    ao_terminar(*args, **kwargs)
+
+        setattr(modulo, nome, envolvida)
+        return original
+
+def escrever_perfis(pasta, quantidade, vagas):
+    """Cria um perfis_youtube.json que reparte os jogos sintéticos entre `quantidade` contas"""
+    perfis = {
+        f"conta{i + 1}": {
+            'credentials': os.path.join(pasta, f"credentials{i + 1}.json"),
+            'token': os.path.join(pasta, f"token{i + 1}.json"),
+            'vagas': vagas,
+            'jogos': JOGOS[i::quantidade],
+        }
+        for i in range(quantidade)
+    }
+    arquivo = os.path.join(pasta, "perfis_youtube.json")
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump({'perfis': perfis}, f)
+    return arquivo
+
+async def executar_rodada(bot_mod, servidor, quantidade, args):
+    """Executa o pipeline para `quantidade` vídeos e devolve as métricas da rodada"""
+    pasta = tempfile.mkdtemp(prefix="bench_videos_")
+    gerar_videos_sinteticos(pasta, quantidade, args.tamanho_kb)
+
+    canal = CanalFalso(bot_mod.CANAL_DISCORD_ID, latencia=args.latencia_discord)
+    ctx = ContextoFalso(canal)
+    servidor.zerar_contadores()
+
+    # Estado global do bot zerado a cada rodada (a fila se prende ao loop em uso)
+    bot_mod.PASTA_VIDEOS = pasta
+    bot_mod.ARQUIVO_IMPRESSOES = os.path.join(pasta, "impressoes_uploads.json")
+    bot_mod.registro_impressoes = None
+    bot_mod.ARQUIVO_COTA = os.path.join(pasta, "cota_youtube.json")
+    bot_mod.COTA_DIARIA_YOUTUBE = 10**9  # Cota real seguraria a fila após 6 vídeos
+    bot_mod.registro_cota = None
+    bot_mod.ARQUIVO_BANDA = os.path.join(pasta, "banda_upload.json")
+    bot_mod.LIMITE_BANDA_GLOBAL_MBPS = args.banda_mbps
+    bot_mod.limitador_banda = None
+    bot_mod.ARQUIVO_PERFIS = escrever_perfis(pasta, args.perfis, args.vagas)
+    bot_mod.perfis_youtube = None
+    bot_mod.ARQUIVO_HISTORICO = os.path.join(pasta, "historico_uploads.db")
+    bot_mod.historico_uploads = None
+    bot_mod.ARQUIVO_METADADOS = os.path.join(pasta, "metadados_gerados.json")
+    bot_mod.cache_metadados = None
+    bot_mod.fila_ativa.clear()
+    bot_mod.quadro_fila_global = None
+    bot_mod.bot.gerenciador_fila_iniciado = True
+    bot_mod.bot.get_channel = lambda _id: canal
+
+    cronometro = Cronometro()
+    inicio_tarefa = {}
+    fim_tarefa = {}
+    concluidos = asyncio.Event()
+
+    def ao_concluir(tarefa, resultado):
+        fim_tarefa[tarefa.id_tarefa] = time.perf_counter()
+        if len(fim_tarefa) >= quantidade:
+            concluidos.set()
+
+    originais = {
+        nome: cronometro.envolver(bot_mod, nome, ao_concluir if nome == 'notificar_conclusao_upload' else None)
+        for nome in ('gerar_metadados_deepseek', 'upload_youtube_real',
+                     'notificar_conclusao_upload', 'excluir_arquivos_video')
+    }
+
+    # Monitor do próprio bot, com amostragem mais fina que a de produção
+    bot_mod.monitor_loop = bot_mod.MonitorLoop(intervalo=0.01, limite_bloqueio=args.limite_bloqueio)
+    bot_mod.monitor_loop.iniciar()
+    gerenciador = asyncio.ensure_future(bot_mod.gerenciador_fila_uploads())
+
+    inicio = time.perf_counter()
+    try:
+        t_listar = time.perf_counter()
+        arquivos = bot_mod.listar_arquivos_vinculados()
+        duracao_listar = time.perf_counter() - t_listar
+
+        for nome, info in arquivos.items():
+            nome_jogo, numero_episodio = bot_mod.extrair_info_arquivo(os.path.basename(info['video']))
+            with open(info['contexto'], 'r', encoding='utf-8') as f:
+                contexto = f"Jogo: {nome_jogo}\nContexto Adicional: {f.read()}"
+            titulo, descricao = await bot_mod.gerar_metadados_deepseek(contexto, nome_jogo, numero_episodio)
+            tarefa = await bot_mod.adicionar_na_fila(ctx, info, titulo, descricao, info.get('thumb'), "imediato")
+            inicio_tarefa[tarefa.id_tarefa] = time.perf_counter()
+
+        await asyncio.wait_for(concluidos.wait(), timeout=args.timeout)
+    finally:
+        total = time.perf_counter() - inicio
+        gerenciador.cancel()
+        await asyncio.gather(gerenciador, return_exceptions=True)
+        metricas = bot_mod.coletar_metricas()
+        bot_mod.monitor_loop.parar()
+        if bot_mod.sessao_http is not None:
+            await bot_mod.sessao_http.close()
+        for nome, original in originais.items():
+            setattr(bot_mod, nome, original)
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    latencias = [fim_tarefa[i] - inicio_tarefa[i] for i in fim_tarefa if i in inicio_tarefa]
+    megabytes = quantidade * args.tamanho_kb / 1024
+
+    return {
+        'videos': quantidade,
+        'duracao_total_s': total,
+        'listagem_s': duracao_listar,
+        'videos_por_s': quantidade / total if total else 0.0,
+        'mb_por_s': megabytes / total if total else 0.0,
+        'latencia_tarefa_s': {f"p{p}": percentil(latencias, p) for p in (50, 95, 99)},
+        'etapas_s': {
+            nome: {'p50': percentil(valores, 50), 'p95': percentil(valores, 95), 'chamadas': len(valores)}
+            for nome, valores in cronometro.duracoes.items()
+        },
+        'loop_lag_s': {
+            'max': metricas['loop']['atraso_max_ms'] / 1000,
+            'p99': metricas['loop']['atraso_p99_ms'] / 1000,
+            'amostras': metricas['loop']['amostras'],
+            'bloqueios': metricas['loop']['bloqueios'],
+        },
+        'pilhas_bloqueio': [b['pilha'] for b in bot_mod.monitor_loop.bloqueios],
+        'metricas_bot': metricas,
+        'chamadas_api': dict(servidor.chamadas),
+        'chamadas_discord': dict(canal.chamadas),
+    }
+
+def imprimir_relatorio(resultados):
+    print()
+    print(f"{'vídeos':>7} {'total s':>9} {'víd/s':>8} {'MB/s':>8} {'p50 s':>8} {'p95 s':>8} "
+          f"{'p99 s':>8} {'lag max ms':>11} {'lag p99 ms':>11}")
+    for r in resultados:
+        lat = r['latencia_tarefa_s']
+        lag = r['loop_lag_s']
+        print(f"{r['videos']:>7} {r['duracao_total_s']:>9.2f} {r['videos_por_s']:>8.2f} {r['mb_por_s']:>8.2f} "
+              f"{lat['p50']:>8.3f} {lat['p95']:>8.3f} {lat['p99']:>8.3f} "
+              f"{lag['max'] * 1000:>11.1f} {lag['p99'] * 1000:>11.1f}")
+
+    for r in resultados:
+        print(f"\n📊 {r['videos']} vídeo(s)")
+        for nome, etapa in r['etapas_s'].items():
+            print(f"   {nome:<28} p50={etapa['p50'] * 1000:8.1f} ms  p95={etapa['p95'] * 1000:8.1f} ms  n={etapa['chamadas']}")
+        print(f"   Bloqueios do loop (> limite): {r['loop_lag_s']['bloqueios']}")
+        print(f"   API: {json.dumps(r['chamadas_api'], ensure_ascii=False)}")
+        print(f"   Discord: {json.dumps(r['chamadas_discord'], ensure_ascii=False)}")
+
+async def principal(args):
+    bot_mod = carregar_bot()
+    bot_mod.asyncio = AsyncioAcelerado(args.escala_pausas)
+
+    servidor = ServidorFalso(latencia_deepseek=args.latencia_deepseek, latencia_chunk=args.latencia_chunk).iniciar()
+    # Um cliente por vaga, como no bot (httplib2 não é thread-safe)
+    bot_mod.autenticar_youtube = lambda *a, **k: criar_cliente_youtube(servidor.url)
+    bot_mod.DEEPSEEK_API_URL = f"{servidor.url}/v1/chat/completions"
+
+    resultados = []
+    try:
+        for quantidade in args.tamanhos:
+            print(f"▶️ Rodando pipeline com {quantidade} vídeo(s)...")
+            if args.verboso:
+                resultados.append(await executar_rodada(bot_mod, servidor, quantidade, args))
+            else:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resultados.append(await executar_rodada(bot_mod, servidor, quantidade, args))
+    finally:
+        servidor.parar()
+
+    imprimir_relatorio(resultados)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados salvos em {args.json}")
+
+def ler_argumentos():
+    parser = argparse.ArgumentParser(description="Benchmark offline do pipeline de uploads")
+    parser.add_argument('--tamanhos', default="1,10,50",
+                        type=lambda v: [int(x) for x in v.split(',') if x.strip()],
+                        help="Tamanhos de fila a medir (1 a 500), separados por vírgula")
+    parser.add_argument('--tamanho-kb', type=int, default=512, help="Tamanho de cada vídeo sintético em KB")
+    parser.add_argument('--escala-pausas', type=float, default=0.001,
+                        help="Fator aplicado às pausas de 1 s ou mais do bot (UX e polling)")
+    parser.add_argument('--latencia-deepseek', type=float, default=0.05, help="Latência simulada do DeepSeek (s)")
+    parser.add_argument('--latencia-chunk', type=float, default=0.0, help="Latência simulada por chunk enviado (s)")
+    parser.add_argument('--latencia-discord', type=float, default=0.0, help="Latência simulada por chamada ao Discord (s)")
+    parser.add_argument('--perfis', type=int, default=1, help="Contas do YouTube simuladas (jogos repartidos entre elas)")
+    parser.add_argument('--vagas', type=int, default=1, help="Uploads simultâneos por conta")
+    parser.add_argument('--banda-mbps', type=float, default=0.0, help="Limite global de banda do bot (Mbps, 0 = sem limite)")
+    parser.add_argument('--limite-bloqueio', type=float, default=0.05,
+                        help="Duração (s) a partir da qual um callback conta como bloqueio do loop")
+    parser.add_argument('--timeout', type=float, default=1800, help="Tempo máximo por rodada (s)")
+    parser.add_argument('--json', help="Arquivo para salvar os resultados em JSON")
+    parser.add_argument('--verboso', action='store_true', help="Mostra os logs do bot durante as rodadas")
+    args = parser.parse_args()
+
+    if any(not 1 <= n <= 500 for n in args.tamanhos):
+        parser.error("--tamanhos aceita apenas valores entre 1 e 500")
+    if not 1 <= args.perfis <= len(JOGOS):
+        parser.error(f"--perfis aceita valores entre 1 e {len(JOGOS)}")
+    return args
+
+if __name__ == "__main__":
+    asyncio.run(principal(ler_argumentos()))
@@ -0,0 +1,330 @@
+"""Simuladores locais (YouTube, DeepSeek e Discord) usados pelos benchmarks do bot"""
+import asyncio
+import importlib.util
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMINHO_BOT = os.path.join(RAIZ_PROJETO, "youtube-auto-post-discord.py")
+
+# ========== CARREGAMENTO DO BOT ==========
+
+def carregar_bot():
+    """Importa o script do bot como módulo (o nome do arquivo tem hífens)"""
+    # O bot encerra na importação se não houver token; os simuladores não precisam de um real
+    os.environ.setdefault('DISCORD_BOT_TOKEN', 'token-benchmark')
+    os.environ.setdefault('DEEPSEEK_API_KEY', 'chave-benchmark')
+
+    spec = importlib.util.spec_from_file_location("youtube_auto_post_discord", CAMINHO_BOT)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+class AsyncioAcelerado:
+    """Encaminha tudo para o asyncio, mas comprime as pausas longas do bot (UX e polling)"""
+    def __init__(self, escala):
+        self._escala = escala
+
+    def __getattr__(self, nome):
+        return getattr(asyncio, nome)
+
+    def sleep(self, atraso, *args, **kwargs):
+        # Pausas curtas (amostradores, limitadores) continuam reais
+        if atraso >= 1:
+            atraso *= self._escala
+        return asyncio.sleep(atraso, *args, **kwargs)
+
+# ========== SERVIDOR FALSO (YOUTUBE + DEEPSEEK) ==========
+
+TITULO_DEEPSEEK = "🎮 {jogo} - Episódio {episodio}: Segredos da Floresta"
+DESCRICAO_DEEPSEEK = """🎮 {jogo} - Episódio {episodio}: Segredos da Floresta
+
+📖 Sinopse
+Uma jornada silenciosa por caminhos esquecidos.
+Cada passo revela algo novo sobre o mundo.
+
+🎯 Neste Episódio:
+• 🗺️ Exploração
+• ⚔️ Combate
+• 🧩 Quebra-cabeças
+• 🎯 Objetivos
+• 💡 Descobertas
+
+💡 Nada é o que parece."""
+HASHTAGS_DEEPSEEK = ["#Gameplay", "#Gaming", "#GameplayPTBR"]
+
+TAMANHO_PEDACO_SSE = 24  # Caracteres por evento no streaming, como os poucos tokens de cada delta real
+
+def metadados_deepseek(jogo, episodio):
+    return {
+        'titulo': TITULO_DEEPSEEK.format(jogo=jogo, episodio=episodio),
+        'descricao': DESCRICAO_DEEPSEEK.format(jogo=jogo, episodio=episodio),
+        'hashtags': HASHTAGS_DEEPSEEK,
+    }
+
+def responder_episodio(prompt):
+    """Resposta JSON do modo de um episódio por requisição"""
+    achado = re.search(r'Nome do Jogo: (.+)', prompt)
+    jogo = achado.group(1).strip() if achado else "Jogo"
+    achado = re.search(r'Número do Episódio: (\d+)', prompt)
+    episodio = int(achado.group(1)) if achado else 1
+    return json.dumps(metadados_deepseek(jogo, episodio), ensure_ascii=False)
+
+def responder_lote(prompt):
+    """Resposta JSON do modo em lote: um item por "### Episódio N" do prompt"""
+    achado = re.search(r'DO JOGO "(.+?)"', prompt)
+    jogo = achado.group(1) if achado else "Jogo"
+    episodios = [int(n) for n in re.findall(r'^### Episódio (\d+)', prompt, re.MULTILINE)]
+    itens = [dict(metadados_deepseek(jogo, episodio), episodio=episodio) for episodio in episodios]
+    return "```json\n" + json.dumps({'episodios': itens}, ensure_ascii=False) + "\n```"
+
+class ServidorFalso:
+    """Servidor HTTP local que imita o upload resumível do YouTube e o chat completions do DeepSeek"""
+    def __init__(self, latencia_deepseek=0.0, latencia_chunk=0.0):
+        self.latencia_deepseek = latencia_deepseek
+        self.latencia_chunk = latencia_chunk
+        self.chamadas = Counter()
+        self.bytes_recebidos = 0
+        self.caracteres_prompt = 0
+        self._sessoes = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), self._criar_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, porta = self._httpd.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def zerar_contadores(self):
+        with self._lock:
+            self.chamadas.clear()
+            self.bytes_recebidos = 0
+            self.caracteres_prompt = 0
+
+    def _contar_prompt(self, caracteres):
+        with self._lock:
+            self.caracteres_prompt += caracteres
+
+    def _contar(self, rota, nbytes=0):
+        with self._lock:
+            self.chamadas[rota] += 1
+            self.bytes_recebidos += nbytes
+
+    def _nova_sessao(self, total):
+        with self._lock:
+            id_sessao = str(next(self._ids))
+            self._sessoes[id_sessao] = {'total': total, 'recebido': 0}
+        return id_sessao
+
+    def _criar_handler(self):
+        servidor = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _ler_corpo(self):
+                tamanho = int(self.headers.get('Content-Length') or 0)
+                return self.rfile.read(tamanho) if tamanho else b""
+
+            def _responder(self, status, corpo=b"", cabecalhos=None):
+                self.send_response(status)
+                for nome, valor in (cabecalhos or {}).items():
+                    self.send_header(nome, valor)
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                if corpo:
+                    self.wfile.write(corpo)
+
+            def _json(self, status, dados):
+                self._responder(status, json.dumps(dados).encode('utf-8'), {'Content-Type': 'application/json'})
+
+            def _sse(self, conteudo, uso, latencia):
+                """Resposta em streaming (server-sent events), com a latência espalhada entre os pedaços"""
+                pedacos = [conteudo[i:i + TAMANHO_PEDACO_SSE] for i in range(0, len(conteudo), TAMANHO_PEDACO_SSE)]
+                eventos = [{'choices': [{'delta': {'content': p}}]} for p in pedacos]
+                eventos.append({'choices': [], 'usage': uso})
+                linhas = [f"data: {json.dumps(e, ensure_ascii=False)}\n\n".encode('utf-8') for e in eventos]
+                linhas.append(b"data: [DONE]\n\n")
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Content-Length', str(sum(len(linha) for linha in linhas)))
+                self.end_headers()
+                for linha in linhas:
+                    if latencia:
+                        time.sleep(latencia / len(linhas))
+                    self.wfile.write(linha)
+                    self.wfile.flush()
+
+            def do_POST(self):
+                rota = urlparse(self.path)
+                corpo = self._ler_corpo()
+
+                if rota.path.endswith('/chat/completions'):
+                    servidor._contar('deepseek.chat')
+                    pedido = json.loads(corpo or b"{}")
+                    if servidor.latencia_deepseek and not pedido.get('stream'):
+                        time.sleep(servidor.latencia_deepseek)
+                    prompt = pedido.get('messages', [{}])[-1].get('content', '')
+                    servidor._contar_prompt(len(prompt))
+                    if '### Episódio' in prompt:
+                        conteudo = responder_lote(prompt)
+                    else:
+                        conteudo = responder_episodio(prompt)
+                    uso = {'prompt_tokens': len(prompt) // 4, 'completion_tokens': len(conteudo) // 4}
+                    if pedido.get('stream'):
+                        self._sse(conteudo, uso, servidor.latencia_deepseek)
+                    else:
+                        self._json(200, {'choices': [{'message': {'role': 'assistant', 'content': conteudo}}], 'usage': uso})
+
+                elif rota.path.endswith('/videos') and 'resumable' in parse_qs(rota.query).get('uploadType', []):
+                    servidor._contar('youtube.videos.insert')
+                    total = int(self.headers.get('X-Upload-Content-Length') or 0)
+                    id_sessao = servidor._nova_sessao(total)
+                    self._responder(200, cabecalhos={'Location': f"{servidor.url}/upload/sessao/{id_sessao}"})
+
+                elif rota.path.endswith('/thumbnails/set'):
+                    servidor._contar('youtube.thumbnails.set', len(corpo))
+                    video_id = parse_qs(rota.query).get('videoId', [''])[0]
+                    self._json(200, {'kind': 'youtube#thumbnailSetResponse', 'items': [{'videoId': video_id}]})
+
+                else:
+                    servidor._contar('desconhecida')
+                    self._responder(404)
+
+            def do_PUT(self):
+                id_sessao = urlparse(self.path).path.rsplit('/', 1)[-1]
+                sessao = servidor._sessoes.get(id_sessao)
+                corpo = self._ler_corpo()
+                if sessao is None:
+                    self._responder(404)
+                    return
+
+                faixa = self.headers.get('Content-Range', '')
+                if faixa.startswith('bytes */'):
+                    servidor._contar('youtube.sessao.consulta')
+                else:
+                    servidor._contar('youtube.chunk', len(corpo))
+                    if servidor.latencia_chunk:
+                        time.sleep(servidor.latencia_chunk)
+                    sessao['recebido'] += len(corpo)
+
+                if sessao['recebido'] >= sessao['total']:
+                    self._json(200, {'kind': 'youtube#video', 'id': f"video{id_sessao}"})
+                else:
+                    cabecalhos = {'Range': f"bytes=0-{sessao['recebido'] - 1}"} if sessao['recebido'] else {}
+                    self._responder(308, cabecalhos=cabecalhos)
+
+            def do_DELETE(self):
+                id_sessao = urlparse(self.path).path.rsplit('/', 1)[-1]
+                with servidor._lock:
+                    sessao = servidor._sessoes.pop(id_sessao, None)
+                if sessao is None:
+                    self._responder(404)
+                    return
+                servidor._contar('youtube.sessao.cancelada')
+                # Como o YouTube: 499 (Client Closed Request) para a sessão encerrada
+                self._responder(499)
+
+        return Handler
+
+def criar_cliente_youtube(url_base):
+    """Cria um cliente da YouTube Data API apontando para o servidor falso"""
+    from googleapiclient.discovery import build_from_document
+    from googleapiclient.discovery_cache import get_static_doc
+    from googleapiclient.http import build_http
+
+    documento = json.loads(get_static_doc('youtube', 'v3'))
+    documento['rootUrl'] = f"{url_base}/"
+    documento['baseUrl'] = f"{url_base}/youtube/v3/"
+    # build_http desliga o redirect do 308, que no upload resumível significa "chunk recebido"
+    return build_from_document(documento, http=build_http())
+
+# ========== DISCORD EM MEMÓRIA ==========
+
+class MensagemFalsa:
+    _ids = itertools.count(1)
+
+    def __init__(self, canal, content=None, embed=None, view=None):
+        self.id = next(self._ids)
+        self.channel = canal
+        self.content = content
+        self.embeds = [embed] if embed else []
+        self.view = view
+        self.reactions = []
+
+    async def edit(self, **kwargs):
+        await self.channel._registrar('message.edit')
+        if 'content' in kwargs:
+            self.content = kwargs['content']
+        if 'embed' in kwargs:
+            self.embeds = [kwargs['embed']] if kwargs['embed'] else []
+        if 'view' in kwargs:
+            self.view = kwargs['view']
+        return self
+
+    async def add_reaction(self, emoji):
+        await self.channel._registrar('message.add_reaction')
+        self.reactions.append(emoji)
+
+    async def delete(self):
+        await self.channel._registrar('message.delete')
+        self.channel.mensagens.pop(self.id, None)
+
+class CanalFalso:
+    """Canal de texto em memória que conta cada chamada REST que o bot faria"""
+    def __init__(self, id_canal, latencia=0.0):
+        self.id = id_canal
+        self.name = "canal-benchmark"
+        self.latencia = latencia
+        self.mensagens = {}
+        self.chamadas = Counter()
+
+    async def _registrar(self, rota):
+        self.chamadas[rota] += 1
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+
+    async def send(self, content=None, *, embed=None, view=None, **kwargs):
+        await self._registrar('channel.send')
+        mensagem = MensagemFalsa(self, content, embed, view)
+        self.mensagens[mensagem.id] = mensagem
+        return mensagem
+
+    async def fetch_message(self, id_mensagem):
+        import discord
+        await self._registrar('channel.fetch_message')
+        if id_mensagem not in self.mensagens:
+            raise discord.NotFound(SimpleNamespace(status=404, reason="Not Found"), "Unknown Message")
+        return self.mensagens[id_mensagem]
+
+class ContextoFalso:
+    """Substitui o commands.Context nas chamadas diretas ao pipeline"""
+    def __init__(self, canal, id_autor=1):
+        self.channel = canal
+        self.author = SimpleNamespace(id=id_autor, name="benchmark", bot=False)
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
@@ -0,0 +1,19 @@
+"""Fixtures compartilhadas dos testes"""
+import importlib.util
+import os
+
+import pytest
+
+CAMINHO_BOT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "youtube-auto-post-discord.py")
+
+@pytest.fixture(scope="session")
+def bot():
+    """O script do bot importado como módulo (o nome do arquivo tem hífens)"""
+    # O bot encerra na importação se não houver token; os testes não precisam de um real
+    os.environ.setdefault('DISCORD_BOT_TOKEN', 'token-testes')
+    os.environ.setdefault('DEEPSEEK_API_KEY', 'chave-testes')
+
+    spec = importlib.util.spec_from_file_location("youtube_auto_post_discord", CAMINHO_BOT)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
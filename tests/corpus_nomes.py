@@ -0,0 +1,40 @@
+"""Nomes de arquivo reais com o (jogo, episódio, parte) esperado; usado pelos testes e pelo bench_parser"""
+
+# (nome do arquivo, jogo esperado, episódio esperado, parte esperada)
+CORPUS = [
+    ("Hollow Knight Ep 3.mp4", "Hollow Knight", 3, None),
+    ("Hollow Knight Ep.03.mp4", "Hollow Knight", 3, None),
+    ("Hollow Knight ep3.mp4", "Hollow Knight", 3, None),
+    ("Hollow_Knight_Ep_3.mp4", "Hollow Knight", 3, None),
+    ("Hollow.Knight.Ep.3.mkv", "Hollow Knight", 3, None),
+    ("Hollow Knight EP03 - Mantis Lords.mp4", "Hollow Knight", 3, None),
+    ("Elden Ring Episodio 12.mp4", "Elden Ring", 12, None),
+    ("Elden Ring - Episódio 12.mkv", "Elden Ring", 12, None),
+    ("Elden Ring Episode 7.mp4", "Elden Ring", 7, None),
+    ("Elden Ring Cap 4.mp4", "Elden Ring", 4, None),
+    ("Elden Ring Capítulo 4.mp4", "Elden Ring", 4, None),
+    ("Celeste #5.mp4", "Celeste", 5, None),
+    ("Celeste E05.mp4", "Celeste", 5, None),
+    ("Celeste S01E05.mp4", "Celeste", 5, None),
+    ("Celeste - 05 - Capítulo Final.mp4", "Celeste", 5, None),
+    ("Celeste_05_final.mp4", "Celeste", 5, None),
+    ("Hades Parte 2.mp4", "Hades", None, 2),
+    ("Hades Ep 4 Parte 2.mp4", "Hades", 4, 2),
+    ("Hades Ep 4 Pt.2.mp4", "Hades", 4, 2),
+    ("Hades 7.mp4", "Hades", 7, None),
+    ("Hades 2 03.mp4", "Hades 2", 3, None),
+    ("Sonic 3 Ep 2.mp4", "Sonic 3", 2, None),
+    ("Outer Wilds Ep 7 (1080p).mp4", "Outer Wilds", 7, None),
+    ("Outer Wilds 1080p Ep 7.mp4", "Outer Wilds 1080p", 7, None),
+    ("Minecraft 1.20 Ep 3.mp4", "Minecraft 1.20", 3, None),
+    ("[PT-BR] Minecraft Ep 15.mp4", "Minecraft", 15, None),
+    ("Minecraft 2024-05-01 Ep 15.mp4", "Minecraft", 15, None),
+    ("Stardew Valley 2023 Ep 2.mp4", "Stardew Valley 2023", 2, None),
+    ("Ep 9 - Hollow Knight.mp4", "Hollow Knight", 9, None),
+    ("Sleep Tight 4.mp4", "Sleep Tight", 4, None),
+    ("Deep Rock Galactic Ep 11.mp4", "Deep Rock Galactic", 11, None),
+    ("Keep Talking Ep 1.mp4", "Keep Talking", 1, None),
+    ("Tunic.mp4", "Tunic", None, None),
+    ("Dead Cells Gameplay.mp4", "Dead Cells Gameplay", None, None),
+    ("/videos/Hollow Knight Ep 3.mp4", "Hollow Knight", 3, None),
+]
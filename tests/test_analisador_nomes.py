@@ -0,0 +1,23 @@
+"""Analisador de nomes de arquivo: o corpus de nomes reais tem que bater inteiro"""
+import pytest
+
+from corpus_nomes import CORPUS
+
+@pytest.mark.parametrize("nome, jogo, episodio, parte", CORPUS, ids=[nome for nome, *_ in CORPUS])
+def test_corpus(bot, nome, jogo, episodio, parte):
+    assert bot.analisar_nome_arquivo(nome) == (jogo, episodio, parte)
+
+def test_parte_vira_episodio_sem_episodio_explicito(bot):
+    assert bot.extrair_info_arquivo("Hades Parte 2.mp4") == ("Hades", 2)
+    assert bot.extrair_info_arquivo("Hades Ep 4 Parte 2.mp4") == ("Hades", 4)
+
+@pytest.mark.parametrize("nome, esperado", [
+    ("Tunic", ("Tunic", None, None)),  # Sem extensão
+    ("Celeste Ep 5.final.mp4", ("Celeste", 5, None)),  # Só a última extensão sai
+])
+def test_nomes_sem_extensao_comum(bot, nome, esperado):
+    assert bot.analisar_nome_arquivo(nome) == esperado
+
+def test_lote_devolve_um_resultado_por_nome(bot):
+    nomes = [nome for nome, *_ in CORPUS[:5]]
+    assert bot.analisar_nomes_arquivos(nomes) == {nome: bot.analisar_nome_arquivo(nome) for nome in nomes}
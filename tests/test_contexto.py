@@ -0,0 +1,91 @@
+"""Arquivo de contexto: detecção de codificação, orçamento de tokens e leitura com JSON achatado"""
+import json
+
+import pytest
+
+TEXTO = "Resumo: chefe Mantis Lords, área Mantis Village.\nComentário em português: ação, coração."
+
+# ========== CODIFICAÇÃO ==========
+
+@pytest.mark.parametrize("dados, esperada", [
+    (b'\xef\xbb\xbf' + TEXTO.encode('utf-8'), 'utf-8-sig'),
+    (TEXTO.encode('utf-16'), 'utf-16'),  # Com BOM
+    (TEXTO.encode('utf-16-le'), 'utf-16-le'),
+    (TEXTO.encode('utf-16-be'), 'utf-16-be'),
+    (TEXTO.encode('utf-8'), 'utf-8'),
+    (TEXTO.encode('cp1252'), 'cp1252'),
+    (b'', 'utf-8'),
+])
+def test_detecta_codificacao(bot, dados, esperada):
+    assert bot.detectar_codificacao(dados) == esperada
+
+def test_caractere_utf8_cortado_no_fim_da_amostra_continua_utf8(bot):
+    dados = TEXTO.encode('utf-8')
+    assert bot.detectar_codificacao(dados + 'ç'.encode('utf-8')[:1]) == 'utf-8'
+
+def test_bytes_nulos_sem_padrao_utf16_sao_binario(bot):
+    with pytest.raises(bot.ErroContexto):
+        bot.detectar_codificacao(b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x01\x00')
+
+# ========== ORÇAMENTO ==========
+
+def test_texto_dentro_do_orcamento_fica_inteiro(bot):
+    assert bot.ajustar_ao_orcamento(TEXTO, 1000) == (TEXTO, False)
+
+@pytest.mark.parametrize("tokens", [0, -5])
+def test_orcamento_zero_ou_negativo_nao_devolve_o_texto(bot, tokens):
+    assert bot.ajustar_ao_orcamento(TEXTO, tokens) == ("", True)
+    assert bot.ajustar_ao_orcamento("", tokens) == ("", False)
+
+def test_orcamento_minusculo_nao_devolve_o_texto_inteiro(bot):
+    # 1 token = 4 caracteres: o pedaço do fim teria tamanho zero, e texto[-0:] seria o texto todo
+    texto, truncado = bot.ajustar_ao_orcamento("x" * 400, 1)
+    assert truncado
+    assert texto == "xxx\n[...]"
+
+def test_corte_guarda_comeco_e_fim_em_quebras_de_linha(bot):
+    linhas = [f"linha {i:03d}: " + " ".join(["texto"] * 5) for i in range(200)]
+    texto, truncado = bot.ajustar_ao_orcamento("\n".join(linhas), 200)
+    assert truncado
+    assert len(texto) <= 200 * bot.CARACTERES_POR_TOKEN + len("\n[...]\n")
+    comeco, fim = texto.split("\n[...]\n")
+    assert comeco.startswith("linha 000") and comeco.split("\n")[-1] in linhas
+    assert fim.endswith(linhas[-1]) and fim.split("\n")[0] in linhas
+
+# ========== LEITURA DO ARQUIVO ==========
+
+def test_le_utf16_com_bom_e_normaliza_quebras(bot, tmp_path):
+    caminho = tmp_path / "ctx.txt"
+    caminho.write_bytes(TEXTO.replace("\n", "\r\n").encode('utf-16'))
+    lido = bot.ler_contexto_arquivo(str(caminho), orcamento_tokens=1000)
+    assert lido['texto'] == TEXTO
+    assert lido['codificacao'] == 'utf-16'
+    assert not lido['truncado']
+
+def test_json_vira_linhas_chave_valor(bot, tmp_path):
+    caminho = tmp_path / "ctx.json"
+    caminho.write_text(json.dumps({"chefe": "Mantis Lords", "itens": ["Garra", "Capa"], "area": {"nome": "Vila"}}), encoding='utf-8')
+    lido = bot.ler_contexto_arquivo(str(caminho), orcamento_tokens=1000)
+    assert lido['formato'] == 'json'
+    assert lido['texto'].split("\n") == ["chefe: Mantis Lords", "itens: Garra, Capa", "area.nome: Vila"]
+
+def test_json_invalido_vai_como_texto(bot, tmp_path):
+    caminho = tmp_path / "ctx.json"
+    caminho.write_text('{"chefe": "Mantis', encoding='utf-8')
+    lido = bot.ler_contexto_arquivo(str(caminho), orcamento_tokens=1000)
+    assert lido['formato'] == 'texto'
+    assert lido['texto'] == '{"chefe": "Mantis'
+
+def test_arquivo_maior_que_o_limite_e_lido_so_ate_o_limite(bot, tmp_path):
+    caminho = tmp_path / "grande.txt"
+    caminho.write_bytes(b"a" * (bot.LIMITE_BYTES_CONTEXTO + 1000))
+    lido = bot.ler_contexto_arquivo(str(caminho), orcamento_tokens=10**6)
+    assert lido['bytes_lidos'] == bot.LIMITE_BYTES_CONTEXTO
+    assert lido['truncado']
+
+def test_editar_o_arquivo_invalida_o_cache(bot, tmp_path):
+    caminho = tmp_path / "ctx.txt"
+    caminho.write_text("primeira versão", encoding='utf-8')
+    assert bot.ler_contexto_arquivo(str(caminho), orcamento_tokens=1000)['texto'] == "primeira versão"
+    caminho.write_text("segunda versão, maior", encoding='utf-8')
+    assert bot.ler_contexto_arquivo(str(caminho), orcamento_tokens=1000)['texto'] == "segunda versão, maior"
@@ -0,0 +1,62 @@
+"""Leitura de campos de texto de um JSON que chega aos pedaços (streaming do DeepSeek)"""
+import json
+
+import pytest
+
+RESPOSTA = json.dumps({
+    "titulo": "Hollow Knight Ep 3 - \"Mantis Lords\"",
+    "descricao": "Linha 1\nLinha 2\tcom tab \\ barra e acento é \U0001F3AE",
+    "hashtags": ["hollowknight"],
+})
+
+def alimentado(bot, *pedacos):
+    leitor = bot.LeitorJSONParcial()
+    for pedaco in pedacos:
+        leitor.alimentar(pedaco)
+    return leitor
+
+def test_campo_que_ainda_nao_comecou(bot):
+    leitor = alimentado(bot, '{"titulo": "Hol')
+    assert leitor.campo('descricao') == (None, False)
+
+def test_campo_incompleto_e_depois_completo(bot):
+    leitor = alimentado(bot, '{"titulo": "Hol')
+    assert leitor.campo('titulo') == ("Hol", False)
+    leitor.alimentar('low Knight", "descricao": "')
+    assert leitor.campo('titulo') == ("Hollow Knight", True)
+    assert leitor.campo('descricao') == ("", False)
+
+def test_qualquer_corte_da_resposta_e_prefixo_do_valor_final(bot):
+    """Cortando a resposta em cada posição, o valor parcial nunca diverge do final (escapes incluídos)"""
+    esperado = json.loads(RESPOSTA)
+    for corte in range(len(RESPOSTA) + 1):
+        leitor = alimentado(bot, RESPOSTA[:corte], "")
+        for nome in ('titulo', 'descricao'):
+            valor, completo = leitor.campo(nome)
+            if valor is None:
+                continue
+            assert esperado[nome].startswith(valor), (corte, nome, valor)
+            if completo:
+                assert valor == esperado[nome]
+
+def test_pedacos_de_um_caractere(bot):
+    leitor = alimentado(bot, *RESPOSTA)
+    esperado = json.loads(RESPOSTA)
+    assert leitor.campo('titulo') == (esperado['titulo'], True)
+    assert leitor.campo('descricao') == (esperado['descricao'], True)
+    assert leitor.final() == esperado
+
+@pytest.mark.parametrize("parcial, valor", [
+    ('{"titulo": "a\\', "a"),  # Barra invertida sem o código do escape
+    ('{"titulo": "a\\u00', "a"),  # \u pela metade
+    ('{"titulo": "a\\u00e9', "aé"),
+])
+def test_escape_cortado_espera_o_resto(bot, parcial, valor):
+    assert alimentado(bot, parcial).campo('titulo') == (valor, False)
+
+def test_espacos_entre_chave_e_valor(bot):
+    assert alimentado(bot, '{ "titulo" :\n  "A" }').campo('titulo') == ("A", True)
+
+def test_final_com_json_cortado_levanta_value_error(bot):
+    with pytest.raises(ValueError):
+        alimentado(bot, RESPOSTA[:-5]).final()
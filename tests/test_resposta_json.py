@@ -0,0 +1,86 @@
+"""Leitura da resposta JSON do gerador e o reparo local dos metadados aos limites do YouTube"""
+import pytest
+
+# ========== EXTRAÇÃO DO JSON ==========
+
+@pytest.mark.parametrize("texto", [
+    '{"titulo": "A", "descricao": "B"}',
+    '  {"titulo": "A", "descricao": "B"}\n',
+    '```json\n{"titulo": "A", "descricao": "B"}\n```',
+    '```\n{"titulo": "A", "descricao": "B"}```',
+    'Aqui está o JSON: {"titulo": "A", "descricao": "B"} Espero que ajude!',
+    'Rascunho {quebrado e depois {"titulo": "A", "descricao": "B"}',
+])
+def test_extrai_objeto_com_cercas_e_comentarios(bot, texto):
+    assert bot.extrair_json_resposta(texto) == {"titulo": "A", "descricao": "B"}
+
+def test_extrai_lista(bot):
+    assert bot.extrair_json_resposta('Resultado:\n[{"episodio": 1}, {"episodio": 2}]') == [{"episodio": 1}, {"episodio": 2}]
+
+@pytest.mark.parametrize("texto", [
+    "",
+    "TITULO: sem json nenhum",
+    '{"titulo": "A", "descricao": "B"',  # Cortado no fim do max_tokens
+    "{'titulo': 'aspas simples'}",
+])
+def test_sem_json_valido_levanta_value_error(bot, texto):
+    with pytest.raises(ValueError):
+        bot.extrair_json_resposta(texto)
+
+# ========== INTERPRETAÇÃO ==========
+
+def test_interpreta_campos_em_portugues_e_ingles(bot):
+    assert bot.interpretar_metadados({"titulo": " A ", "descricao": "B"}) == ("A", "B")
+    assert bot.interpretar_metadados({"title": "A", "description": "B"}) == ("A", "B")
+
+def test_hashtags_entram_na_descricao_sem_repetir(bot):
+    titulo, descricao = bot.interpretar_metadados({
+        "titulo": "A", "descricao": "Texto", "hashtags": ["jogo", "#jogo", "Hollow Knight", "# "],
+    })
+    assert descricao == "Texto\n\n🔖 #jogo #HollowKnight"
+
+def test_hashtags_em_string(bot):
+    assert bot.montar_descricao({"descricao": "Texto", "hashtags": "#a #b"}) == "Texto\n\n🔖 #a #b"
+
+@pytest.mark.parametrize("dados", [
+    [],
+    {"descricao": "B"},
+    {"titulo": "   ", "descricao": "B"},
+    {"titulo": 3, "descricao": "B"},
+    {"titulo": "A"},
+])
+def test_campos_ausentes_ou_invalidos(bot, dados):
+    with pytest.raises(ValueError):
+        bot.interpretar_metadados(dados)
+
+# ========== VALIDAÇÃO E REPARO ==========
+
+def test_metadados_dentro_dos_limites(bot):
+    assert bot.validar_metadados("Hollow Knight Ep 3", "Descrição #jogo") == []
+
+def test_validacao_aponta_cada_limite(bot):
+    titulo = "T" * (bot.LIMITE_TITULO_YOUTUBE + 1)
+    descricao = "<b>" + "é" * bot.LIMITE_DESCRICAO_YOUTUBE + " ".join(f"#h{i}" for i in range(bot.LIMITE_HASHTAGS + 1))
+    problemas = bot.validar_metadados(titulo, descricao)
+    assert len(problemas) == 4
+
+def test_reparo_corta_titulo_na_palavra_e_tira_pontuacao_solta(bot):
+    titulo = "Palavra " * 20 + "- Final"
+    reparado, _ = bot.reparar_metadados(titulo, "")
+    assert len(reparado) <= bot.LIMITE_TITULO_YOUTUBE
+    assert reparado.endswith("Palavra")
+
+def test_reparo_deixa_os_metadados_validos(bot):
+    titulo = "<Titulo> " + "x" * 200
+    descricao = "<i>texto</i> \n" + " ".join(f"#h{i}" for i in range(30)) + "\n" + "ç" * 6000
+    titulo, descricao = bot.reparar_metadados(titulo, descricao)
+    assert bot.validar_metadados(titulo, descricao) == []
+    assert "#h14" in descricao and "#h15" not in descricao
+    # O corte em bytes não deixa caractere UTF-8 pela metade
+    descricao.encode('utf-8').decode('utf-8')
+
+def test_tags_respeitam_o_limite_somado(bot):
+    descricao = " ".join(f"#{'t' * 98}{i}" for i in range(10)) + " #t" + "t" * 97 + "0"
+    tags = bot.tags_da_descricao(descricao)
+    assert len(",".join(tags)) <= bot.LIMITE_TAGS_YOUTUBE
+    assert len(tags) == len(set(tags))
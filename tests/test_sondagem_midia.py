@@ -0,0 +1,148 @@
+"""Sondagem dos cabeçalhos de mídia (MP4, MKV, AVI) com amostras pequenas montadas byte a byte"""
+import io
+import struct
+
+import pytest
+
+# ========== AMOSTRAS MP4 ==========
+
+def atomo(tipo, *partes):
+    dados = b''.join(partes)
+    return struct.pack('>I', 8 + len(dados)) + tipo + dados
+
+def mp4(duracao, versao_mvhd=0, mehd=None, mvex=False, moof=False):
+    """MP4 mínimo: ftyp, moov (mvhd + uma faixa de vídeo 1920x1080 avc1 + mvex opcional), moof e mdat"""
+    if versao_mvhd == 1:
+        mvhd = atomo(b'mvhd', struct.pack('>IQQIQ', 1 << 24, 0, 0, 1000, duracao), bytes(80))
+    else:
+        mvhd = atomo(b'mvhd', struct.pack('>IIIII', 0, 0, 0, 1000, duracao), bytes(80))
+    trak = atomo(
+        b'trak',
+        atomo(b'tkhd', bytes(76), struct.pack('>II', 1920 << 16, 1080 << 16)),
+        atomo(b'mdia', atomo(b'hdlr', bytes(8), b'vide', bytes(12)),
+              atomo(b'minf', atomo(b'stbl', atomo(b'stsd', bytes(12), b'avc1', bytes(8))))),
+    )
+    extensao = b''
+    if mehd is not None:
+        extensao = atomo(b'mvex', atomo(b'mehd', struct.pack('>II', 0, mehd)))
+    elif mvex:
+        extensao = atomo(b'mvex')
+    fragmento = atomo(b'moof', bytes(8)) if moof else b''
+    return atomo(b'ftyp', b'isom', bytes(4)) + atomo(b'moov', mvhd, trak, extensao) + fragmento + atomo(b'mdat', bytes(64))
+
+def sondar(sonda, dados):
+    return sonda(io.BytesIO(dados), len(dados))
+
+def test_mp4_le_duracao_e_faixa_de_video(bot):
+    info = sondar(bot.sondar_mp4, mp4(600000))
+    assert info['duracao'] == 600
+    assert info['faixas'] == [{'largura': 1920, 'altura': 1080, 'tipo': 'video', 'codec': 'avc1'}]
+    assert 'fragmentado' not in info
+
+def test_mp4_mvhd_versao_1(bot):
+    assert sondar(bot.sondar_mp4, mp4(90000, versao_mvhd=1))['duracao'] == 90
+
+def test_mp4_atomo_truncado(bot):
+    dados = mp4(600000)
+    with pytest.raises(bot.ErroSondagem, match="truncado"):
+        sondar(bot.sondar_mp4, dados[:-10])
+
+def test_mp4_sem_moov(bot):
+    dados = atomo(b'ftyp', b'isom', bytes(4)) + atomo(b'mdat', bytes(64))
+    with pytest.raises(bot.ErroSondagem, match="moov"):
+        sondar(bot.sondar_mp4, dados)
+
+def test_mp4_fragmentado_usa_mehd(bot):
+    info = sondar(bot.sondar_mp4, mp4(0, mehd=90000, moof=True))
+    assert info['fragmentado'] is True
+    assert info['duracao'] == 90
+
+def test_mp4_fragmentado_sem_mehd_tem_duracao_desconhecida(bot):
+    info = sondar(bot.sondar_mp4, mp4(0, mvex=True, moof=True))
+    assert info['fragmentado'] is True
+    assert info['duracao'] is None
+
+@pytest.mark.parametrize("versao, duracao", [(0, 0xFFFFFFFF), (1, 0xFFFFFFFFFFFFFFFF)])
+def test_mp4_duracao_com_todos_os_bits_em_1_e_desconhecida(bot, versao, duracao):
+    assert sondar(bot.sondar_mp4, mp4(duracao, versao_mvhd=versao))['duracao'] is None
+
+def test_validacao_recusa_duracao_zero_mas_so_avisa_no_fragmentado(bot, tmp_path):
+    zerado = tmp_path / "zerado.mp4"
+    zerado.write_bytes(mp4(0))
+    fragmentado = tmp_path / "fragmentado.mp4"
+    fragmentado.write_bytes(mp4(0, mvex=True, moof=True))
+
+    resultado = bot.validar_pacote_video({'video': str(zerado)})
+    assert "duração zero" in resultado['problemas']
+
+    resultado = bot.validar_pacote_video({'video': str(fragmentado)})
+    assert not any("duração" in problema for problema in resultado['problemas'])
+    assert any("fragmentado" in aviso for aviso in resultado['avisos'])
+
+def test_sondar_midia_transforma_erro_estrutural_em_resultado(bot, tmp_path):
+    caminho = tmp_path / "cortado.mp4"
+    caminho.write_bytes(mp4(600000)[:-10])
+    info = bot.sondar_midia(str(caminho))
+    assert info['erro'] and "truncado" in info['erro']
+
+# ========== AMOSTRAS MKV ==========
+
+def elemento(id_elemento, dados):
+    """Elemento EBML com o tamanho sempre em 8 bytes"""
+    id_bytes = id_elemento.to_bytes((id_elemento.bit_length() + 7) // 8, 'big')
+    return id_bytes + b'\x01' + len(dados).to_bytes(7, 'big') + dados
+
+TAMANHO_DESCONHECIDO = b'\x01\xff\xff\xff\xff\xff\xff\xff'
+
+def mkv():
+    ebml = elemento(0x1A45DFA3, elemento(0x4282, b'matroska'))
+    info = elemento(0x1549A966, elemento(0x2AD7B1, (1000000).to_bytes(3, 'big')) + elemento(0x4489, struct.pack('>d', 65000.0)))
+    video = elemento(0xAE, elemento(0x83, b'\x01') + elemento(0x86, b'V_MPEG4/ISO/AVC')
+                     + elemento(0xE0, elemento(0xB0, (1280).to_bytes(2, 'big')) + elemento(0xBA, (720).to_bytes(2, 'big'))))
+    audio = elemento(0xAE, elemento(0x83, b'\x02') + elemento(0x86, b'A_AAC'))
+    cluster = b'\x1f\x43\xb6\x75' + TAMANHO_DESCONHECIDO + bytes(100)
+    segmento = b'\x18\x53\x80\x67' + TAMANHO_DESCONHECIDO + info + elemento(0x1654AE6B, video + audio) + cluster
+    return ebml + segmento
+
+def test_mkv_le_duracao_faixas_e_resolucao(bot):
+    info = sondar(bot.sondar_mkv, mkv())
+    assert info['duracao'] == pytest.approx(65.0)
+    assert info['faixas'] == [
+        {'tipo': 'video', 'codec': 'V_MPEG4/ISO/AVC', 'largura': 1280, 'altura': 720},
+        {'tipo': 'audio', 'codec': 'A_AAC'},
+    ]
+
+def test_mkv_cabecalho_ebml_truncado(bot):
+    with pytest.raises(bot.ErroSondagem, match="truncado"):
+        sondar(bot.sondar_mkv, b'\x1a\x45\xdf\xa3\x85' + bytes(2))  # Anuncia 5 bytes e traz 2
+
+def test_mkv_tamanho_ebml_invalido(bot):
+    with pytest.raises(bot.ErroSondagem, match="inteiro EBML"):
+        sondar(bot.sondar_mkv, b'\x1a\x45\xdf\xa3' + bytes(3))
+
+def test_mkv_sem_cabecalho_ebml(bot):
+    with pytest.raises(bot.ErroSondagem, match="EBML ausente"):
+        sondar(bot.sondar_mkv, elemento(0x18538067, bytes(4)))
+
+def test_mkv_sem_tracks(bot):
+    dados = elemento(0x1A45DFA3, elemento(0x4282, b'matroska')) + elemento(0x18538067, elemento(0x1549A966, b''))
+    with pytest.raises(bot.ErroSondagem, match="Tracks"):
+        sondar(bot.sondar_mkv, dados)
+
+# ========== AMOSTRAS AVI ==========
+
+def avi(quadros=900, microssegundos_quadro=33333):
+    avih = b'avih' + struct.pack('<I', 56) + struct.pack('<10I', microssegundos_quadro, 0, 0, 0, quadros, 0, 2, 0, 640, 480) + bytes(16)
+    strl = b'LIST' + struct.pack('<I', 4 + 8 + 56) + b'strl' + b'strh' + struct.pack('<I', 56) + b'vids' + b'XVID' + bytes(48)
+    auds = b'strh' + struct.pack('<I', 56) + b'auds' + bytes(52)
+    hdrl = b'hdrl' + avih + strl + auds
+    return b'RIFF' + struct.pack('<I', 1000) + b'AVI ' + b'LIST' + struct.pack('<I', len(hdrl)) + hdrl
+
+def test_avi_le_duracao_resolucao_e_codec(bot):
+    info = sondar(bot.sondar_avi, avi())
+    assert info['duracao'] == pytest.approx(29.9997)
+    assert info['faixas'] == [{'tipo': 'video', 'largura': 640, 'altura': 480, 'codec': 'XVID'}, {'tipo': 'audio'}]
+
+def test_avi_sem_riff(bot):
+    with pytest.raises(bot.ErroSondagem, match="RIFF"):
+        sondar(bot.sondar_avi, b'RIFX' + bytes(40))
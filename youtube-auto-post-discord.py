@@ -1,15 +1,32 @@
 import os
-import glob
+import argparse
 import asyncio
+import bisect
+import hashlib
+import itertools
 import json
-import requests
+import mimetypes
+import mmap
 import re
 import shutil
-from datetime import datetime, timedelta
+import signal
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
 from pathlib import Path
+from urllib.parse import unquote, urlparse
 from dotenv import load_dotenv
 
 # Para Discord
+import aiohttp
 import discord
 from discord.ext import commands
 from discord.ui import Select, View, Button
@@ -19,7 +36,7 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload, MediaUpload
 from googleapiclient.errors import HttpError
 
 # Carregar variáveis do arquivo .env
@@ -30,12 +47,61 @@ PASTA_VIDEOS = "./videos"
 SCOPES = ['https://www.googleapis.com/auth/youtube.upload']
 CANAL_DISCORD_ID = 1422768699923763382  # ID do canal específico
 TIMEOUT_INTERACOES = 300  # 5 minutos em segundos
+INTERVALO_AMOSTRA_LOOP = 0.25  # Intervalo entre amostras de latência do event loop (segundos)
+LIMITE_BLOQUEIO_LOOP = 0.5  # Callbacks que seguram o loop por mais que isso geram amostra de pilha
+TAMANHO_CHUNK_INGESTAO = 1024 * 1024  # Bytes lidos por vez ao baixar anexos e URLs
+ESPACO_LIVRE_MINIMO_GB = float(os.getenv('ESPACO_LIVRE_MINIMO_GB', '5'))  # Ingestão que deixaria menos que isso livre no disco é recusada
+ESPACO_LIVRE_ALERTA_GB = float(os.getenv('ESPACO_LIVRE_ALERTA_GB', '20'))  # Abaixo disso a ingestão espera a fila liberar espaço
+LIMITE_PASTA_VIDEOS_GB = float(os.getenv('LIMITE_PASTA_VIDEOS_GB', '0'))  # Tamanho máximo da pasta de vídeos (0 = sem limite)
+ESPERA_ADMISSAO = float(os.getenv('ESPERA_ADMISSAO', '1800'))  # Segundos que uma ingestão espera a fila liberar espaço
+ARQUIVO_IMPRESSOES = "impressoes_uploads.json"  # Impressões digitais dos vídeos já enviados
+MODO_DUPLICADOS = os.getenv('MODO_DUPLICADOS', 'recusar')  # 'recusar' ou 'avisar' ao detectar vídeo repetido
+ARQUIVO_COTA = "cota_youtube.json"  # Unidades de cota gastas por projeto/dia
+ARQUIVO_PERFIS = "perfis_youtube.json"  # Contas do YouTube e regras de roteamento (opcional)
+ARQUIVO_BANDA = "banda_upload.json"  # Limites de banda ajustados pelo !banda
+ARQUIVO_HISTORICO = "historico_uploads.db"  # Histórico de uploads (SQLite) consultado pelo !historico
+ARQUIVO_METADADOS = "metadados_gerados.json"  # Títulos/descrições gerados em lote pelo !lote
+ARQUIVO_GERADORES = "geradores_metadados.json"  # Gerador de metadados por jogo e modelos do gerador local
+ARQUIVO_CHECKPOINT = "checkpoint_uploads.json"  # Fila e sessões de upload salvas no desligamento
+PRAZO_DESLIGAMENTO = float(os.getenv('PRAZO_DESLIGAMENTO', '25'))  # Segundos para desligar após o SIGTERM
+MODO_FILA = os.getenv('MODO_FILA', 'local').lower()  # 'local' (um processo só) ou 'broker' (uploads em processos --worker)
+ARQUIVO_BROKER = os.getenv('ARQUIVO_BROKER', 'broker_uploads.db')  # Fila compartilhada entre o bot e os trabalhadores
+MODO_TRABALHADOR = '--worker' in sys.argv  # Processo trabalhador: não conecta ao Discord
+GERADOR_METADADOS = os.getenv('GERADOR_METADADOS', 'deepseek').lower()  # Gerador padrão: deepseek ou local
+TIMEOUT_GERADOR_METADADOS = float(os.getenv('TIMEOUT_GERADOR_METADADOS', '30'))  # Segundos até desistir do gerador e usar o local
+SLO_GERADOR_METADADOS = float(os.getenv('SLO_GERADOR_METADADOS', '15'))  # Respostas mais lentas contam como falha no disjuntor
+HEDGE_GERADOR_METADADOS = os.getenv('HEDGE_GERADOR_METADADOS', '0') == '1'  # Segunda tentativa se a primeira passar do p95
+ORCAMENTO_TOKENS_CONTEXTO = int(os.getenv('ORCAMENTO_TOKENS_CONTEXTO', '1500'))  # Tokens do arquivo de contexto enviados no prompt
+TAMANHO_LOTE_DEEPSEEK = int(os.getenv('TAMANHO_LOTE_DEEPSEEK', '5'))  # Episódios por requisição no !lote
+LIMITE_BANDA_GLOBAL_MBPS = float(os.getenv('LIMITE_BANDA_GLOBAL_MBPS', '0'))  # Soma de todos os uploads (0 = sem limite)
+LIMITE_BANDA_ENVIO_MBPS = float(os.getenv('LIMITE_BANDA_ENVIO_MBPS', '0'))  # Cada upload individual (0 = sem limite)
+TAMANHO_CHUNK_UPLOAD = 1024 * 1024
+TAMANHO_CHUNK_UPLOAD_MINIMO = 256 * 1024  # O upload resumível exige chunks múltiplos de 256 KB
+TAMANHO_CHUNK_UPLOAD_MAXIMO = 64 * 1024**2  # Teto do chunk calculado pelo limite de banda
+SEGUNDOS_CHUNK_LIMITADO = 1.0  # Com limite de banda, cada chunk leva cerca disso na taxa em vigor
+LEITOR_UPLOAD = os.getenv('LEITOR_UPLOAD', 'arquivo').lower()  # 'arquivo' (padrão) ou 'mmap' (mais vazão, mas o vídeo não pode ser truncado durante o envio)
+COTA_DIARIA_YOUTUBE = int(os.getenv('COTA_DIARIA_YOUTUBE', '10000'))  # Cota padrão de um projeto novo
+
+# Custo em unidades de cada chamada da YouTube Data API usada pelo bot
+CUSTO_COTA_YOUTUBE = {
+    'videos.insert': 1600,
+    'thumbnails.set': 50,
+}
+
+# Tamanho máximo aceito na ingestão, por tipo de arquivo (bytes)
+LIMITES_INGESTAO = {
+    'video': 128 * 1024**3,  # O YouTube aceita até 256 GB; 128 GB já cobre qualquer gravação
+    'thumb': 2 * 1024**2,  # Limite do YouTube para thumbnails
+    'contexto': 1024**2,
+    'legendas': 5 * 1024**2,
+}
 
 # Carregar variáveis de ambiente
 DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
 DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
+DEEPSEEK_API_URL = os.getenv('DEEPSEEK_API_URL', "https://api.deepseek.com/v1/chat/completions")
 
-if not DISCORD_BOT_TOKEN:
+if not DISCORD_BOT_TOKEN and not MODO_TRABALHADOR:
     print("❌ DISCORD_BOT_TOKEN não encontrado no arquivo .env")
     print("💡 Verifique se o arquivo .env existe e contém DISCORD_BOT_TOKEN")
     exit(1)
@@ -52,26 +118,151 @@ bot = commands.Bot(command_prefix='!', intents=intents)
 def verificar_canal_correto():
     """Decorator para verificar se o comando foi executado no canal correto"""
     async def predicate(ctx):
-        if ctx.channel.id != CANAL_DISCORD_ID:
-            await ctx.send(f"❌ Este comando só pode ser usado no canal designado. Canal atual: {ctx.channel.id}")
+        if ctx.channel.id not in canais_permitidos():
+            await ctx.send(f"❌ Este comando só pode ser usado nos canais designados. Canal atual: {ctx.channel.id}")
             return False
         return True
     return commands.check(predicate)
 
-# Dicionário para armazenar seleções em andamento
-selecoes_ativas = {}
 # Dicionário para armazenar status de upload em andamento
 uploads_ativos = {}
 # Dicionário para armazenar metadados em revisão
 revisoes_ativas = {}
 
 # ========== SISTEMA DE FILA DE UPLOADS ==========
-fila_uploads = asyncio.Queue()
-upload_em_andamento = False
-fila_ativa = {}
-mensagem_fila_global = None  # Mensagem global da fila
+fila_ativa = {}  # As filas em si ficam em cada perfil do YouTube (ver PERFIS DE CONTAS DO YOUTUBE)
+contador_tarefas = itertools.count(1)  # Número curto de cada tarefa (#N), usado pelo !cancelar e pelo !mover
 ultima_mensagem_status = None  # Última mensagem de status do upload
 
+# ========== MONITOR DE LATÊNCIA DO EVENT LOOP ==========
+
+def calcular_percentil(valores, percentil):
+    """Percentil por posição mais próxima (não exige lista ordenada)"""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(0, min(len(ordenados) - 1, -(-percentil * len(ordenados) // 100) - 1))
+    return ordenados[int(indice)]
+
+class MonitorLoop:
+    """Mede o atraso de agendamento do event loop e captura a pilha quando um callback o bloqueia"""
+    def __init__(self, intervalo=INTERVALO_AMOSTRA_LOOP, limite_bloqueio=LIMITE_BLOQUEIO_LOOP, max_amostras=2400):
+        self.intervalo = intervalo
+        self.limite_bloqueio = limite_bloqueio
+        self.amostras = deque(maxlen=max_amostras)
+        self.atraso_maximo = 0.0
+        self.bloqueios = deque(maxlen=10)
+        self.total_bloqueios = 0
+        self._batimento = time.monotonic()
+        self._bloqueio_aberto = None
+        self._thread_loop = None
+        self._tarefa = None
+        self._ativo = False
+
+    def iniciar(self):
+        """Inicia a amostragem no loop atual e a thread vigia (chamar de dentro do loop)"""
+        if self._tarefa and not self._tarefa.done():
+            return
+        self._thread_loop = threading.get_ident()
+        self._batimento = time.monotonic()
+        self._ativo = True
+        self._tarefa = asyncio.get_running_loop().create_task(self._amostrar())
+        threading.Thread(target=self._vigiar, name="vigia-event-loop", daemon=True).start()
+
+    def parar(self):
+        self._ativo = False
+        if self._tarefa:
+            self._tarefa.cancel()
+            self._tarefa = None
+
+    async def _amostrar(self):
+        loop = asyncio.get_running_loop()
+        while self._ativo:
+            esperado = loop.time() + self.intervalo
+            self._batimento = time.monotonic()
+            await asyncio.sleep(self.intervalo)
+            atraso = max(0.0, loop.time() - esperado)
+            self._batimento = time.monotonic()
+
+            self.amostras.append(atraso)
+            self.atraso_maximo = max(self.atraso_maximo, atraso)
+
+            # Fechar o bloqueio capturado pela vigia com a duração real
+            if self._bloqueio_aberto is not None:
+                self._bloqueio_aberto['duracao'] = atraso
+                self._bloqueio_aberto = None
+
+    def _vigiar(self):
+        """Roda fora do loop: se o batimento parar, o loop está preso em um callback síncrono"""
+        ultimo_capturado = None
+        while self._ativo:
+            time.sleep(self.limite_bloqueio / 2)
+            batimento = self._batimento
+            parado = time.monotonic() - batimento
+
+            if parado <= self.intervalo + self.limite_bloqueio or batimento == ultimo_capturado:
+                continue
+
+            ultimo_capturado = batimento
+            frame = sys._current_frames().get(self._thread_loop)
+            if frame is None:
+                continue
+
+            quadros = traceback.extract_stack(frame)
+            # O local mais útil é o último quadro do próprio bot, não o fundo da biblioteca bloqueante
+            do_bot = [q for q in quadros if q.filename == __file__]
+            local = do_bot[-1] if do_bot else (quadros[-1] if quadros else None)
+            quadros = quadros[-16:]
+            bloqueio = {
+                'quando': datetime.now().strftime("%d/%m %H:%M:%S"),
+                'duracao': parado - self.intervalo,
+                'local': f"{local.name} ({os.path.basename(local.filename)}:{local.lineno})" if local else "?",
+                'pilha': ''.join(traceback.format_list(quadros)),
+            }
+            self.bloqueios.append(bloqueio)
+            self.total_bloqueios += 1
+            self._bloqueio_aberto = bloqueio
+            print(f"⚠️ Event loop bloqueado há {bloqueio['duracao']:.2f}s em {bloqueio['local']}\n{bloqueio['pilha']}")
+
+    def resumo(self):
+        amostras = list(self.amostras)
+        ultimo = self.bloqueios[-1] if self.bloqueios else None
+        return {
+            'atraso_max_ms': round(self.atraso_maximo * 1000, 1),
+            'atraso_p99_ms': round(calcular_percentil(amostras, 99) * 1000, 1),
+            'atraso_p50_ms': round(calcular_percentil(amostras, 50) * 1000, 1),
+            'amostras': len(amostras),
+            'bloqueios': self.total_bloqueios,
+            'ultimo_bloqueio': {k: v for k, v in ultimo.items() if k != 'pilha'} if ultimo else None,
+        }
+
+monitor_loop = MonitorLoop()
+
+def coletar_metricas():
+    """Reúne as métricas internas do bot em um dicionário serializável"""
+    return {
+        'loop': monitor_loop.resumo(),
+        'fila': {
+            'na_fila': total_na_fila(),
+            'uploads_em_andamento': uploads_em_andamento(),
+            'tarefas_ativas': len(fila_ativa),
+        },
+        'deepseek': resumo_deepseek(),
+        'disjuntores': {nome: disjuntor.resumo() for nome, disjuntor in disjuntores_geradores.items()},
+        'impressoes_registradas': len(obter_registro_impressoes().entradas),
+        'banda': obter_limitador_banda().resumo(),
+        'disco': controle_espaco.resumo(),
+        'perfis': {
+            nome: {
+                'na_fila': perfil.fila.qsize(),
+                'em_andamento': perfil.em_andamento,
+                'vagas': perfil.vagas,
+                'cota': previsao_cota(perfil),
+            }
+            for nome, perfil in obter_perfis().items()
+        },
+    }
+
 # ========== VIEW BASE COM BOTÃO HOME ==========
 class ViewComHome(View):
     """View base que inclui botão Home em todas as páginas"""
@@ -101,9 +292,19 @@ class TarefaUpload:
         self.thumbnail_path = thumbnail_path
         self.agendar = agendar
         self.id_tarefa = f"{ctx.author.id}_{datetime.now().timestamp()}"
+        self.numero = next(contador_tarefas)
         self.status = "na_fila"
         self.mensagem_status = None
+        self.titulo_formatado = None
+        # Jogo e episódio do arquivo (ou inferido pelo catálogo), para a fila manter a ordem dos episódios
+        jogo, episodio, _ = analisar_nome_arquivo(video_info.get('video', ''))
+        self.jogo_chave = jogo.casefold() if jogo else None
+        self.episodio = episodio if episodio is not None else video_info.get('episodio_inferido')
         self.posicao = 0
+        self.perfil = None  # Perfil do YouTube escolhido pelo roteamento
+        self.sessao_upload = None  # Sessão resumível aberta no YouTube e bytes confirmados (vai para o checkpoint)
+        self.video_enviado = None  # ID do vídeo assim que o YouTube aceita o arquivo inteiro
+        self.cota_registrada = set()  # Operações da API que esta tarefa já descontou da cota
 
 class AgendamentoSelect(Select):
     def __init__(self, opcoes_agendamento):
@@ -142,11 +343,25 @@ class AgendamentoView(ViewComHome):
         self.add_item(AgendamentoSelect(opcoes_agendamento))
 
 class ValidacaoView(ViewComHome):
-    def __init__(self, timeout=300):
+    def __init__(self, timeout=300, bloqueada=False):
         super().__init__(timeout=timeout)
         self.aprovado = False
         self.editar_titulo = False
         self.editar_descricao = False
+        self.liberar(not bloqueada)
+    
+    def liberar(self, ativo=True):
+        """Habilita (ou não) aprovar e editar; cancelar fica sempre disponível"""
+        for botao in (self.aprovar_tudo, self.editar_titulo_btn, self.editar_descricao_btn):
+            botao.disabled = not ativo
+    
+    @property
+    def liberada(self):
+        return not self.aprovar_tudo.disabled
+    
+    @property
+    def continuar(self):
+        return self.aprovado or self.editar_titulo or self.editar_descricao
     
     @discord.ui.button(label="✅ Aprovar Tudo", style=discord.ButtonStyle.success, emoji="✅")
     async def aprovar_tudo(self, interaction: discord.Interaction, button: Button):
@@ -188,7 +403,7 @@ class FluxoContinuoView(ViewComHome):
             await interaction.followup.send("📋 Listando vídeos disponíveis...", ephemeral=False)
             
             # Chamar a função de listar vídeos
-            await listar_videos_reacao(interaction=interaction)
+            await listar_videos_seletor(interaction=interaction)
             
         except Exception as e:
             print(f"Erro no botão Adicionar Novo Vídeo: {e}")
@@ -262,7 +477,7 @@ class MenuView(ViewComHome):
         """CORREÇÃO: Resposta imediata e depois processamento"""
         try:
             await interaction.response.send_message("🔄 Iniciando processo de listagem...", ephemeral=True)
-            await listar_videos_reacao(interaction=interaction)
+            await listar_videos_seletor(interaction=interaction)
         except Exception as e:
             print(f"Erro no botão Listar Vídeos: {e}")
             try:
@@ -299,96 +514,1015 @@ class MenuView(ViewComHome):
                 channel = interaction.channel
                 await channel.send("❌ Erro ao buscar status.")
 
+# ========== RENDERIZAÇÃO DE EMBEDS ==========
+
+LIMITE_PAINEIS = 256  # Mensagens de status lembradas (as mais antigas são esquecidas)
+
+def truncar(texto, limite):
+    """Corta o texto no limite, indicando o corte com reticências"""
+    return f"{texto[:limite]}..." if len(texto) > limite else texto
+
+def assinatura_embed(embed):
+    """Resumo do que aparece no embed (sem o horário), para descartar edições que não mudam nada"""
+    dados = embed.to_dict()
+    dados.pop('timestamp', None)
+    return hashlib.blake2b(json.dumps(dados, sort_keys=True, ensure_ascii=False).encode('utf-8'), digest_size=16).digest()
+
+class ModeloEmbed:
+    """Esqueleto fixo de um embed (título, cor, rodapé e campos na ordem); só os valores mudam a cada uso"""
+    def __init__(self, titulo, cor, campos, rodape=None, com_horario=False):
+        self.titulo = titulo
+        self.cor = cor
+        self.campos = campos  # [(chave, nome, inline)]
+        self.rodape = rodape
+        self.com_horario = com_horario
+        self._esqueleto = None
+
+    def chaves(self, valores):
+        """Campos que vão aparecer: os que têm valor, na ordem do modelo"""
+        return tuple(chave for chave, _, _ in self.campos if valores.get(chave) is not None)
+
+    def criar(self, descricao=None, cor=None, **valores):
+        if self._esqueleto is None:
+            esqueleto = discord.Embed(title=self.titulo, color=self.cor)
+            if self.rodape:
+                esqueleto.set_footer(text=self.rodape)
+            self._esqueleto = esqueleto.to_dict()
+        
+        dados = dict(self._esqueleto)
+        if descricao:
+            dados['description'] = descricao
+        if cor is not None:
+            dados['color'] = cor
+        dados['fields'] = [
+            {'name': nome, 'value': valores[chave], 'inline': inline}
+            for chave, nome, inline in self.campos if valores.get(chave) is not None
+        ]
+        embed = discord.Embed.from_dict(dados)
+        if self.com_horario:
+            embed.timestamp = discord.utils.utcnow()
+        return embed
+
+class PainelEmbed:
+    """Mensagem de status editada várias vezes: troca só os campos que mudaram e pula edições sem efeito"""
+    def __init__(self, mensagem=None):
+        self.mensagem = mensagem
+        self.modelo = None
+        self.embed = None
+        self._chaves = ()
+        self._assinatura = None
+
+    def aplicar(self, modelo, descricao=None, cor=None, **valores):
+        """Atualiza o embed em memória; devolve True se algo visível mudou desde o último envio"""
+        chaves = modelo.chaves(valores)
+        if self.embed is None or modelo is not self.modelo or chaves != self._chaves:
+            self.embed = modelo.criar(descricao, cor, **valores)
+            self.modelo = modelo
+            self._chaves = chaves
+        else:
+            for i, chave in enumerate(chaves):
+                campo = self.embed.fields[i]
+                if campo.value != valores[chave]:
+                    self.embed.set_field_at(i, name=campo.name, value=valores[chave], inline=campo.inline)
+            self.embed.description = descricao or None
+            self.embed.colour = cor if cor is not None else modelo.cor
+            if modelo.com_horario:
+                self.embed.timestamp = discord.utils.utcnow()
+        return assinatura_embed(self.embed) != self._assinatura
+
+    async def enviar(self, destino):
+        """Envia o embed atual como mensagem nova"""
+        self.mensagem = await destino.send(embed=self.embed)
+        self._assinatura = assinatura_embed(self.embed)
+        _guardar_painel(self.mensagem.id, self)
+        return self.mensagem
+
+    async def atualizar(self, destino, modelo, descricao=None, cor=None, **valores):
+        """Edita a mensagem se o conteúdo mudou; se ela foi apagada, envia outra em destino"""
+        if not self.aplicar(modelo, descricao, cor, **valores):
+            return False
+        
+        if self.mensagem is None:
+            await self.enviar(destino)
+            return True
+        
+        try:
+            await self.mensagem.edit(embed=self.embed)
+            self._assinatura = assinatura_embed(self.embed)
+        except discord.NotFound:
+            print("Mensagem de status não encontrada, criando nova...")
+            await self.enviar(destino)
+        return True
+
+# Painéis pelo id da mensagem (a original continua apontando para o painel se ela for recriada)
+paineis_embed = {}
+
+def _guardar_painel(id_mensagem, painel):
+    if id_mensagem not in paineis_embed and len(paineis_embed) >= LIMITE_PAINEIS:
+        paineis_embed.pop(next(iter(paineis_embed)))
+    paineis_embed[id_mensagem] = painel
+
+def obter_painel(mensagem):
+    """Painel de uma mensagem já enviada, criado na primeira vez; dispensa o fetch_message a cada atualização"""
+    painel = paineis_embed.get(mensagem.id)
+    if painel is None:
+        painel = PainelEmbed(mensagem)
+        _guardar_painel(mensagem.id, painel)
+    return painel
+
+def descartar_painel(mensagem):
+    """Esquece o painel quando a mensagem não vai mais ser editada"""
+    if mensagem is None:
+        return
+    painel = paineis_embed.pop(mensagem.id, None)
+    if painel and painel.mensagem is not None:
+        paineis_embed.pop(painel.mensagem.id, None)
+
+MODELO_STATUS_FILA = ModeloEmbed("📋 Vídeo Adicionado à Fila de Upload", 0xffff00, [
+    ('titulo', "🎬 Título", False),
+    ('status', "📊 Status", False),
+    ('posicao', "📊 Posição na Fila", True),
+    ('numero', "🆔 Tarefa", True),
+    ('agendamento', "⏰ Agendamento", True),
+    ('perfil', "📺 Conta do YouTube", True),
+])
+
+TEXTOS_STATUS_FILA = {
+    "na_fila": "⏳ **Na Fila** - Posição: `{posicao}`",
+    "em_upload": "📤 **Fazendo Upload** - Processando...",
+    "aguardando_cota": "⛽ **Aguardando Cota** - Retoma após o reset diário do YouTube",
+    "concluido": "✅ **Concluído**",
+    "erro": "❌ **Erro no Upload**",
+    "cancelado": "🛑 **Cancelado**",
+    "interrompido": "🔌 **Interrompido** - continua quando o bot voltar",
+}
+
+MODELO_STATUS_UPLOAD = ModeloEmbed("📤 Status do Upload - YouTube", 0x0099ff, [
+    ('progresso', "📊 Progresso", False),
+], com_horario=True)
+
+def valores_status_fila(tarefa):
+    """Valores do embed de status de uma tarefa na fila"""
+    if tarefa.titulo_formatado is None:
+        tarefa.titulo_formatado = f"```{truncar(tarefa.titulo, 100)}```"
+    return {
+        'titulo': tarefa.titulo_formatado,
+        'status': TEXTOS_STATUS_FILA.get(tarefa.status, tarefa.status).format(posicao=tarefa.posicao),
+        'posicao': f"`{tarefa.posicao}`",
+        'numero': f"`#{tarefa.numero}`",
+        'agendamento': f"`{tarefa.agendar}`" if tarefa.agendar and tarefa.agendar != "imediato" else None,
+        'perfil': f"`{tarefa.perfil.nome}`" if tarefa.perfil and len(obter_perfis()) > 1 else None,
+    }
+
+# ========== CONTROLE DOS UPLOADS ==========
+
+class UploadCancelado(Exception):
+    """Levantada entre dois chunks quando o dono cancela a tarefa que está sendo enviada"""
+
+class UploadInterrompido(Exception):
+    """Levantada entre dois chunks quando o bot está desligando; a sessão fica aberta para o checkpoint"""
+
+class UploadReservaPerdida(Exception):
+    """Levantada entre dois chunks quando o trabalhador perdeu a reserva do upload no broker; outro trabalhador
+    já pode estar enviando pela mesma sessão, então ela não é encerrada"""
+
+class ControleUploads:
+    """Pausa, retomada e cancelamento dos trabalhadores; tudo vale a partir do próximo limite de chunk"""
+    def __init__(self):
+        self.pausado = False
+        self.pausado_em = None
+        self.cancelados = set()  # id_tarefa das tarefas em envio marcadas para cancelar
+        self.encerrando = False
+        self.interrompidas = []  # Tarefas paradas pelo desligamento, para o checkpoint
+        self.reservas_perdidas = set()  # id_tarefa cujas reservas no broker passaram para outro trabalhador
+        self._aguardando = []
+
+    def pausar(self):
+        if self.pausado:
+            return False
+        self.pausado = True
+        self.pausado_em = datetime.now()
+        return True
+
+    def retomar(self):
+        if not self.pausado:
+            return False
+        self.pausado = False
+        self.pausado_em = None
+        self._acordar()
+        return True
+
+    def cancelar(self, tarefa):
+        self.cancelados.add(tarefa.id_tarefa)
+        self._acordar()
+
+    def encerrar(self):
+        """Desligamento: nenhuma tarefa nova começa e os envios param no próximo chunk"""
+        self.encerrando = True
+        self._acordar()
+
+    def cancelada(self, tarefa):
+        return tarefa is not None and tarefa.id_tarefa in self.cancelados
+
+    def perder_reserva(self, tarefa):
+        self.reservas_perdidas.add(tarefa.id_tarefa)
+        self._acordar()
+
+    def reserva_perdida(self, tarefa):
+        """Modo broker: a reserva foi tomada ou está para vencer sem batimento (processo suspenso, lock do SQLite)"""
+        if tarefa is None:
+            return False
+        reserva_ate = getattr(tarefa, 'reserva_ate', None)
+        return tarefa.id_tarefa in self.reservas_perdidas or (reserva_ate is not None and time.time() > reserva_ate)
+
+    def esquecer(self, tarefa):
+        self.cancelados.discard(tarefa.id_tarefa)
+        self.reservas_perdidas.discard(tarefa.id_tarefa)
+
+    async def aguardar_liberacao(self, tarefa=None):
+        """Segura enquanto estiver pausado; levanta UploadCancelado se a tarefa for cancelada (mesmo pausada)
+        e UploadInterrompido no desligamento (sem tarefa, segura de vez)"""
+        while True:
+            # Antes do cancelamento: com a reserva perdida, a sessão é de outro trabalhador e não pode ser encerrada
+            if self.reserva_perdida(tarefa):
+                raise UploadReservaPerdida()
+            if self.cancelada(tarefa):
+                raise UploadCancelado()
+            if self.encerrando:
+                if tarefa is not None:
+                    raise UploadInterrompido()
+            elif not self.pausado:
+                return
+            futuro = asyncio.get_running_loop().create_future()
+            self._aguardando.append(futuro)
+            try:
+                await futuro
+            finally:
+                if futuro in self._aguardando:
+                    self._aguardando.remove(futuro)
+
+    async def cochilar(self, segundos, tarefa):
+        """Espera até `segundos`, mas acorda na hora se a tarefa for cancelada ou o bot começar a desligar
+        (e então levanta UploadCancelado/UploadInterrompido, como o aguardar_liberacao)"""
+        futuro = asyncio.get_running_loop().create_future()
+        self._aguardando.append(futuro)
+        try:
+            await asyncio.wait_for(futuro, timeout=segundos)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if futuro in self._aguardando:
+                self._aguardando.remove(futuro)
+        await self.aguardar_liberacao(tarefa)
+
+    def _acordar(self):
+        aguardando, self._aguardando = self._aguardando, []
+        for futuro in aguardando:
+            if not futuro.done():
+                futuro.set_result(None)
+
+controle_uploads = ControleUploads()
+
+def localizar_tarefa(numero):
+    """Tarefa na fila ou em envio pelo número curto (#N)"""
+    for tarefa in fila_ativa.values():
+        if tarefa.numero == numero:
+            return tarefa
+    return None
+
+async def encerrar_sessao_resumivel(request):
+    """Encerra no YouTube a sessão de upload resumível (DELETE na URI da sessão), descartando o que já foi enviado"""
+    uri = getattr(request, 'resumable_uri', None)
+    if not uri:
+        return False  # O primeiro chunk nem chegou a abrir a sessão
+    try:
+        # O http do próprio cliente já leva a autorização do perfil
+        resposta, _ = await executar_em_thread(request.http.request, uri, 'DELETE')
+        # O YouTube responde 499 (Client Closed Request) a uma sessão encerrada
+        return resposta.status in (200, 204, 404, 499)
+    except Exception as e:
+        print(f"⚠️ Não foi possível encerrar a sessão de upload: {e}")
+        return False
+
+async def retomar_sessao_resumivel(request, sessao, tamanho):
+    """Reabre a sessão salva no checkpoint perguntando ao YouTube quantos bytes ele já tem.
+    Deixa request pronto para continuar (ou sem sessão, se ela expirou); devolve a resposta final se o envio já tinha terminado"""
+    if not sessao or sessao.get('tamanho') != tamanho:
+        return None  # Arquivo mudou desde o checkpoint: recomeça do zero
+    try:
+        resposta, conteudo = await executar_em_thread(partial(
+            request.http.request, sessao['uri'], 'PUT',
+            headers={'Content-Range': f"bytes */{tamanho}", 'Content-Length': '0'}
+        ))
+    except Exception as e:
+        print(f"⚠️ Não foi possível consultar a sessão de upload salva: {e}")
+        return None
+    if resposta.status in (200, 201):
+        return request.postproc(resposta, conteudo)
+    if resposta.status != 308:
+        print(f"⚠️ Sessão de upload salva não existe mais (HTTP {resposta.status}); o envio recomeça do zero")
+        return None
+    # O Range do YouTube é a fonte de verdade; o offset do checkpoint pode estar um chunk atrás
+    faixa = resposta.get('range')
+    request.resumable_uri = sessao['uri']
+    request.resumable_progress = int(faixa.split('-')[1]) + 1 if faixa else 0
+    return None
+
+# ========== DESLIGAMENTO GRACIOSO ==========
+
+def estado_checkpoint(tarefa):
+    """Dados de uma tarefa que bastam para recriá-la depois de reiniciar"""
+    impressao = {k: v for k, v in (getattr(tarefa, 'impressao', None) or {}).items() if k != 'duplicado'}
+    return {
+        'id_tarefa': tarefa.id_tarefa,
+        'canal': tarefa.ctx.channel.id,
+        'autor': tarefa.ctx.author.id,
+        'video_info': tarefa.video_info,
+        'titulo': tarefa.titulo,
+        'descricao': tarefa.descricao,
+        'thumbnail_path': tarefa.thumbnail_path,
+        'agendar': tarefa.agendar,
+        'perfil': tarefa.perfil.nome if tarefa.perfil else None,
+        'impressao': impressao,
+        'sessao_upload': tarefa.sessao_upload,
+    }
+
+def salvar_checkpoint(tarefas):
+    """Grava as tarefas pendentes (e as sessões resumíveis abertas) para o próximo início"""
+    dados = {
+        'salvo_em': datetime.now().isoformat(timespec='seconds'),
+        'tarefas': [estado_checkpoint(t) for t in tarefas],
+    }
+    temporario = f"{ARQUIVO_CHECKPOINT}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=1)
+    os.replace(temporario, ARQUIVO_CHECKPOINT)
+
+def tarefas_para_checkpoint():
+    """Interrompidas no meio do envio primeiro, depois as que esperavam na fila, na ordem de cada perfil"""
+    tarefas = list(controle_uploads.interrompidas)
+    tarefas += sorted(
+        (t for t in fila_ativa.values() if t.status != "cancelado"),
+        key=lambda t: (t.perfil.nome if t.perfil else "", t.posicao)
+    )
+    vistas = set()
+    resultado = []
+    for tarefa in tarefas:
+        # Vídeo já aceito pelo YouTube (faltava só a thumbnail): enviar de novo duplicaria
+        if tarefa.id_tarefa in vistas or tarefa.video_enviado:
+            continue
+        vistas.add(tarefa.id_tarefa)
+        resultado.append(tarefa)
+    return resultado
+
+async def desligar_graciosamente(motivo):
+    """Para de aceitar tarefas, deixa o chunk atual terminar, salva o checkpoint e fecha o bot dentro do prazo"""
+    limite = time.monotonic() + PRAZO_DESLIGAMENTO
+    # Reserva do prazo para o checkpoint e as edições finais no Discord
+    limite_envios = limite - min(5, PRAZO_DESLIGAMENTO / 3)
+    print(f"🔌 {motivo}: desligando em até {PRAZO_DESLIGAMENTO:.0f}s")
+    
+    controle_uploads.encerrar()
+    while any(t.status == "em_upload" for t in fila_ativa.values()) and time.monotonic() < limite_envios:
+        await asyncio.sleep(0.1)
+    
+    tarefas = tarefas_para_checkpoint()
+    try:
+        salvar_checkpoint(tarefas)
+        retomaveis = sum(1 for t in tarefas if t.sessao_upload)
+        print(f"💾 Checkpoint salvo: {len(tarefas)} tarefa(s), {retomaveis} com upload em andamento")
+    except Exception as e:
+        print(f"❌ Erro ao salvar o checkpoint dos uploads: {e}")
+    
+    async def avisar_discord():
+        for tarefa in tarefas:
+            tarefa.status = "interrompido"
+            await atualizar_status_fila(tarefa)
+        await obter_quadro_fila_global().descarregar()
+        canal = bot.get_channel(CANAL_DISCORD_ID)
+        if canal and tarefas:
+            await canal.send(
+                f"🔌 **Bot reiniciando.** `{len(tarefas)}` upload(s) salvos; "
+                "os envios continuam do ponto em que pararam quando o bot voltar."
+            )
+    
+    try:
+        await asyncio.wait_for(avisar_discord(), timeout=max(0.1, limite - time.monotonic() - 1))
+    except asyncio.TimeoutError:
+        print("⚠️ Prazo de desligamento esgotado antes de atualizar todas as mensagens do Discord")
+    except Exception as e:
+        print(f"⚠️ Erro ao atualizar o Discord no desligamento: {e}")
+    
+    monitor_loop.parar()
+    try:
+        await asyncio.wait_for(bot.close(), timeout=max(0.1, limite - time.monotonic()))
+    except asyncio.TimeoutError:
+        print("⚠️ Conexão com o Discord não fechou dentro do prazo")
+
+def pedir_desligamento(nome_sinal):
+    if controle_uploads.encerrando:
+        print(f"🔌 {nome_sinal} recebido de novo; o desligamento já está em andamento")
+        return
+    asyncio.get_running_loop().create_task(desligar_graciosamente(f"{nome_sinal} recebido"))
+
+def instalar_sinais_desligamento(ao_receber=None):
+    """SIGTERM (e Ctrl+C) passam pelo desligamento gracioso em vez de matar os uploads no meio"""
+    ao_receber = ao_receber or pedir_desligamento
+    loop = asyncio.get_running_loop()
+    for sinal in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sinal, ao_receber, sinal.name)
+        except NotImplementedError:
+            # Windows: sem add_signal_handler, o handler comum repassa o pedido ao loop
+            signal.signal(sinal, lambda numero, _quadro: loop.call_soon_threadsafe(
+                ao_receber, signal.Signals(numero).name))
+
+async def restaurar_checkpoint():
+    """Recoloca na fila as tarefas salvas no último desligamento"""
+    if not os.path.exists(ARQUIVO_CHECKPOINT):
+        return 0
+    try:
+        with open(ARQUIVO_CHECKPOINT, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        os.remove(ARQUIVO_CHECKPOINT)  # Um checkpoint só é restaurado uma vez
+    except (OSError, ValueError) as e:
+        print(f"❌ Checkpoint de uploads ilegível ({e}); ignorando")
+        return 0
+    
+    restauradas = 0
+    for estado in dados.get('tarefas', []):
+        video_info = estado['video_info']
+        canal = bot.get_channel(estado['canal']) or bot.get_channel(CANAL_DISCORD_ID)
+        if canal is None or not os.path.exists(video_info.get('video', '')):
+            print(f"⚠️ Tarefa do checkpoint descartada (vídeo ou canal indisponível): {estado['titulo']}")
+            continue
+        autor = bot.get_user(estado['autor']) or discord.Object(id=estado['autor'])
+        tarefa = await adicionar_na_fila(
+            ContextoInteracao(canal, autor),
+            video_info,
+            estado['titulo'],
+            estado['descricao'],
+            estado.get('thumbnail_path'),
+            estado.get('agendar'),
+            retomada=estado
+        )
+        if tarefa is not None:
+            restauradas += 1
+    
+    print(f"♻️ {restauradas} tarefa(s) restaurada(s) do checkpoint de {dados.get('salvo_em')}")
+    return restauradas
+
+# ========== BROKER DE UPLOADS (MODO MULTIPROCESSO) ==========
+
+INTERVALO_BROKER = 0.5  # Segundos entre consultas ao broker (bot e trabalhadores)
+INTERVALO_BATIMENTO = 2  # Segundos entre batimentos de um trabalhador
+VALIDADE_RESERVA_BROKER = 30  # Sem batimento por esse tempo, outro trabalhador assume o upload
+MARGEM_RESERVA_BROKER = 5  # O trabalhador para de enviar esse tanto antes da própria reserva vencer
+
+ESQUEMA_BROKER = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS jobs (
+    id_tarefa TEXT PRIMARY KEY,
+    perfil TEXT,
+    dados TEXT NOT NULL,
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    trabalhador TEXT,
+    validade_reserva REAL,
+    sessao_upload TEXT,
+    cancelar INTEGER NOT NULL DEFAULT 0,
+    resultado TEXT,
+    criado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_estado ON jobs (estado, criado_em);
+CREATE TABLE IF NOT EXISTS eventos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_tarefa TEXT NOT NULL,
+    dados TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_eventos_tarefa ON eventos (id_tarefa, id);
+CREATE TABLE IF NOT EXISTS controle (
+    chave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+class BrokerUploads:
+    """Fila de uploads em SQLite compartilhada entre o bot (que enfileira) e os processos --worker (que enviam)"""
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self._lock = threading.Lock()
+        # Vários processos no mesmo arquivo: espera o lock do SQLite em vez de falhar na hora
+        self.conexao = sqlite3.connect(arquivo, timeout=30, check_same_thread=False)
+        self.conexao.row_factory = sqlite3.Row
+        with self._lock, self.conexao:
+            self.conexao.executescript(ESQUEMA_BROKER)
+
+    # --- Lado do bot ---
+
+    def enviar(self, id_tarefa, perfil, dados):
+        """Enfileira o upload; se ele já existe (tarefa restaurada do checkpoint), só devolve o último evento visto"""
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "INSERT OR IGNORE INTO jobs (id_tarefa, perfil, dados, criado_em) VALUES (?, ?, ?, ?)",
+                (id_tarefa, perfil, json.dumps(dados, ensure_ascii=False), time.time())
+            )
+            linha = self.conexao.execute("SELECT MAX(id) FROM eventos WHERE id_tarefa = ?", (id_tarefa,)).fetchone()
+        return linha[0] or 0
+
+    def acompanhar(self, id_tarefa, ultimo_evento, pausado, cancelar):
+        """Repassa pausa e cancelamento e devolve (eventos novos, resultado ou None)"""
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "INSERT OR REPLACE INTO controle (chave, valor) VALUES ('pausado', ?)", ('1' if pausado else '0',)
+            )
+            if cancelar:
+                self.conexao.execute("UPDATE jobs SET cancelar = 1 WHERE id_tarefa = ?", (id_tarefa,))
+                # Ninguém pegou ainda: cancela direto, sem esperar um trabalhador
+                self.conexao.execute(
+                    "UPDATE jobs SET estado = 'concluido', resultado = ? WHERE id_tarefa = ? AND estado = 'pendente'",
+                    (json.dumps({"status": "cancelado", "mensagem": "Cancelado pelo dono antes de começar."}), id_tarefa)
+                )
+            eventos = self.conexao.execute(
+                "SELECT id, dados FROM eventos WHERE id_tarefa = ? AND id > ? ORDER BY id", (id_tarefa, ultimo_evento)
+            ).fetchall()
+            job = self.conexao.execute(
+                "SELECT estado, resultado FROM jobs WHERE id_tarefa = ?", (id_tarefa,)
+            ).fetchone()
+        resultado = json.loads(job['resultado']) if job and job['estado'] == 'concluido' else None
+        return [(linha['id'], json.loads(linha['dados'])) for linha in eventos], resultado
+
+    def esquecer(self, id_tarefa):
+        """Apaga o upload e os eventos depois que o bot leu o resultado"""
+        with self._lock, self.conexao:
+            self.conexao.execute("DELETE FROM jobs WHERE id_tarefa = ?", (id_tarefa,))
+            self.conexao.execute("DELETE FROM eventos WHERE id_tarefa = ?", (id_tarefa,))
+
+    def resumo(self):
+        """Uploads por estado e trabalhadores com reserva válida"""
+        with self._lock:
+            estados = dict(self.conexao.execute("SELECT estado, COUNT(*) FROM jobs GROUP BY estado").fetchall())
+            trabalhadores = self.conexao.execute(
+                "SELECT COUNT(DISTINCT trabalhador) FROM jobs WHERE estado = 'reservado' AND validade_reserva >= ?",
+                (time.time(),)
+            ).fetchone()[0]
+        return {
+            'pendentes': estados.get('pendente', 0),
+            'enviando': estados.get('reservado', 0),
+            'concluidos': estados.get('concluido', 0),
+            'trabalhadores': trabalhadores,
+        }
+
+    # --- Lado do trabalhador ---
+
+    def reservar(self, trabalhador, perfis=None):
+        """Pega o upload pendente mais antigo (ou um cuja reserva venceu); None se não houver"""
+        agora = time.time()
+        filtro_perfis = ""
+        parametros = [agora]
+        if perfis:
+            filtro_perfis = f" AND perfil IN ({', '.join('?' * len(perfis))})"
+            parametros += list(perfis)
+        with self._lock, self.conexao:
+            # BEGIN IMMEDIATE: dois trabalhadores não reservam o mesmo upload
+            self.conexao.execute("BEGIN IMMEDIATE")
+            job = self.conexao.execute(
+                "SELECT * FROM jobs WHERE (estado = 'pendente' OR (estado = 'reservado' AND validade_reserva < ?))"
+                f"{filtro_perfis} ORDER BY criado_em LIMIT 1",
+                parametros
+            ).fetchone()
+            if job is None:
+                return None
+            self.conexao.execute(
+                "UPDATE jobs SET estado = 'reservado', trabalhador = ?, validade_reserva = ? WHERE id_tarefa = ?",
+                (trabalhador, agora + VALIDADE_RESERVA_BROKER, job['id_tarefa'])
+            )
+        job = dict(job)
+        job['dados'] = json.loads(job['dados'])
+        job['sessao_upload'] = json.loads(job['sessao_upload']) if job['sessao_upload'] else None
+        return job
+
+    def batimento(self, trabalhador, sessoes):
+        """Renova as reservas e guarda as sessões resumíveis; devolve (pausado, ids a cancelar, ids com reserva perdida)"""
+        validade = time.time() + VALIDADE_RESERVA_BROKER
+        perdidas = []
+        with self._lock, self.conexao:
+            for id_tarefa, sessao in sessoes.items():
+                cursor = self.conexao.execute(
+                    "UPDATE jobs SET validade_reserva = ?, sessao_upload = ? "
+                    "WHERE id_tarefa = ? AND trabalhador = ? AND estado = 'reservado'",
+                    (validade, json.dumps(sessao) if sessao else None, id_tarefa, trabalhador)
+                )
+                if cursor.rowcount == 0:
+                    # A reserva venceu e outro trabalhador assumiu (ou o bot já encerrou o upload)
+                    perdidas.append(id_tarefa)
+            pausado = self.conexao.execute("SELECT valor FROM controle WHERE chave = 'pausado'").fetchone()
+            cancelar = self.conexao.execute(
+                "SELECT id_tarefa FROM jobs WHERE trabalhador = ? AND estado = 'reservado' AND cancelar = 1", (trabalhador,)
+            ).fetchall()
+        return bool(pausado and pausado[0] == '1'), [linha[0] for linha in cancelar], perdidas
+
+    def publicar_evento(self, id_tarefa, dados):
+        with self._lock, self.conexao:
+            self.conexao.execute(
+                "INSERT INTO eventos (id_tarefa, dados) VALUES (?, ?)", (id_tarefa, json.dumps(dados, ensure_ascii=False))
+            )
+
+    def concluir(self, id_tarefa, trabalhador, resultado):
+        """Grava o resultado; False se a reserva já não é deste trabalhador"""
+        with self._lock, self.conexao:
+            cursor = self.conexao.execute(
+                "UPDATE jobs SET estado = 'concluido', resultado = ?, sessao_upload = NULL "
+                "WHERE id_tarefa = ? AND trabalhador = ? AND estado = 'reservado'",
+                (json.dumps(resultado, ensure_ascii=False), id_tarefa, trabalhador)
+            )
+        return cursor.rowcount > 0
+
+    def devolver(self, id_tarefa, trabalhador, sessao):
+        """Trabalhador desligando: o upload volta para a fila com a sessão, e outro continua de onde parou.
+        False se a reserva já não é deste trabalhador (quem a assumiu segue com o upload)"""
+        with self._lock, self.conexao:
+            cursor = self.conexao.execute(
+                "UPDATE jobs SET estado = 'pendente', trabalhador = NULL, validade_reserva = NULL, sessao_upload = ? "
+                "WHERE id_tarefa = ? AND trabalhador = ? AND estado = 'reservado'",
+                (json.dumps(sessao) if sessao else None, id_tarefa, trabalhador)
+            )
+        return cursor.rowcount > 0
+
+broker_uploads = None
+
+def obter_broker():
+    global broker_uploads
+    if broker_uploads is None:
+        broker_uploads = BrokerUploads(ARQUIVO_BROKER)
+    return broker_uploads
+
+class RelatorUpload(ABC):
+    """Para onde o upload_youtube_real manda as etapas do envio e o gasto de cota"""
+    @abstractmethod
+    async def etapa(self, etapa, progresso=0, total=100, detalhes=""):
+        """Publica uma etapa do envio (painel do Discord ou evento do broker)"""
+
+    def registrar_cota(self, projeto, operacao):
+        obter_registro_cota().registrar(projeto, operacao)
+
+    def marcar_cota_esgotada(self, projeto):
+        obter_registro_cota().marcar_esgotada(projeto)
+
+class RelatorDiscord(RelatorUpload):
+    """Modo de um processo só: as etapas editam o painel da tarefa no Discord"""
+    def __init__(self, ctx, id_mensagem, tarefa=None):
+        self.ctx = ctx
+        self.id_mensagem = id_mensagem
+        self.tarefa = tarefa
+
+    async def etapa(self, etapa, progresso=0, total=100, detalhes=""):
+        await atualizar_status_upload(self.ctx, self.id_mensagem, etapa, progresso, total, detalhes)
+
+    def registrar_cota(self, projeto, operacao):
+        super().registrar_cota(projeto, operacao)
+        if self.tarefa is not None:
+            self.tarefa.cota_registrada.add(operacao)
+
+class RelatorBroker(RelatorUpload):
+    """Processo trabalhador: as etapas viram eventos no broker e a cota vai junto com a próxima etapa
+    ou com o resultado (só o bot grava cota_youtube.json)"""
+    def __init__(self, broker, id_tarefa):
+        self.broker = broker
+        self.id_tarefa = id_tarefa
+        self.operacoes_cota = []
+
+    async def etapa(self, etapa, progresso=0, total=100, detalhes=""):
+        # A cota gasta segue no evento: um upload devolvido ao broker não perde o insert já cobrado
+        cota, self.operacoes_cota = self.operacoes_cota, []
+        await executar_em_thread(self.broker.publicar_evento, self.id_tarefa, {
+            'etapa': etapa, 'progresso': progresso, 'total': total, 'detalhes': detalhes, 'cota': cota
+        })
+
+    def registrar_cota(self, projeto, operacao):
+        self.operacoes_cota.append(['registrar', projeto, operacao])
+
+    def marcar_cota_esgotada(self, projeto):
+        self.operacoes_cota.append(['esgotada', projeto, None])
+
+def aplicar_cota_remota(relator, operacoes):
+    """Grava no registro de cota do bot as operações que um trabalhador fez"""
+    for operacao, projeto, nome in operacoes:
+        if operacao == 'registrar':
+            relator.registrar_cota(projeto, nome)
+        else:
+            relator.marcar_cota_esgotada(projeto)
+
+async def upload_via_broker(tarefa, perfil):
+    """Lado do bot no modo broker: entrega o upload a um trabalhador e repassa o progresso ao painel"""
+    broker = obter_broker()
+    relator = RelatorDiscord(tarefa.ctx, tarefa.mensagem_status.id, tarefa)
+    dados = {
+        'video_path': tarefa.video_info['video'],
+        'titulo': tarefa.titulo,
+        'descricao': tarefa.descricao,
+        'thumbnail_path': tarefa.thumbnail_path,
+        'agendar': tarefa.agendar if tarefa.agendar != "imediato" else None,
+    }
+    ultimo_evento = await executar_em_thread(broker.enviar, tarefa.id_tarefa, perfil.nome, dados)
+    await relator.etapa("📨 Aguardando um trabalhador", 5, 100, "Upload entregue ao broker; um processo --worker vai enviá-lo")
+    
+    while True:
+        # Desligando: o trabalhador segue enviando e a tarefa restaurada do checkpoint volta a acompanhá-lo
+        if controle_uploads.encerrando:
+            return {"status": "interrompido", "mensagem": "Bot desligando; o trabalhador continua o envio."}
+        eventos, resultado = await executar_em_thread(
+            broker.acompanhar, tarefa.id_tarefa, ultimo_evento, controle_uploads.pausado, controle_uploads.cancelada(tarefa)
+        )
+        for ultimo_evento, evento in eventos:
+            aplicar_cota_remota(relator, evento.pop('cota', []))
+            await relator.etapa(**evento)
+        if resultado is not None:
+            aplicar_cota_remota(relator, resultado.pop('cota', []))
+            await executar_em_thread(broker.esquecer, tarefa.id_tarefa)
+            return resultado
+        await asyncio.sleep(INTERVALO_BROKER)
+
+class TarefaRemota:
+    """O que o upload_youtube_real usa de uma tarefa, no processo trabalhador"""
+    def __init__(self, job):
+        self.id_tarefa = job['id_tarefa']
+        self.titulo = job['dados']['titulo']
+        self.sessao_upload = job['sessao_upload']
+        self.video_enviado = None
+        # Relógio de parede (não o monotônico): uma máquina que dormiu também tem a reserva vencida
+        self.reserva_ate = time.time() + VALIDADE_RESERVA_BROKER - MARGEM_RESERVA_BROKER
+
+async def sincronizar_trabalhador(broker, nome, ativas):
+    """Batimento do trabalhador: renova reservas, salva as sessões e aplica pausa/cancelamento vindos do bot"""
+    while True:
+        try:
+            sessoes = {id_tarefa: tarefa.sessao_upload for id_tarefa, tarefa in ativas.items()}
+            inicio = time.time()
+            pausado, cancelar, perdidas = await executar_em_thread(broker.batimento, nome, sessoes)
+            for id_tarefa in sessoes:
+                if id_tarefa not in ativas:
+                    continue
+                if id_tarefa in perdidas:
+                    controle_uploads.perder_reserva(ativas[id_tarefa])
+                else:
+                    ativas[id_tarefa].reserva_ate = inicio + VALIDADE_RESERVA_BROKER - MARGEM_RESERVA_BROKER
+            if pausado:
+                controle_uploads.pausar()
+            else:
+                controle_uploads.retomar()
+            for id_tarefa in cancelar:
+                if id_tarefa in ativas:
+                    controle_uploads.cancelar(ativas[id_tarefa])
+        except Exception as e:
+            print(f"⚠️ Erro no batimento com o broker: {e}")
+        await asyncio.sleep(INTERVALO_BATIMENTO)
+
+async def vaga_trabalhador(broker, nome, vaga, perfis, ativas):
+    """Uma vaga do processo trabalhador: reserva um upload por vez e envia com o upload_youtube_real"""
+    while not controle_uploads.encerrando:
+        if controle_uploads.pausado:
+            await asyncio.sleep(INTERVALO_BROKER)
+            continue
+        job = await executar_em_thread(broker.reservar, nome, perfis)
+        if job is None:
+            await asyncio.sleep(INTERVALO_BROKER)
+            continue
+        
+        tarefa = TarefaRemota(job)
+        ativas[tarefa.id_tarefa] = tarefa
+        relator = RelatorBroker(broker, tarefa.id_tarefa)
+        dados = job['dados']
+        print(f"📤 [{nome}/{vaga}] Enviando {tarefa.titulo}")
+        try:
+            resultado = await upload_youtube_real(
+                None, None,
+                dados['video_path'],
+                dados['titulo'],
+                dados['descricao'],
+                dados['thumbnail_path'],
+                dados['agendar'],
+                perfil=obter_perfis().get(job['perfil']) or obter_perfil_padrao(),
+                vaga=vaga,
+                tarefa=tarefa,
+                relator=relator
+            )
+            if resultado['status'] == 'reserva_perdida':
+                print(f"⚠️ [{nome}/{vaga}] Reserva de {tarefa.titulo} perdida; o upload segue com outro trabalhador")
+            elif resultado['status'] == 'interrompido':
+                await executar_em_thread(broker.devolver, tarefa.id_tarefa, nome, tarefa.sessao_upload)
+            else:
+                resultado['cota'] = relator.operacoes_cota
+                if not await executar_em_thread(broker.concluir, tarefa.id_tarefa, nome, resultado):
+                    print(f"⚠️ [{nome}/{vaga}] Resultado de {tarefa.titulo} descartado: a reserva já era de outro trabalhador")
+        except Exception as e:
+            print(f"Erro no trabalhador {nome}/{vaga}: {e}")
+            await executar_em_thread(broker.devolver, tarefa.id_tarefa, nome, tarefa.sessao_upload)
+            await asyncio.sleep(10)
+        finally:
+            del ativas[tarefa.id_tarefa]
+            controle_uploads.esquecer(tarefa)
+
+async def executar_trabalhador(nome, vagas, perfis=None):
+    """Processo --worker: envia os uploads do broker ao YouTube, sem conexão com o Discord"""
+    broker = obter_broker()
+    ativas = {}
+    
+    def encerrar_trabalhador(nome_sinal):
+        print(f"🔌 {nome_sinal} recebido: os envios param no fim do chunk atual e voltam para o broker")
+        controle_uploads.encerrar()
+    
+    instalar_sinais_desligamento(encerrar_trabalhador)
+    sincronizador = asyncio.get_running_loop().create_task(sincronizar_trabalhador(broker, nome, ativas))
+    print(f"🏭 Trabalhador {nome} com {vagas} vaga(s) ligado ao broker {ARQUIVO_BROKER}")
+    try:
+        await asyncio.gather(*(vaga_trabalhador(broker, nome, vaga, perfis, ativas) for vaga in range(vagas)))
+    finally:
+        sincronizador.cancel()
+        print(f"🔌 Trabalhador {nome} encerrado")
+
+def ler_argumentos_trabalhador():
+    parser = argparse.ArgumentParser(description="Processo trabalhador de uploads (modo broker)")
+    parser.add_argument('--worker', action='store_true', help="Roda como trabalhador em vez do bot do Discord")
+    parser.add_argument('--nome', default=f"trabalhador-{os.getpid()}", help="Nome do trabalhador nas reservas do broker")
+    parser.add_argument('--vagas', type=int, default=1, help="Uploads simultâneos neste processo")
+    parser.add_argument('--perfis', default="", help="Perfis do YouTube atendidos, separados por vírgula (padrão: todos)")
+    return parser.parse_args()
+
 # ========== FUNÇÕES DO SISTEMA DE FILA ==========
 
 async def gerenciador_fila_uploads():
-    """Processa a fila de uploads sequencialmente"""
-    global upload_em_andamento, ultima_mensagem_status
+    """Inicia um trabalhador para cada vaga de cada perfil do YouTube"""
+    perfis = obter_perfis()
+    trabalhadores = [
+        trabalhador_uploads(perfil, vaga)
+        for perfil in perfis.values()
+        for vaga in range(perfil.vagas)
+    ]
+    print(f"🔄 {len(trabalhadores)} trabalhador(es) de upload em {len(perfis)} perfil(is) do YouTube")
+    await asyncio.gather(*trabalhadores)
+
+async def trabalhador_uploads(perfil, vaga):
+    """Processa a fila de um perfil; cada vaga envia um vídeo por vez"""
+    global ultima_mensagem_status
     
     while True:
         try:
-            if not fila_uploads.empty() and not upload_em_andamento:
-                upload_em_andamento = True
-                tarefa = await fila_uploads.get()
+            # Pausado: nenhuma vaga pega tarefa nova até o !retomar
+            await controle_uploads.aguardar_liberacao()
+            tarefa = await perfil.fila.get()
+            if controle_uploads.pausado or controle_uploads.encerrando:
+                # O !pausar (ou o desligamento) chegou com a vaga já esperando no get(): a tarefa volta para a fila
+                perfil.fila.devolver(tarefa)
+                continue
+            perfil.em_andamento += 1
+            
+            # Atualizar status
+            tarefa.status = "em_upload"
+            await atualizar_status_fila(tarefa)
+            await atualizar_fila_global()
+            
+            # Executar upload
+            inicio = time.monotonic()
+            tentativas = 0
+            duracao_video = None
+            try:
+                # Revalidar antes de transferir (cache por caminho/tamanho/mtime, barato se nada mudou)
+                validacao = await validar_pacote_video_async(tarefa.video_info)
+                if not validacao['valido']:
+                    resultado = {
+                        "status": "erro",
+                        "mensagem": "Validação pré-upload falhou: " + "; ".join(validacao['problemas'])
+                    }
+                else:
+                    duracao_video = (validacao.get('video') or {}).get('duracao')
+                    # Cota esgotada no meio do envio: segurar a tarefa até o reset e tentar de novo
+                    while True:
+                        try:
+                            await aguardar_cota(tarefa)
+                            # Cancelada (ou bot desligando) enquanto esperava: nem abre a sessão no YouTube
+                            await controle_uploads.aguardar_liberacao(tarefa)
+                        except UploadCancelado:
+                            resultado = {"status": "cancelado", "mensagem": "Cancelado pelo dono antes do envio começar."}
+                            break
+                        except UploadInterrompido:
+                            resultado = {"status": "interrompido", "mensagem": "Interrompido pelo desligamento do bot."}
+                            break
+                        tentativas += 1
+                        if MODO_FILA == 'broker':
+                            resultado = await upload_via_broker(tarefa, perfil)
+                            if not resultado.get('cota_esgotada'):
+                                break
+                            continue
+                        resultado = await upload_youtube_real(
+                            tarefa.ctx,
+                            tarefa.mensagem_status,
+                            tarefa.video_info['video'],
+                            tarefa.titulo,
+                            tarefa.descricao,
+                            tarefa.thumbnail_path,
+                            tarefa.agendar if tarefa.agendar != "imediato" else None,
+                            perfil=perfil,
+                            vaga=vaga,
+                            tarefa=tarefa
+                        )
+                        if not resultado.get('cota_esgotada'):
+                            break
                 
-                # Atualizar status
-                tarefa.status = "em_upload"
-                await atualizar_status_fila(tarefa)
-                await atualizar_fila_global()
+                if resultado['status'] == 'interrompido':
+                    # Desligamento: a tarefa vai para o checkpoint, sem histórico nem notificação
+                    tarefa.status = "interrompido"
+                    controle_uploads.interrompidas.append(tarefa)
+                    continue
                 
-                # Executar upload
-                try:
-                    resultado = await upload_youtube_real(
-                        tarefa.ctx,
-                        tarefa.mensagem_status,
-                        tarefa.video_info['video'],
-                        tarefa.titulo,
-                        tarefa.descricao,
-                        tarefa.thumbnail_path,
-                        tarefa.agendar if tarefa.agendar != "imediato" else None
-                    )
-                    
-                    # Notificar conclusão
-                    await notificar_conclusao_upload(tarefa, resultado)
-                    
-                    # OFERECER PRÓXIMO PASSO APÓS CONCLUSÃO
-                    if resultado['status'] == 'sucesso':
-                        await asyncio.sleep(2)  # Pequena pausa para melhor UX
-                        await oferecer_proximo_passo(tarefa.ctx, tarefa.titulo)
-                    
-                except Exception as e:
-                    print(f"Erro durante o upload: {e}")
-                    await tarefa.ctx.send(f"❌ Erro durante o upload: {str(e)}")
+                # Registrar impressão digital e histórico antes da limpeza apagar o arquivo
+                if resultado['status'] == 'sucesso':
+                    await registrar_impressao_upload(tarefa, resultado)
+                await registrar_historico_upload(tarefa, resultado, duracao_video, time.monotonic() - inicio, tentativas)
+                
+                if resultado['status'] == 'cancelado':
+                    tarefa.status = "cancelado"
+                    await atualizar_status_fila(tarefa)
+                    await tarefa.ctx.send(f"🛑 **Upload `#{tarefa.numero}` cancelado:** {tarefa.titulo}\n{resultado['mensagem']}")
+                    continue
+                
+                # Notificar conclusão
+                await notificar_conclusao_upload(tarefa, resultado)
                 
-                finally:
-                    # Limpar e processar próximo
-                    upload_em_andamento = False
-                    fila_uploads.task_done()
-                    
-                    # Remover da fila ativa
-                    if tarefa.id_tarefa in fila_ativa:
-                        del fila_ativa[tarefa.id_tarefa]
-                    
-                    # Atualizar fila global
-                    await atualizar_fila_global()
+                # OFERECER PRÓXIMO PASSO APÓS CONCLUSÃO
+                if resultado['status'] == 'sucesso':
+                    await asyncio.sleep(2)  # Pequena pausa para melhor UX
+                    await oferecer_proximo_passo(tarefa.ctx, tarefa.titulo)
+                
+            except Exception as e:
+                print(f"Erro durante o upload: {e}")
+                await tarefa.ctx.send(f"❌ Erro durante o upload: {str(e)}")
             
-            await asyncio.sleep(5)  # Verificar a cada 5 segundos
+            finally:
+                # Limpar e processar próximo
+                perfil.em_andamento -= 1
+                descartar_painel(tarefa.mensagem_status)
+                perfil.fila.concluir(tarefa)
+                controle_uploads.esquecer(tarefa)
+                
+                # Remover da fila ativa
+                if tarefa.id_tarefa in fila_ativa:
+                    del fila_ativa[tarefa.id_tarefa]
+                
+                # Atualizar fila global
+                await atualizar_fila_global()
             
         except Exception as e:
-            print(f"Erro no gerenciador de fila: {e}")
-            upload_em_andamento = False
+            print(f"Erro no trabalhador de uploads ({perfil.nome}/{vaga}): {e}")
             await asyncio.sleep(10)
 
-async def adicionar_na_fila(ctx, video_info, titulo, descricao, thumbnail_path=None, agendar=None):
-    """Adiciona um vídeo à fila de uploads"""
+async def adicionar_na_fila(ctx, video_info, titulo, descricao, thumbnail_path=None, agendar=None, retomada=None):
+    """Adiciona um vídeo à fila de uploads (devolve None se for recusado como duplicado)"""
     global ultima_mensagem_status
     
-    tarefa = TarefaUpload(ctx, video_info, titulo, descricao, thumbnail_path, agendar)
+    if controle_uploads.encerrando:
+        await ctx.send("🔌 **O bot está reiniciando.** Nenhum upload novo entra na fila agora; tente de novo em instantes.")
+        return None
+    
+    # Verificar duplicados antes de qualquer transferência
+    impressao = await verificar_duplicado(video_info)
+    duplicado = impressao['duplicado']
+    if duplicado:
+        if duplicado['origem'] == 'fila':
+            detalhe = f"já está na fila como **{duplicado['titulo']}**"
+        else:
+            detalhe = f"já foi enviado em {duplicado['data']} como **{duplicado['titulo']}**\n🔗 {duplicado['url']}"
+        
+        if MODO_DUPLICADOS == 'recusar':
+            await ctx.send(f"🚫 **Vídeo duplicado - não adicionado à fila.** Este arquivo {detalhe}")
+            return None
+        await ctx.send(f"⚠️ **Possível duplicado:** este arquivo {detalhe}\nAdicionando à fila mesmo assim.")
     
-    # Calcular posição na fila
-    posicao = fila_uploads.qsize() + 1
+    tarefa = TarefaUpload(ctx, video_info, titulo, descricao, thumbnail_path, agendar)
+    tarefa.impressao = impressao
+    if retomada:
+        # Mesmo id de antes: no modo broker, a tarefa volta a acompanhar o upload que o trabalhador seguiu enviando
+        tarefa.id_tarefa = retomada['id_tarefa']
+    # Tarefa do checkpoint: a sessão resumível só vale na conta que a abriu
+    perfil_anterior = obter_perfis().get(retomada.get('perfil')) if retomada else None
+    tarefa.perfil = perfil_anterior or rotear_perfil(video_info, ctx.channel.id)
+    if perfil_anterior:
+        tarefa.sessao_upload = retomada.get('sessao_upload')
+    
+    # Calcular posição na fila (episódios do mesmo jogo entram em ordem)
+    posicao = tarefa.perfil.fila.posicao_de_entrada(tarefa) + 1
     tarefa.posicao = posicao
     
     # Criar mensagem de status na fila
-    embed_fila = discord.Embed(
-        title="📋 Vídeo Adicionado à Fila de Upload",
-        color=0xffff00
-    )
-    embed_fila.add_field(name="🎬 Título", value=f"```{titulo[:100]}...```" if len(titulo) > 100 else f"```{titulo}```", inline=False)
-    embed_fila.add_field(name="📊 Status", value="⏳ **Na Fila** - Aguardando vez...", inline=False)
-    embed_fila.add_field(name="📊 Posição na Fila", value=f"`{posicao}`", inline=True)
-    
-    if agendar and agendar != "imediato":
-        embed_fila.add_field(name="⏰ Agendamento", value=f"`{agendar}`", inline=True)
-    
-    mensagem_fila = await ctx.send(embed=embed_fila)
+    painel = PainelEmbed()
+    painel.aplicar(MODELO_STATUS_FILA, **valores_status_fila(tarefa))
+    mensagem_fila = await painel.enviar(ctx)
     tarefa.mensagem_status = mensagem_fila
     
     # Atualizar última mensagem de status
     ultima_mensagem_status = mensagem_fila
     
     # Adicionar à fila e dicionário ativo
-    await fila_uploads.put(tarefa)
+    await tarefa.perfil.fila.put(tarefa)
     fila_ativa[tarefa.id_tarefa] = tarefa
     
     # Iniciar gerenciador se não estiver rodando
@@ -396,140 +1530,217 @@ async def adicionar_na_fila(ctx, video_info, titulo, descricao, thumbnail_path=N
         bot.gerenciador_fila_iniciado = True
         bot.loop.create_task(gerenciador_fila_uploads())
     
+    # Avisar quando a fila já não cabe na cota de hoje
+    previsao = previsao_cota(tarefa.perfil)
+    if not previsao['cabe_hoje']:
+        adiados = previsao['tarefas_pendentes'] - previsao['tarefas_que_cabem']
+        await ctx.send(
+            f"⛽ A cota restante hoje (`{previsao['restante']}` unidades) não cobre toda a fila "
+            f"(`{previsao['custo_fila']}` unidades). `{adiados}` vídeo(s) ficarão para depois do reset "
+            f"({datetime.fromisoformat(previsao['proximo_reset']):%d/%m às %H:%M})."
+        )
+    
     # ATUALIZAR FILA GLOBAL SEMPRE QUE ADICIONAR NOVO VÍDEO
     await atualizar_fila_global()
     
     return tarefa
 
 async def atualizar_status_fila(tarefa):
-    """Atualiza o status de um item na fila"""
+    """Atualiza o status de um item na fila (só edita a mensagem se algo mudou)"""
     global ultima_mensagem_status
     
     try:
-        # Verificar se a mensagem ainda existe e é acessível
-        try:
-            await tarefa.mensagem_status.channel.fetch_message(tarefa.mensagem_status.id)
-        except discord.NotFound:
-            print("Mensagem de status não encontrada, criando nova...")
-            # Recriar a mensagem de status
-            embed = discord.Embed(
-                title="📋 Status do Vídeo na Fila",
-                color=0xffff00
-            )
-            embed.add_field(name="🎬 Título", value=f"```{tarefa.titulo[:100]}...```" if len(tarefa.titulo) > 100 else f"```{tarefa.titulo}```", inline=False)
-            
-            if tarefa.status == "na_fila":
-                status_text = f"⏳ **Na Fila** - Posição: `{tarefa.posicao}`"
-            elif tarefa.status == "em_upload":
-                status_text = "📤 **Fazendo Upload** - Processando..."
-            elif tarefa.status == "concluido":
-                status_text = "✅ **Concluído**"
-            elif tarefa.status == "erro":
-                status_text = "❌ **Erro no Upload**"
-            
-            embed.add_field(name="📊 Status", value=status_text, inline=False)
-            embed.add_field(name="📊 Posição na Fila", value=f"`{tarefa.posicao}`", inline=True)
-            
-            if tarefa.agendar and tarefa.agendar != "imediato":
-                embed.add_field(name="⏰ Agendamento", value=f"`{tarefa.agendar}`", inline=True)
-            
-            nova_mensagem = await tarefa.ctx.send(embed=embed)
-            tarefa.mensagem_status = nova_mensagem
-            return
-
-        embed = tarefa.mensagem_status.embeds[0]
-        
-        # Atualizar campos
-        embed.clear_fields()
-        embed.add_field(name="🎬 Título", value=f"```{tarefa.titulo[:100]}...```" if len(tarefa.titulo) > 100 else f"```{tarefa.titulo}```", inline=False)
-        
-        if tarefa.status == "na_fila":
-            status_text = f"⏳ **Na Fila** - Posição: `{tarefa.posicao}`"
-        elif tarefa.status == "em_upload":
-            status_text = "📤 **Fazendo Upload** - Processando..."
-        elif tarefa.status == "concluido":
-            status_text = "✅ **Concluído**"
-        elif tarefa.status == "erro":
-            status_text = "❌ **Erro no Upload**"
-        
-        embed.add_field(name="📊 Status", value=status_text, inline=False)
-        embed.add_field(name="📊 Posição na Fila", value=f"`{tarefa.posicao}`", inline=True)
-        
-        if tarefa.agendar and tarefa.agendar != "imediato":
-            embed.add_field(name="⏰ Agendamento", value=f"`{tarefa.agendar}`", inline=True)
-        
-        await tarefa.mensagem_status.edit(embed=embed)
-        
-        # Atualizar última mensagem de status
-        ultima_mensagem_status = tarefa.mensagem_status
+        painel = obter_painel(tarefa.mensagem_status)
+        if await painel.atualizar(tarefa.ctx, MODELO_STATUS_FILA, **valores_status_fila(tarefa)):
+            # A mensagem pode ter sido recriada
+            tarefa.mensagem_status = painel.mensagem
+            ultima_mensagem_status = painel.mensagem
         
     except Exception as e:
         print(f"Erro ao atualizar status da fila: {e}")
 
-async def atualizar_fila_global():
-    """Atualiza a mensagem global da fila"""
-    global mensagem_fila_global
-    
-    try:
-        # Buscar todas as tarefas ativas
-        tarefas_ativas = list(fila_ativa.values())
-        tarefas_ativas.sort(key=lambda x: x.posicao)
-        
+INTERVALO_FILA_GLOBAL = 5  # Segundos mínimos entre duas edições da mensagem global da fila
+TAREFAS_POR_PAGINA_FILA = 20
+
+class FilaGlobalView(View):
+    """Botões de página da mensagem global da fila (sem tempo limite)"""
+    def __init__(self, quadro):
+        super().__init__(timeout=None)
+        self.quadro = quadro
+
+    @discord.ui.button(label="Anterior", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def pagina_anterior(self, interaction: discord.Interaction, button: Button):
+        self.quadro.pagina -= 1
+        await self.quadro.publicar(interaction)
+
+    @discord.ui.button(label="Próxima", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def proxima_pagina(self, interaction: discord.Interaction, button: Button):
+        self.quadro.pagina += 1
+        await self.quadro.publicar(interaction)
+
+def dividir_em_blocos(linhas, limite=1024):
+    """Junta as linhas em blocos de até `limite` caracteres (limite de valor de um campo de embed)"""
+    blocos = []
+    atual = []
+    tamanho = 0
+    for linha in linhas:
+        linha = truncar(linha, limite - 3)
+        if atual and tamanho + 1 + len(linha) > limite:
+            blocos.append("\n".join(atual))
+            atual = []
+            tamanho = 0
+        tamanho += len(linha) + (1 if atual else 0)
+        atual.append(linha)
+    if atual:
+        blocos.append("\n".join(atual))
+    return blocos
+
+class QuadroFilaGlobal:
+    """Mensagem global da fila: pedidos próximos viram uma edição só, e só se o conteúdo visível mudar"""
+    def __init__(self, intervalo=INTERVALO_FILA_GLOBAL):
+        self.intervalo = intervalo
+        self.mensagem = None
+        self.pagina = 0
+        self.view = None
+        self._estado_publicado = None
+        self._pendente = False
+        self._tarefa = None
+        self._ultima_publicacao = 0.0
+
+    def pedir_atualizacao(self):
+        """Marca o quadro como desatualizado; a publicação acontece no máximo uma vez por intervalo"""
+        self._pendente = True
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.get_running_loop().create_task(self._publicar_pendentes())
+
+    async def _publicar_pendentes(self):
+        while self._pendente:
+            espera = self._ultima_publicacao + self.intervalo - time.monotonic()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            # Pedidos que chegarem durante a publicação geram mais uma rodada
+            self._pendente = False
+            try:
+                await self.publicar()
+            except Exception as e:
+                print(f"Erro ao atualizar fila global: {e}")
+
+    async def descarregar(self):
+        """Publica na hora o que estiver pendente, sem esperar o intervalo (usado no desligamento)"""
+        if self._tarefa is not None and not self._tarefa.done():
+            self._tarefa.cancel()
+        self._pendente = False
+        await self.publicar()
+
+    def estado(self):
+        """O que o quadro mostra: linhas da página atual, totais e paginação"""
+        tarefas = sorted(fila_ativa.values(), key=lambda t: t.posicao)
+        total_paginas = max(1, -(-len(tarefas) // TAREFAS_POR_PAGINA_FILA))
+        self.pagina = max(0, min(self.pagina, total_paginas - 1))
+        inicio = self.pagina * TAREFAS_POR_PAGINA_FILA
+        varios_perfis = len(obter_perfis()) > 1
+        linhas = tuple(
+            f"`{t.posicao}.` `#{t.numero}` {truncar(t.titulo, 50)} - {t.status}" + (f" ({t.perfil.nome})" if varios_perfis and t.perfil else "")
+            for t in tarefas[inicio:inicio + TAREFAS_POR_PAGINA_FILA]
+        )
+        return (linhas, len(tarefas), uploads_em_andamento(), self.pagina, total_paginas,
+                controle_uploads.pausado, controle_uploads.encerrando)
+
+    def montar(self, estado):
+        linhas, total_tarefas, em_andamento, pagina, total_paginas, pausado, encerrando = estado
         embed = discord.Embed(
             title="🔄 Fila de Uploads - Visão Geral",
             color=0x0099ff,
             timestamp=datetime.now()
         )
         
-        if not tarefas_ativas and not upload_em_andamento:
-            embed.description = "📭 **Fila vazia** - Nenhum upload pendente"
+        if encerrando:
+            embed.description = "🔌 **Bot reiniciando** - a fila foi salva e continua quando ele voltar"
+        elif pausado:
+            embed.description = "⏸️ **Uploads pausados** - use `!retomar` para continuar"
+        
+        if not total_tarefas and not em_andamento:
+            embed.description = (embed.description + "\n" if embed.description else "") + "📭 **Fila vazia** - Nenhum upload pendente"
         else:
             # Upload atual
-            if upload_em_andamento:
+            if em_andamento:
                 embed.add_field(
                     name="🎬 Upload Atual", 
-                    value="📤 **Processando upload em andamento...**", 
+                    value=f"📤 **Processando {em_andamento} upload(s) em andamento...**", 
                     inline=False
                 )
             
-            # Itens na fila
-            if tarefas_ativas:
+            # Itens da página, em quantos campos forem necessários
+            for i, bloco in enumerate(dividir_em_blocos(linhas)):
                 embed.add_field(
-                    name=f"⏳ Uploads Pendentes ({len(tarefas_ativas)})", 
-                    value="\n".join([f"`{t.posicao}.` {t.titulo[:50]}... - {t.status}" for t in tarefas_ativas]),
+                    name=f"⏳ Uploads Pendentes ({total_tarefas})" if i == 0 else "⏳ Uploads Pendentes (cont.)",
+                    value=bloco,
                     inline=False
                 )
             
             embed.add_field(
                 name="📊 Estatísticas",
-                value=f"• Uploads na fila: `{len(tarefas_ativas)}`\n• Upload em andamento: `{'Sim' if upload_em_andamento else 'Não'}`\n• Próxima posição: `{len(tarefas_ativas) + 1}`",
+                value=f"• Uploads na fila: `{total_tarefas}`\n• Uploads em andamento: `{em_andamento}`\n• Próxima posição: `{total_tarefas + 1}`",
                 inline=False
             )
         
-        embed.set_footer(text="Fila atualizada automaticamente")
-        
-        # Atualizar ou criar mensagem global
-        if mensagem_fila_global:
-            try:
-                await mensagem_fila_global.edit(embed=embed)
-            except discord.NotFound:
-                # Se a mensagem foi deletada, criar nova
-                canal = bot.get_channel(CANAL_DISCORD_ID)
-                if canal:
-                    mensagem_fila_global = await canal.send(embed=embed)
-            except Exception as e:
-                print(f"Erro ao editar mensagem global da fila: {e}")
-        else:
-            canal = bot.get_channel(CANAL_DISCORD_ID)
-            if canal:
-                mensagem_fila_global = await canal.send(embed=embed)
-                
-    except Exception as e:
-        print(f"Erro ao atualizar fila global: {e}")
+        rodape = "Fila atualizada automaticamente"
+        if total_paginas > 1:
+            rodape = f"Página {pagina + 1}/{total_paginas} • {rodape}"
+        embed.set_footer(text=rodape)
+        return embed
 
-# ========== FUNÇÃO PARA EXCLUIR ARQUIVOS DO VÍDEO ==========
+    def _view_paginas(self, pagina, total_paginas):
+        if total_paginas <= 1:
+            return None
+        if self.view is None:
+            self.view = FilaGlobalView(self)
+        self.view.pagina_anterior.disabled = pagina == 0
+        self.view.proxima_pagina.disabled = pagina >= total_paginas - 1
+        return self.view
 
-async def excluir_arquivos_video(video_info, ctx):
+    async def publicar(self, interaction=None):
+        """Edita (ou cria) a mensagem se o estado visível mudou; com interaction, responde ao botão de página"""
+        estado = self.estado()
+        if interaction is None and self.mensagem is not None and estado == self._estado_publicado:
+            return False
+        
+        embed = self.montar(estado)
+        view = self._view_paginas(estado[3], estado[4])
+        if interaction is not None:
+            await interaction.response.edit_message(embed=embed, view=view)
+        else:
+            if self.mensagem is not None:
+                try:
+                    await self.mensagem.edit(embed=embed, view=view)
+                except discord.NotFound:
+                    # Se a mensagem foi deletada, criar nova
+                    self.mensagem = None
+            if self.mensagem is None:
+                canal = bot.get_channel(CANAL_DISCORD_ID)
+                if not canal:
+                    return False
+                self.mensagem = await canal.send(embed=embed, view=view)
+        
+        self._estado_publicado = estado
+        self._ultima_publicacao = time.monotonic()
+        return True
+
+quadro_fila_global = None
+
+def obter_quadro_fila_global():
+    global quadro_fila_global
+    if quadro_fila_global is None:
+        quadro_fila_global = QuadroFilaGlobal()
+    return quadro_fila_global
+
+async def atualizar_fila_global():
+    """Pede a atualização da mensagem global da fila (agrupada e ignorada se nada mudou)"""
+    obter_quadro_fila_global().pedir_atualizacao()
+
+# ========== FUNÇÃO PARA EXCLUIR ARQUIVOS DO VÍDEO ==========
+
+async def excluir_arquivos_video(video_info, ctx):
     """Exclui todos os arquivos relacionados ao vídeo após upload bem-sucedido"""
     try:
         arquivos_excluidos = []
@@ -544,6 +1755,8 @@ async def excluir_arquivos_video(video_info, ctx):
                 try:
                     if os.path.exists(caminho_arquivo):
                         os.remove(caminho_arquivo)
+                        obter_indice_videos().remover_arquivo(caminho_arquivo)
+                        controle_espaco.espaco_liberado()
                         arquivos_excluidos.append(f"`{os.path.basename(caminho_arquivo)}`")
                         print(f"✅ Arquivo excluído: {caminho_arquivo}")
                     else:
@@ -677,7 +1890,7 @@ async def oferecer_proximo_passo(ctx, ultimo_video_titulo=None):
     
     embed.add_field(
         name="📈 Estatísticas da Fila",
-        value=f"• Uploads na fila: `{fila_uploads.qsize()}`\n• Upload em andamento: `{'Sim' if upload_em_andamento else 'Não'}`",
+        value=f"• Uploads na fila: `{total_na_fila()}`\n• Uploads em andamento: `{uploads_em_andamento()}`",
         inline=False
     )
     
@@ -740,7 +1953,7 @@ async def mostrar_menu_principal(interaction=None, ctx=None, channel=None):
         name="🎯 Como Usar",
         value=(
             "1. **Listar Vídeos** - Ver vídeos disponíveis\n"
-            "2. **Selecionar por reação** - Escolher vídeos\n"
+            "2. **Selecionar no menu** - Escolher vídeos\n"
             "3. **Validar metadados** - Revisar título/descrição\n"
             "4. **Adicionar à fila** - Upload automático\n"
             "5. **Fluxo contínuo** - Sempre oferece próximo passo"
@@ -784,7 +1997,7 @@ async def mostrar_fila_detalhada(interaction=None, ctx=None):
     
     channel = interaction.channel if interaction else ctx.channel
     
-    if fila_uploads.empty() and not upload_em_andamento:
+    if not total_na_fila() and not uploads_em_andamento():
         embed = discord.Embed(
             title="📊 Fila de Uploads",
             description="📭 **Fila vazia** - Nenhum upload pendente",
@@ -804,18 +2017,18 @@ async def mostrar_fila_detalhada(interaction=None, ctx=None):
     )
     
     # Upload atual
-    if upload_em_andamento:
+    if uploads_em_andamento():
         embed.add_field(
             name="🎬 Upload Atual", 
-            value="📤 **Processando upload em andamento...**", 
+            value=f"📤 **Processando {uploads_em_andamento()} upload(s) em andamento...**", 
             inline=False
         )
     
     # Itens na fila
-    if fila_uploads.qsize() > 0:
+    if total_na_fila() > 0:
         embed.add_field(
             name=f"⏳ Uploads Pendentes", 
-            value=f"`{fila_uploads.qsize()}` vídeos na fila", 
+            value=f"`{total_na_fila()}` vídeos na fila", 
             inline=False
         )
     
@@ -889,10 +2102,19 @@ async def mostrar_comandos(interaction=None, ctx=None):
         value=(
             "`!comandos` - Mostra esta lista\n"
             "`!listar` - Lista vídeos disponíveis\n"
+            "`!enviar [url]` - Envia vídeo e arquivos (anexos ou URLs) para a pasta\n"
             "`!fila` - Mostra status da fila\n"
             "`!status` - Mostra status do sistema\n"
+            "`!metricas` - Mostra métricas internas (latência do loop, fila)\n"
+            "`!historico [jogo] [N]` - Últimos uploads e velocidade média da semana\n"
+            "`!lote [jogo]` - Gera de uma vez os metadados dos vídeos da pasta\n"
             "`!home` - Volta ao menu principal\n"
-            "`!auth_youtube` - Reautentica com YouTube (dono)\n"
+            "`!auth_youtube [perfil]` - Reautentica com YouTube (dono)\n"
+            "`!banda` - Mostra ou ajusta os limites de banda de upload (dono)\n"
+            "`!gerador` - Mostra ou troca o gerador de metadados por jogo (dono)\n"
+            "`!pausar` / `!retomar` - Pausa ou retoma os uploads no fim do chunk atual (dono)\n"
+            "`!cancelar <#N>` - Cancela uma tarefa da fila ou em envio (dono)\n"
+            "`!mover <#N> <posição>` - Muda a posição de uma tarefa na fila (dono)\n"
             "`!limpar_fila` - Limpa a fila (dono)"
         ),
         inline=False
@@ -913,16 +2135,231 @@ async def mostrar_comandos(interaction=None, ctx=None):
     
     ultima_mensagem_status = mensagem
 
-async def listar_videos_reacao(interaction=None, ctx=None):
-    """Lista vídeos por reação (para reação ou comando)"""
+# ========== SELETOR DE VÍDEOS PAGINADO ==========
+
+VIDEOS_POR_PAGINA = 25  # Máximo de opções de um Select do Discord
+
+class ContextoInteracao:
+    """Contexto mínimo (canal, autor e send) para seguir um fluxo iniciado por um componente"""
+    def __init__(self, channel, author):
+        self.channel = channel
+        self.author = author
+        self.send = channel.send
+
+def _chave_ordenacao_video(caminho_video):
+    """Ordena por jogo, episódio e parte, deixando os sem número no fim de cada jogo"""
+    jogo, episodio, parte = analisar_nome_arquivo(caminho_video)
+    return (jogo.casefold(), episodio is None, episodio or 0, parte or 0, os.path.basename(caminho_video).casefold())
+
+class SeletorVideoSelect(Select):
+    def __init__(self):
+        super().__init__(placeholder="🎬 Escolha o vídeo para processar...", min_values=1, max_values=1, row=0,
+                         options=[discord.SelectOption(label="-")])
+
+    async def callback(self, interaction: discord.Interaction):
+        await self.view.selecionar_video(interaction, int(self.values[0]))
+
+class FiltroJogoSelect(Select):
+    def __init__(self):
+        super().__init__(placeholder="🎮 Filtrar por jogo...", min_values=1, max_values=1, row=1,
+                         options=[discord.SelectOption(label="-")])
+
+    async def callback(self, interaction: discord.Interaction):
+        valor = self.values[0]
+        self.view.jogo = None if valor == "*" else self.view.jogos[int(valor)]
+        self.view.pagina = 0
+        await self.view.atualizar_mensagem(interaction)
+
+class BuscaVideosModal(discord.ui.Modal, title="🔍 Buscar Vídeos"):
+    termo = discord.ui.TextInput(label="Nome do jogo ou do arquivo", required=False, max_length=100,
+                                 placeholder="Ex.: Hollow Knight")
+
+    def __init__(self, seletor):
+        super().__init__(timeout=TIMEOUT_INTERACOES)
+        self.seletor = seletor
+        self.termo.default = seletor.busca or None
+
+    async def on_submit(self, interaction: discord.Interaction):
+        self.seletor.busca = self.termo.value.strip()
+        self.seletor.pagina = 0
+        await self.seletor.atualizar_mensagem(interaction)
+
+class SeletorVideosView(ViewComHome):
+    """Lista paginada dos vídeos da pasta: só a página atual é montada e enviada"""
+    def __init__(self, autor, timeout=TIMEOUT_INTERACOES):
+        super().__init__(timeout=timeout)
+        self.autor = autor
+        self.pagina = 0
+        self.jogo = None
+        self.busca = ""
+        self.jogos = []
+        self.itens_pagina = []
+        self._chave_nomes = None
+        self._nomes = []
+        self._versao_jogos = None
+        self._contagem_jogos = {}
+        self.seletor = SeletorVideoSelect()
+        self.filtro = FiltroJogoSelect()
+        self.add_item(self.seletor)
+        self.add_item(self.filtro)
+
+    def nomes_filtrados(self):
+        """Nomes dos pacotes com vídeo que passam nos filtros, ordenados (recalculados só se algo mudar)"""
+        indice = obter_indice_videos()
+        indice.atualizar()
+        pacotes = indice.pacotes()
+        chave = (indice.versao, self.jogo, self.busca.casefold())
+        if chave != self._chave_nomes:
+            videos = {nome: pacote['video'] for nome, pacote in pacotes.items() if pacote.get('video')}
+            analises = analisar_nomes_arquivos(videos.values())
+            termo = chave[2]
+            nomes = [
+                nome for nome, video in videos.items()
+                if (self.jogo is None or analises[video][0] == self.jogo)
+                and (not termo or termo in nome.casefold() or termo in analises[video][0].casefold())
+            ]
+            nomes.sort(key=lambda nome: _chave_ordenacao_video(videos[nome]))
+            self._chave_nomes = chave
+            self._nomes = nomes
+
+            if indice.versao != self._versao_jogos:
+                contagem = {}
+                for video in videos.values():
+                    contagem[analises[video][0]] = contagem.get(analises[video][0], 0) + 1
+                # Os 24 jogos com mais vídeos (a 25ª opção é "Todos os jogos")
+                self.jogos = sorted(sorted(contagem, key=str.casefold), key=lambda j: -contagem[j])[:24]
+                self._contagem_jogos = contagem
+                self._versao_jogos = indice.versao
+        return self._nomes, pacotes
+
+    def montar_pagina(self):
+        """Monta o embed e os componentes da página atual"""
+        nomes, pacotes = self.nomes_filtrados()
+        total_paginas = max(1, -(-len(nomes) // VIDEOS_POR_PAGINA))
+        self.pagina = max(0, min(self.pagina, total_paginas - 1))
+        inicio = self.pagina * VIDEOS_POR_PAGINA
+        self.itens_pagina = [(nome, pacotes[nome]) for nome in nomes[inicio:inicio + VIDEOS_POR_PAGINA]]
+
+        filtros = []
+        if self.jogo:
+            filtros.append(f"jogo **{self.jogo}**")
+        if self.busca:
+            filtros.append(f"busca **{self.busca}**")
+        descricao = f"Encontrados {len(nomes)} vídeos"
+        descricao += f" ({', '.join(filtros)})" if filtros else ""
+        descricao += ". Escolha um no menu abaixo:\n\n"
+
+        linhas = []
+        opcoes = []
+        catalogo = obter_catalogo_episodios()
+        for i, (nome, info) in enumerate(self.itens_pagina):
+            nome_jogo, numero_episodio, numero_parte = analisar_nome_arquivo(info['video'])
+            detalhes = [nome_jogo]
+            if numero_episodio:
+                detalhes.append(f"Ep. {numero_episodio}")
+            elif numero_parte is None:
+                detalhes.append(f"Ep. {catalogo.proximo_episodio(nome_jogo)}?")
+            if numero_parte:
+                detalhes.append(f"Parte {numero_parte}")
+            # DESTACAR SE FALTAM ARQUIVOS OBRIGATÓRIOS
+            faltando = [rotulo for chave, rotulo in (('contexto', "contexto"), ('thumb', "thumbnail")) if not info.get(chave)]
+            marcadores = ["🎯"] if info.get('legendas') else []
+            if faltando:
+                marcadores.append(f"⚠️ falta {' e '.join(faltando)}")
+            if numero_episodio:
+                lacunas = catalogo.lacunas(nome_jogo, ate=numero_episodio)
+                if lacunas:
+                    marcadores.append(f"⏭️ pula Ep. {formatar_lacunas(lacunas, 3)}")
+                elif catalogo.ja_publicado(nome_jogo, numero_episodio):
+                    marcadores.append("♻️ já publicado")
+            linhas.append(" ".join([f"`{inicio + i + 1}.` **{nome[:80]}** - {' • '.join(detalhes)}"] + marcadores))
+            opcoes.append(discord.SelectOption(
+                label=f"{inicio + i + 1}. {nome}"[:100],
+                value=str(i),
+                description=(f"⚠️ Falta {' e '.join(faltando)}" if faltando else ' • '.join(detalhes))[:100],
+            ))
+
+        corpo = "\n".join(linhas) if linhas else "📭 Nenhum vídeo corresponde ao filtro."
+        embed = discord.Embed(
+            title="📹 Selecione um Vídeo para Processar",
+            description=(descricao + corpo)[:4096],
+            color=0x00ff00
+        )
+        embed.add_field(
+            name="🗑️ Aviso Importante",
+            value="⚠️ **Após o upload bem-sucedido, todos os arquivos deste vídeo serão EXCLUÍDOS automaticamente!**",
+            inline=False
+        )
+        embed.set_footer(text=f"Página {self.pagina + 1}/{total_paginas} • 🎯 com legendas • tempo limite: {TIMEOUT_INTERACOES//60} minutos")
+
+        self.seletor.options = opcoes or [discord.SelectOption(label="Nenhum vídeo nesta página", value="-1")]
+        self.seletor.disabled = not opcoes
+        self.filtro.options = [discord.SelectOption(label="Todos os jogos", value="*", emoji="📂", default=self.jogo is None)] + [
+            discord.SelectOption(label=jogo[:100], value=str(i), description=f"{self._contagem_jogos[jogo]} vídeo(s)",
+                                 default=jogo == self.jogo)
+            for i, jogo in enumerate(self.jogos)
+        ]
+        self.pagina_anterior.disabled = self.pagina == 0
+        self.proxima_pagina.disabled = self.pagina >= total_paginas - 1
+        self.limpar_filtros.disabled = not filtros
+        return embed
+
+    async def atualizar_mensagem(self, interaction: discord.Interaction):
+        await interaction.response.edit_message(embed=self.montar_pagina(), view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.id != self.autor.id:
+            await interaction.response.send_message("❌ Esta lista é de outra pessoa. Use `!listar` para abrir a sua.", ephemeral=True)
+            return False
+        return True
+
+    async def selecionar_video(self, interaction: discord.Interaction, posicao):
+        if not 0 <= posicao < len(self.itens_pagina):
+            await self.atualizar_mensagem(interaction)
+            return
+        nome_selecionado = self.itens_pagina[posicao][0]
+
+        # O vídeo pode ter sido enviado ou removido desde que a página foi montada
+        video_info = listar_arquivos_vinculados().get(nome_selecionado)
+        if not video_info or not video_info.get('video'):
+            await interaction.response.send_message(f"❌ **{nome_selecionado}** não está mais na pasta.", ephemeral=True)
+            return
+
+        # Desativar a lista para que o mesmo vídeo não seja processado duas vezes
+        for item in self.children:
+            item.disabled = True
+        self.stop()
+        await interaction.response.edit_message(view=self)
+        await processar_video_selecionado(ContextoInteracao(interaction.channel, interaction.user), nome_selecionado, video_info)
+
+    @discord.ui.button(label="Anterior", style=discord.ButtonStyle.secondary, emoji="◀️", row=2)
+    async def pagina_anterior(self, interaction: discord.Interaction, button: Button):
+        self.pagina -= 1
+        await self.atualizar_mensagem(interaction)
+
+    @discord.ui.button(label="Próxima", style=discord.ButtonStyle.secondary, emoji="▶️", row=2)
+    async def proxima_pagina(self, interaction: discord.Interaction, button: Button):
+        self.pagina += 1
+        await self.atualizar_mensagem(interaction)
+
+    @discord.ui.button(label="Buscar", style=discord.ButtonStyle.primary, emoji="🔍", row=2)
+    async def buscar(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(BuscaVideosModal(self))
+
+    @discord.ui.button(label="Limpar Filtros", style=discord.ButtonStyle.secondary, emoji="✖️", row=2)
+    async def limpar_filtros(self, interaction: discord.Interaction, button: Button):
+        self.jogo = None
+        self.busca = ""
+        self.pagina = 0
+        await self.atualizar_mensagem(interaction)
+
+async def listar_videos_seletor(interaction=None, ctx=None):
+    """Lista os vídeos da pasta num seletor paginado (para botão ou comando)"""
     global ultima_mensagem_status
     
-    channel = interaction.channel if interaction else ctx.channel
     author = interaction.user if interaction else ctx.author
     
-    arquivos = listar_arquivos_vinculados()
-    
-    if not arquivos:
+    if not listar_arquivos_vinculados():
         view = ViewComHome(timeout=TIMEOUT_INTERACOES)
         if interaction:
             mensagem = await interaction.followup.send("📭 Nenhum vídeo encontrado na pasta.", view=view, ephemeral=False)
@@ -931,75 +2368,15 @@ async def listar_videos_reacao(interaction=None, ctx=None):
         ultima_mensagem_status = mensagem
         return
     
-    # Converter para lista para facilitar a indexação
-    lista_arquivos = list(arquivos.items())
-    
-    embed = discord.Embed(
-        title="📹 Selecione um Vídeo para Processar",
-        description=f"Encontrados {len(arquivos)} vídeos. Reaja com o número correspondente:",
-        color=0x00ff00
-    )
-    
-    # Emojis numéricos
-    emojis_numeros = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']
-    
-    for i, (nome, info) in enumerate(lista_arquivos[:10]):  # Limitar a 10 vídeos
-        # Extrair informações do arquivo para mostrar no preview
-        nome_jogo, numero_episodio = extrair_info_arquivo(info.get('video', ''))
-        
-        valor = f"**Vídeo:** `{os.path.basename(info.get('video'))}`\n"
-        valor += f"**Jogo Detectado:** {nome_jogo}\n"
-        if numero_episodio:
-            valor += f"**Episódio:** {numero_episodio}\n"
-        
-        # DESTACAR SE FALTAM ARQUIVOS OBRIGATÓRIOS
-        if not info.get('contexto'):
-            valor += "⚠️ **CONTEXTO: ❌ FALTANDO**\n"
-        else:
-            valor += "📄 Contexto: ✅\n"
-            
-        if not info.get('thumb'):
-            valor += "⚠️ **THUMBNAIL: ❌ FALTANDO**\n"
-        else:
-            valor += "🖼️ Thumbnail: ✅\n"
-            
-        if info.get('legendas'):
-            valor += "🎯 Legendas: ✅\n"
-        
-        embed.add_field(name=f"{emojis_numeros[i]} {nome}", value=valor, inline=False)
-    
-    if len(lista_arquivos) > 10:
-        embed.add_field(
-            name="⚠️ Limite Atingido", 
-            value=f"Mostrando apenas os primeiros 10 de {len(lista_arquivos)} vídeos.", 
-            inline=False
-        )
-    
-    embed.add_field(
-        name="🗑️ Aviso Importante",
-        value="⚠️ **Após o upload bem-sucedido, todos os arquivos deste vídeo serão EXCLUÍDOS automaticamente!**",
-        inline=False
-    )
-    
-    embed.set_footer(text=f"Reaja com o número correspondente ao vídeo (tempo limite: {TIMEOUT_INTERACOES//60} minutos)")
+    view = SeletorVideosView(author)
+    embed = view.montar_pagina()
     
     if interaction:
-        mensagem = await interaction.followup.send(embed=embed, wait=True)
+        mensagem = await interaction.followup.send(embed=embed, view=view, wait=True)
     else:
-        mensagem = await ctx.send(embed=embed)
+        mensagem = await ctx.send(embed=embed, view=view)
     
     ultima_mensagem_status = mensagem
-    
-    # Adicionar reações
-    for i in range(min(len(lista_arquivos), 10)):
-        await mensagem.add_reaction(emojis_numeros[i])
-    
-    # Armazenar seleção ativa
-    selecoes_ativas[mensagem.id] = {
-        'arquivos': lista_arquivos,
-        'autor': author.id,
-        'interaction': interaction
-    }
 
 async def mostrar_status_sistema(interaction=None, ctx=None):
     """Mostra status do sistema (para reação ou comando)"""
@@ -1012,8 +2389,9 @@ async def mostrar_status_sistema(interaction=None, ctx=None):
     # Verificar configurações
     tem_discord_token = bool(DISCORD_BOT_TOKEN)
     tem_deepseek_key = bool(DEEPSEEK_API_KEY)
-    tem_credentials = os.path.exists('credentials.json')
-    tem_token = os.path.exists('token.json')
+    perfis = obter_perfis()
+    tem_credentials = all(os.path.exists(perfil.credenciais) for perfil in perfis.values())
+    tem_token = all(os.path.exists(perfil.token) for perfil in perfis.values())
     
     embed = discord.Embed(
         title="📊 Status do Sistema",
@@ -1025,12 +2403,31 @@ async def mostrar_status_sistema(interaction=None, ctx=None):
     embed.add_field(name="🤖 Bot Online", value="✅" if bot.is_ready() else "❌", inline=True)
     
     # Status da fila
-    status_fila = f"Upload em andamento: {'✅' if upload_em_andamento else '❌'}\n"
-    status_fila += f"Vídeos na fila: `{fila_uploads.qsize()}`\n"
+    status_fila = f"Uploads em andamento: `{uploads_em_andamento()}/{sum(p.vagas for p in perfis.values())}`\n"
+    status_fila += f"Vídeos na fila: `{total_na_fila()}`\n"
     status_fila += f"Fila ativa: {'✅' if hasattr(bot, 'gerenciador_fila_iniciado') else '❌'}"
     
     embed.add_field(name="🔄 Status da Fila", value=status_fila, inline=False)
     
+    # Espaço em disco: pasta, livre agora e projeção depois que a fila apagar os arquivos enviados
+    disco = controle_espaco.resumo()
+    icone_disco = "🟢"
+    if disco['livre'] - disco['reservado'] < ESPACO_LIVRE_MINIMO_GB * GB:
+        icone_disco = "🔴"
+    elif disco['livre'] - disco['reservado'] < ESPACO_LIVRE_ALERTA_GB * GB:
+        icone_disco = "🟡"
+    status_disco = f"{icone_disco} Livre: `{disco['livre'] / GB:.1f}/{disco['total'] / GB:.1f} GB` | pasta: `{disco['pasta'] / GB:.1f} GB`"
+    if LIMITE_PASTA_VIDEOS_GB:
+        status_disco += f" (limite `{LIMITE_PASTA_VIDEOS_GB:g} GB`)"
+    status_disco += f"\nA fila vai liberar: `{disco['liberar'] / GB:.1f} GB` → livre projetado: `{disco['livre_projetado'] / GB:.1f} GB`"
+    if disco['reservado']:
+        status_disco += f"\nReservado por ingestões em andamento (ainda a gravar): `{disco['reservado'] / GB:.1f} GB`"
+    status_disco += f"\nMínimo `{ESPACO_LIVRE_MINIMO_GB:g} GB` | alerta `{ESPACO_LIVRE_ALERTA_GB:g} GB` | esperas `{disco['esperas']}` | recusadas `{disco['recusadas']}`"
+    if disco['aguardando']:
+        status_disco += f"\n💽 `{disco['aguardando']}` ingestão(ões) aguardando espaço"
+    
+    embed.add_field(name="💽 Espaço em Disco", value=status_disco, inline=False)
+    
     # Status das configurações
     config_status = f"Discord Token: {'✅' if tem_discord_token else '❌'}\n"
     config_status += f"DeepSeek API: {'✅' if tem_deepseek_key else '❌'}\n"
@@ -1046,6 +2443,64 @@ async def mostrar_status_sistema(interaction=None, ctx=None):
         inline=False
     )
     
+    # Latência do event loop
+    loop_info = monitor_loop.resumo()
+    status_loop = f"Atraso máximo: `{loop_info['atraso_max_ms']} ms` | p99: `{loop_info['atraso_p99_ms']} ms`\n"
+    status_loop += f"Bloqueios acima de {LIMITE_BLOQUEIO_LOOP}s: `{loop_info['bloqueios']}`"
+    if loop_info['ultimo_bloqueio']:
+        ultimo = loop_info['ultimo_bloqueio']
+        status_loop += f"\nÚltimo: `{ultimo['local']}` ({ultimo['duracao']:.2f}s às {ultimo['quando']})"
+    
+    embed.add_field(name="🩺 Event Loop", value=status_loop, inline=False)
+    
+    if MODO_FILA == 'broker':
+        info_broker = await executar_em_thread(obter_broker().resumo)
+        embed.add_field(
+            name="🏭 Broker de Uploads",
+            value=f"Aguardando trabalhador: `{info_broker['pendentes']}` | enviando: `{info_broker['enviando']}`\n"
+                  f"Trabalhadores ativos: `{info_broker['trabalhadores']}` | arquivo: `{ARQUIVO_BROKER}`",
+            inline=False
+        )
+    
+    # Geradores de metadados: disjuntor e latências
+    linhas_geradores = []
+    for gerador_metadados in GERADORES_METADADOS.values():
+        if gerador_metadados.nome not in disjuntores_geradores:
+            continue
+        disjuntor = disjuntores_geradores[gerador_metadados.nome]
+        info = disjuntor.resumo()
+        icone = {DisjuntorGerador.FECHADO: "🟢", DisjuntorGerador.MEIO_ABERTO: "🟡"}.get(info['estado'], "🔴")
+        linha = f"{icone} **{gerador_metadados.nome}** - disjuntor {info['estado']}"
+        if info['estado'] == DisjuntorGerador.ABERTO:
+            linha += f" (testa de novo em `{info['testa_em_s']:.0f}s`)"
+        linha += f" | falhas seguidas `{info['falhas_seguidas']}` | aberturas `{info['aberturas']}` | servidos pelo local `{info['recusadas']}`\n"
+        linha += f"⏱️ p50 `{info['p50_s']}s` | p95 `{info['p95_s']}s` (SLO `{SLO_GERADOR_METADADOS:g}s`)"
+        if HEDGE_GERADOR_METADADOS:
+            linha += f" | 2ª tentativa `{info['segundas_tentativas']}` (venceu `{info['vitorias_segunda']}`)"
+        histograma = disjuntor.histograma.formatar()
+        if histograma:
+            linha += f"\n📊 `{histograma}`"
+        linhas_geradores.append(linha)
+    if linhas_geradores:
+        embed.add_field(name="🧠 Geradores de Metadados", value="\n".join(linhas_geradores)[:1024], inline=False)
+    
+    # Perfis do YouTube: fila, vagas e cota de cada conta
+    linhas_perfis = []
+    for perfil in perfis.values():
+        previsao = previsao_cota(perfil)
+        if previsao['cabe_hoje']:
+            cabe_texto = "✅ cabe hoje"
+        else:
+            cabe_texto = f"⚠️ só `{previsao['tarefas_que_cabem']}` de `{previsao['tarefas_pendentes']}` vídeo(s) cabem hoje"
+        linha = f"**{perfil.nome}** - token {'✅' if os.path.exists(perfil.token) else '❌'} | envios `{perfil.em_andamento}/{perfil.vagas}` | fila `{perfil.fila.qsize()}`\n"
+        linha += f"⛽ `{previsao['usado']}/{previsao['limite']}` unidades (projeto `{previsao['projeto']}`) | fila pendente `{previsao['custo_fila']}` - {cabe_texto}"
+        if perfil.aguardando_cota_ate:
+            linha += "\n⛽ **Fila pausada aguardando o reset**"
+        linhas_perfis.append(linha)
+    linhas_perfis.append(f"Reset da cota: `{obter_registro_cota().proximo_reset():%d/%m %H:%M}`")
+    
+    embed.add_field(name="📺 Perfis do YouTube", value="\n".join(linhas_perfis)[:1024], inline=False)
+    
     # Informações de arquivos obrigatórios
     videos_sem_contexto = sum(1 for info in arquivos.values() if not info.get('contexto'))
     videos_sem_thumb = sum(1 for info in arquivos.values() if not info.get('thumb'))
@@ -1075,357 +2530,2024 @@ async def mostrar_status_sistema(interaction=None, ctx=None):
     
     ultima_mensagem_status = mensagem
 
-# ========== FUNÇÕES EXISTENTES (mantidas) ==========
+# ========== ANÁLISE DE NOMES DE ARQUIVO ==========
+
+# Uma única passada encontra todos os marcadores do nome; a ordem das alternativas define a precedência
+PADRAO_MARCADORES_NOME = re.compile(r"""
+    (?=[\d\#secpSECP])                                               # descarta rápido posições que não iniciam marcador
+    (?<![^\W\d_])                                                   # não grudado numa letra (o "ep" de "Sleep")
+    (?:
+        (?P<data>\d{4}[-_.]\d{2}[-_.]\d{2})                         # 2024-05-01 (ignorada)
+      | s(?P<temporada>\d{1,2})\s*e(?P<ep_temporada>\d{1,4})        # S01E05
+      | (?:ep(?:is[oó]dio|isode)?|cap(?:[ií]tulo)?|e)\s*[._#-]?\s*(?P<ep>\d{1,4})  # Ep 3, Episódio 3, Cap 2, E05
+      | (?:parte|part|pt)\s*[._#-]?\s*(?P<parte>\d{1,3})            # Parte 2, Pt.2
+      | \#\s*(?P<ep_cerquilha>\d{1,4})                              # #5
+      | (?<![\d.,])(?P<numero>\d{1,4})(?![.,]?\d)                   # número solto (1.20 e 1080p não contam)
+    )
+    (?![^\W_])                                                      # nem seguido de letra ou dígito
+""", re.IGNORECASE | re.VERBOSE)
+PADRAO_ETIQUETAS_NOME = re.compile(r'\[[^\]]*\]')  # [PT-BR], [1080p]...
+PADRAO_ESPACOS_NOME = re.compile(r'\s+')
+SEPARADORES_NOME = " ._-–—:|#(["
+
+def _limpar_nome_jogo(texto):
+    # Cada etapa só roda quando o texto precisa dela; a maioria dos nomes passa direto
+    if '[' in texto:
+        texto = PADRAO_ETIQUETAS_NOME.sub(' ', texto)
+    texto = texto.strip(SEPARADORES_NOME + ")]")
+    # Nomes sem espaço usam ponto ou sublinhado como separador (Hollow.Knight.Ep.3)
+    if ' ' not in texto and '.' in texto:
+        texto = texto.replace('.', ' ')
+    if '_' in texto:
+        texto = texto.replace('_', ' ')
+    if '  ' in texto:
+        texto = PADRAO_ESPACOS_NOME.sub(' ', texto)
+    return texto.strip(SEPARADORES_NOME + ")]")
+
+GRUPOS_EPISODIO_NOME = ('ep', 'ep_temporada', 'ep_cerquilha')
+
+def _analisar_nome_base(nome_base):
+    episodio = parte = None
+    marcadores = []  # (início, fim) dos marcadores usados
+    ultimo_numero = None
+    
+    for achado in PADRAO_MARCADORES_NOME.finditer(nome_base):
+        # O último grupo fechado diz qual alternativa casou
+        grupo = achado.lastgroup
+        if grupo in GRUPOS_EPISODIO_NOME:
+            if episodio is None:
+                episodio = int(achado.group(grupo))
+                marcadores.append(achado.span())
+        elif grupo == 'parte':
+            if parte is None:
+                parte = int(achado.group(grupo))
+                marcadores.append(achado.span())
+        elif grupo == 'numero':
+            numero = achado.group(grupo)
+            if not (len(numero) == 4 and 1900 <= int(numero) <= 2099):  # Anos não são episódios
+                ultimo_numero = achado
+        else:
+            # Datas não dizem nada do episódio e também não fazem parte do nome do jogo
+            inicio, fim = achado.span()
+            nome_base = nome_base[:inicio] + ' ' * (fim - inicio) + nome_base[fim:]
+    
+    # Sem marcador explícito, o último número solto é o episódio ("Hades 2 03" -> jogo "Hades 2")
+    if episodio is None and parte is None and ultimo_numero is not None:
+        episodio = int(ultimo_numero.group('numero'))
+        marcadores.append(ultimo_numero.span())
+    
+    if not marcadores:
+        return _limpar_nome_jogo(nome_base) or nome_base, None, None
+    
+    # O jogo é o que vem antes do primeiro marcador; se o nome começa pelo marcador, o que sobra dele
+    inicio = min(i for i, _ in marcadores)
+    nome_jogo = _limpar_nome_jogo(nome_base[:inicio])
+    if not nome_jogo:
+        restante = nome_base
+        for i, f in sorted(marcadores, reverse=True):
+            restante = restante[:i] + ' ' + restante[f:]
+        nome_jogo = _limpar_nome_jogo(restante) or nome_base
+    return nome_jogo, episodio, parte
+
+@lru_cache(maxsize=4096)
+def analisar_nome_arquivo(nome_arquivo):
+    """Extrai (jogo, episódio, parte) do nome do arquivo; aceita nome ou caminho completo"""
+    nome = os.path.basename(nome_arquivo)
+    # rpartition em vez de splitext: só a extensão final interessa e é bem mais barato
+    nome_base, ponto, _ = nome.rpartition('.')
+    return _analisar_nome_base(nome_base if ponto and nome_base else nome)
+
+def analisar_nomes_arquivos(nomes_arquivos):
+    """Analisa vários nomes de uma vez; devolve {nome: (jogo, episódio, parte)}"""
+    return {nome: analisar_nome_arquivo(nome) for nome in nomes_arquivos}
 
 def extrair_info_arquivo(nome_arquivo):
     """Extrai nome do jogo e número do episódio do nome do arquivo"""
-    # Remover extensão do arquivo
-    nome_base = os.path.splitext(nome_arquivo)[0]
-    
-    # Padrões comuns para detectar episódios
-    padroes_episodio = [
-        r'[Ee]p[._\s]*(\d+)',  # Ep 1, Ep.1, Ep_1
-        r'[Ee]pisodio[._\s]*(\d+)',  # Episodio 1
-        r'[Pp]arte[._\s]*(\d+)',  # Parte 1
-        r'[\._\-](\d+)[\._\-]',  # -01-, _01_
-        r'\s(\d+)\s',  # espaço 1 espaço
-    ]
-    
-    numero_episodio = None
-    nome_jogo = nome_base
-    
-    # Tentar encontrar número do episódio
-    for padrao in padroes_episodio:
-        match = re.search(padrao, nome_base)
-        if match:
-            numero_episodio = int(match.group(1))
-            # Remover a parte do episódio do nome do jogo
-            nome_jogo = re.sub(padrao, '', nome_base).strip()
-            # Limpar caracteres especiais no final
-            nome_jogo = re.sub(r'[\._\-]\s*$', '', nome_jogo).strip()
-            break
-    
-    # Se não encontrou padrão específico, tentar encontrar números no final
-    if numero_episodio is None:
-        match = re.search(r'(\d+)$', nome_base)
-        if match:
-            numero_episodio = int(match.group(1))
-            nome_jogo = nome_base[:-len(match.group(1))].strip()
-            nome_jogo = re.sub(r'[\._\-]\s*$', '', nome_jogo).strip()
-    
-    return nome_jogo, numero_episodio
+    nome_jogo, episodio, parte = analisar_nome_arquivo(nome_arquivo)
+    # Sem episódio explícito, a parte faz as vezes de episódio (como "Parte 1" sempre funcionou)
+    return nome_jogo, episodio if episodio is not None else parte
 
-def autenticar_youtube():
-    """Autentica com a API do YouTube usando credentials.json"""
+# ========== FUNÇÕES EXISTENTES (mantidas) ==========
+
+def autenticar_youtube(perfil=None):
+    """Autentica com a API do YouTube usando as credenciais do perfil (credentials.json por padrão)"""
+    arquivo_credenciais = perfil.credenciais if perfil else 'credentials.json'
+    arquivo_token = perfil.token if perfil else 'token.json'
     creds = None
     
     # token.json armazena os tokens de acesso/refresh
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
+    if os.path.exists(arquivo_token):
+        creds = Credentials.from_authorized_user_file(arquivo_token, SCOPES)
     
     # Se não há credenciais válidas, faz o fluxo OAuth
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
         else:
-            if not os.path.exists('credentials.json'):
-                print("❌ credentials.json não encontrado")
+            if not os.path.exists(arquivo_credenciais):
+                print(f"❌ {arquivo_credenciais} não encontrado")
                 return None
             flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
+                arquivo_credenciais, SCOPES)
             creds = flow.run_local_server(port=0)
         
         # Salva as credenciais para a próxima execução
-        with open('token.json', 'w') as token:
+        with open(arquivo_token, 'w') as token:
             token.write(creds.to_json())
     
     return build('youtube', 'v3', credentials=creds)
 
-def listar_arquivos_vinculados():
-    """Lista vídeos e arquivos relacionados com o mesmo nome base"""
-    arquivos = {}
-    padroes = ["*.mp4", "*.avi", "*.mkv", "*.mov", "*.srt", "*.jpg", "*.jpeg", "*.png", "*.txt", "*.json"]
-    
-    for padrao in padroes:
-        for caminho in glob.glob(os.path.join(PASTA_VIDEOS, "**", padrao), recursive=True):
-            nome_base = os.path.splitext(os.path.basename(caminho))[0]
-            extensao = os.path.splitext(caminho)[1].lower()
-            
-            if nome_base not in arquivos:
-                arquivos[nome_base] = {"nome_base": nome_base}
-            
-            if extensao in ['.mp4', '.avi', '.mkv', '.mov']:
-                arquivos[nome_base]['video'] = caminho
-            elif extensao == '.srt':
-                arquivos[nome_base]['legendas'] = caminho
-            elif extensao in ['.jpg', '.jpeg', '.png']:
-                arquivos[nome_base]['thumb'] = caminho
-            elif extensao in ['.txt', '.json']:
-                arquivos[nome_base]['contexto'] = caminho
-                
-    # Retorna apenas os que têm vídeo
-    return {k: v for k, v in arquivos.items() if 'video' in v}
+# ========== COTA DA API DO YOUTUBE ==========
 
-async def gerar_metadados_deepseek(contexto, nome_jogo, numero_episodio):
-    """Gera título e descrição otimizados para gameplay usando a API do DeepSeek"""
-    if not DEEPSEEK_API_KEY:
-        titulo_fallback = f"🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial"
-        return titulo_fallback, f"""🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial
+# A cota do YouTube Data API é contada por projeto do Google Cloud e zera à meia-noite do Pacífico
+try:
+    from zoneinfo import ZoneInfo
+    FUSO_COTA = ZoneInfo('America/Los_Angeles')
+except Exception:
+    FUSO_COTA = timezone(timedelta(hours=-8))  # Sem base de fusos: aproxima pelo horário padrão
 
-📖 Sinopse
-Embarque nesta jornada emocionante cheia de desafios e descobertas. A cada episódio, novas aventuras aguardam!
+MOTIVOS_COTA_ESGOTADA = ('quotaExceeded', 'dailyLimitExceeded')
+MOTIVOS_LIMITE_TAXA = ('rateLimitExceeded', 'userRateLimitExceeded')  # Rajada de chamadas: passa em segundos
+TENTATIVAS_LIMITE_TAXA = 5  # Novas tentativas de uma chamada recusada por limite de taxa
+RECUO_LIMITE_TAXA = 2  # Segundos da primeira espera (dobra a cada tentativa)
 
-🎯 Neste Episódio:
-• 🎮 Gameplay intenso e envolvente
-• 🗺️ Exploração de novos territórios
-• ⚔️ Desafios estratégicos e emocionantes
-• 🎯 Objetivos e missões desafiadoras
-• 💡 Momentos épicos e inesquecíveis
+def _motivo_http(erro, motivos):
+    if not isinstance(erro, HttpError):
+        return False
+    conteudo = erro.content.decode('utf-8', 'replace') if isinstance(erro.content, bytes) else str(erro.content)
+    return any(motivo in conteudo for motivo in motivos)
 
-💡 Uma aventura que vai te prender do início ao fim!
+def erro_de_cota(erro):
+    """Indica se um HttpError foi causado pela cota diária esgotada"""
+    return _motivo_http(erro, MOTIVOS_COTA_ESGOTADA)
 
-🔖 #Gameplay #Gaming #GameplayPTBR #Viral #Games #Jogos #GameplayBrazil"""
+def erro_de_limite_taxa(erro):
+    """Indica se um HttpError é só o limite de taxa de curto prazo (não a cota do dia)"""
+    return _motivo_http(erro, MOTIVOS_LIMITE_TAXA)
 
-    url = "https://api.deepseek.com/v1/chat/completions"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {DEEPSEEK_API_KEY}"
-    }
+async def executar_com_recuo(funcao, descricao):
+    """Executa uma chamada bloqueante da API em thread, repetindo com recuo exponencial se o YouTube
+    responder limite de taxa; outros erros (inclusive cota esgotada) sobem na hora"""
+    for tentativa in range(TENTATIVAS_LIMITE_TAXA + 1):
+        try:
+            return await executar_em_thread(funcao)
+        except HttpError as e:
+            if not erro_de_limite_taxa(e) or tentativa == TENTATIVAS_LIMITE_TAXA:
+                raise
+            espera = RECUO_LIMITE_TAXA * 2 ** tentativa
+            print(f"⏳ Limite de taxa do YouTube em {descricao}; nova tentativa em {espera}s ({tentativa + 1}/{TENTATIVAS_LIMITE_TAXA})")
+            await asyncio.sleep(espera)
 
-    # Preparar informações do episódio para o prompt
-    info_episodio = f"Nome do Jogo: {nome_jogo}\n"
-    if numero_episodio:
-        info_episodio += f"Número do Episódio: {numero_episodio}\n"
-    info_episodio += f"Contexto Adicional: {contexto}"
+def obter_projeto_youtube(arquivo_credenciais='credentials.json'):
+    """Lê o project_id do credentials.json (a cota pertence ao projeto, não ao canal)"""
+    try:
+        with open(arquivo_credenciais, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        return (dados.get('installed') or dados.get('web') or {}).get('project_id') or 'padrao'
+    except (OSError, ValueError):
+        return 'padrao'
 
-    prompt = f"""
-    COM BASE NAS INFORMAÇÕES ABAIXO, GERAR METADADOS OTIMIZADOS PARA VÍDEO DE GAMEPLAY:
+class RegistroCota:
+    """Contabiliza as unidades de cota gastas por projeto em cada dia do Pacífico"""
+    def __init__(self, arquivo, limite_padrao):
+        self.arquivo = arquivo
+        self.limite_padrao = limite_padrao
+        self.limites = {}  # Projetos com cota diferente da padrão (ex.: aumento aprovado pelo Google)
+        self.dias = {}
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.dias = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao ler {arquivo}, iniciando contagem de cota vazia: {e}")
 
-    INFORMAÇÕES DO EPISÓDIO:
-    {info_episodio}
+    @staticmethod
+    def dia_atual():
+        return datetime.now(FUSO_COTA).date().isoformat()
 
-    REGRAS ESTRITAS PARA FORMATAÇÃO:
+    @staticmethod
+    def proximo_reset():
+        """Próxima meia-noite do Pacífico, no horário local"""
+        agora = datetime.now(FUSO_COTA)
+        amanha = (agora + timedelta(days=1)).date()
+        return datetime(amanha.year, amanha.month, amanha.day, tzinfo=FUSO_COTA).astimezone()
 
-    TÍTULO (OBRIGATÓRIO):
-    - SEMPRE iniciar com: "🎮 [NOME DO JOGO] - Episódio [X]:"
-    - [X] = número sequencial do episódio ({numero_episodio if numero_episodio else "use 1 se não especificado"})
-    - [NOME DO JOGO] = "{nome_jogo}"
-    - Título criativo: 3-5 palavras que capturem a essência sem spoilers
-    - Tom: misterioso e convidativo
+    def _hoje(self, projeto):
+        dias_projeto = self.dias.setdefault(projeto, {})
+        hoje = self.dia_atual()
+        # Manter só o dia corrente, o arquivo não precisa crescer para sempre
+        for dia in [d for d in dias_projeto if d != hoje]:
+            del dias_projeto[dia]
+        return dias_projeto.setdefault(hoje, {'usado': 0, 'esgotada': False, 'operacoes': {}})
 
-    DESCRIÇÃO (ESTRUTURA EXATA):
-    🎮 [NÃO INCLUA O TÍTULO AQUI]
-    
-    📖 SINOPSE
-    [4-6 linhas descrevendo contexto e atmosfera]
-    [Introduzir conflito sem spoilers]
-    [Estabelecer progressão emocional]
-    
-    🎯 NESTE EPISÓDIO:
-    • [Item 1 com emoji relevante]
-    • [Item 2 com emoji relevante] 
-    • [Item 3 com emoji relevante]
-    • [Item 4 com emoji relevante]
-    • [Item 5 com emoji relevante]
-    
-    💡 [Frase de impacto em 1 linha - gancho emocional]
-    
-    🔖 HASHTAGS
-    [6-8 hashtags prioritárias incluindo #Gameplay e variações]
+    def definir_limite(self, projeto, limite):
+        self.limites[projeto] = limite
 
-    LÓGICA DE CONTEÚDO:
-    - Usar o nome do jogo fornecido: "{nome_jogo}"
-    - Usar número do episódio: {numero_episodio if numero_episodio else "1 (padrão)"}
-    - Mapear elementos-chave: personagens, locais, mecânicas, progressão emocional
-    - Evitar completamente spoilers
-    - Usar tom envolvente e misterioso
-    - Incluir 5-8 palavras-chave semanticamente relacionadas
+    def limite(self, projeto):
+        return self.limites.get(projeto, self.limite_padrao)
 
-    FORMATO DE RESPOSTA (SEGUIR EXATAMENTE):
-    TITULO: 🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: [Título Criativo 3-5 palavras]
-    DESCRICAO: 
-    🎮 [Título Completo]
-    
-    📖 Sinopse
-    [4-6 linhas aqui]
-    
-    🎯 Neste Episódio:
-    • [Item 1]
-    • [Item 2]
-    • [Item 3]
-    • [Item 4]
-    • [Item 5]
-    
-    💡 [Frase de impacto]
-    
-    🔖 [Hashtags aqui]
-    """
+    def usado(self, projeto):
+        return self._hoje(projeto)['usado']
 
-    data = {
-        "model": "deepseek-chat",
-        "messages": [
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        "max_tokens": 2000,
-        "temperature": 0.7
+    def restante(self, projeto):
+        dia = self._hoje(projeto)
+        if dia['esgotada']:
+            return 0
+        return max(0, self.limite(projeto) - dia['usado'])
+
+    def cabe(self, projeto, custo):
+        return self.restante(projeto) >= custo
+
+    def registrar(self, projeto, operacao):
+        dia = self._hoje(projeto)
+        dia['usado'] += CUSTO_COTA_YOUTUBE[operacao]
+        dia['operacoes'][operacao] = dia['operacoes'].get(operacao, 0) + 1
+        self.salvar()
+
+    def marcar_esgotada(self, projeto):
+        """O YouTube recusou por cota: nada mais passa até o reset, mesmo que a conta local discorde"""
+        self._hoje(projeto)['esgotada'] = True
+        self.salvar()
+        print(f"⛽ Cota do projeto {projeto} esgotada até {self.proximo_reset():%d/%m %H:%M}")
+
+    def salvar(self):
+        temporario = f"{self.arquivo}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.dias, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.arquivo)
+
+registro_cota = None
+
+def obter_registro_cota():
+    global registro_cota
+    if registro_cota is None:
+        registro_cota = RegistroCota(ARQUIVO_COTA, COTA_DIARIA_YOUTUBE)
+    return registro_cota
+
+def custo_tarefa(tarefa):
+    """Unidades de cota que uma tarefa da fila vai consumir"""
+    custo = CUSTO_COTA_YOUTUBE['videos.insert']
+    if tarefa.thumbnail_path:
+        custo += CUSTO_COTA_YOUTUBE['thumbnails.set']
+    return custo
+
+def custo_pendente(tarefa):
+    """Parte do custo da tarefa que ainda não saiu da cota: o videos.insert é cobrado quando a sessão
+    abre, então uma tarefa em upload (ou retomada do checkpoint) só deve a thumbnail"""
+    custo = custo_tarefa(tarefa)
+    if 'videos.insert' in tarefa.cota_registrada or tarefa.sessao_upload:
+        custo -= CUSTO_COTA_YOUTUBE['videos.insert']
+    if 'thumbnails.set' in tarefa.cota_registrada and tarefa.thumbnail_path:
+        custo -= CUSTO_COTA_YOUTUBE['thumbnails.set']
+    return custo
+
+def previsao_cota(perfil):
+    """Compara a cota restante de hoje com o custo das tarefas ainda pendentes do projeto do perfil"""
+    cota = obter_registro_cota()
+    restante = cota.restante(perfil.projeto)
+    custo_fila = 0
+    tarefas_que_cabem = 0
+    # Perfis que compartilham o projeto do Google Cloud dividem a mesma cota
+    pendentes = [
+        t for t in fila_ativa.values()
+        if t.perfil and t.perfil.projeto == perfil.projeto and t.status in ("na_fila", "em_upload", "aguardando_cota")
+    ]
+    for tarefa in pendentes:
+        custo_fila += custo_pendente(tarefa)
+        if custo_fila <= restante:
+            tarefas_que_cabem += 1
+    return {
+        'projeto': perfil.projeto,
+        'limite': cota.limite(perfil.projeto),
+        'usado': cota.usado(perfil.projeto),
+        'restante': restante,
+        'custo_fila': custo_fila,
+        'tarefas_pendentes': len(pendentes),
+        'tarefas_que_cabem': tarefas_que_cabem,
+        'cabe_hoje': custo_fila <= restante,
+        'proximo_reset': cota.proximo_reset().isoformat(timespec='minutes'),
     }
 
+async def aguardar_cota(tarefa):
+    """Segura a tarefa até haver cota para ela, em vez de queimar tentativas que falhariam"""
+    perfil = tarefa.perfil
+    cota = obter_registro_cota()
+    custo = custo_pendente(tarefa)
+    if cota.cabe(perfil.projeto, custo):
+        return
+    
+    perfil.aguardando_cota_ate = cota.proximo_reset()
+    tarefa.status = "aguardando_cota"
+    await atualizar_status_fila(tarefa)
+    await atualizar_fila_global()
+    await tarefa.ctx.send(
+        f"⛽ **Cota diária do YouTube esgotada** no perfil `{perfil.nome}` "
+        f"({cota.usado(perfil.projeto)}/{cota.limite(perfil.projeto)} unidades).\n"
+        f"A fila fica pausada e retoma automaticamente após o reset: **{perfil.aguardando_cota_ate:%d/%m às %H:%M}**."
+    )
+    
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        if response.status_code == 200:
-            resultado = response.json()
-            resposta = resultado['choices'][0]['message']['content']
-            
-            # Processar resposta
-            linhas = resposta.split('\n')
-            titulo = None
-            descricao = ""
-            em_descricao = False
-            
-            for linha in linhas:
-                if linha.startswith('TITULO: '):
-                    titulo = linha.replace('TITULO: ', '').strip()
-                elif linha.startswith('DESCRICAO: '):
-                    descricao = linha.replace('DESCRICAO: ', '').strip()
-                    em_descricao = True
-                elif em_descricao:
-                    if descricao:  # Se já começamos a descrição
-                        descricao += "\n" + linha
-                    else:
-                        descricao = linha
-            
-            # Fallback se não conseguir parsear corretamente
-            if not titulo or not descricao:
-                titulo_fallback = f"🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial"
-                descricao_fallback = f"""🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial
+        while not cota.cabe(perfil.projeto, custo):
+            # !cancelar e o desligamento não esperam o reset: acordam a tarefa na hora
+            await controle_uploads.cochilar(60, tarefa)
+    finally:
+        perfil.aguardando_cota_ate = None
+    
+    tarefa.status = "em_upload"
+    await atualizar_status_fila(tarefa)
+    await atualizar_fila_global()
 
-📖 Sinopse
-Embarque nesta jornada épica de {nome_jogo}! Explore mundos incríveis, enfrente desafios emocionantes e descubra segredos ocultos.
+# ========== PERFIS DE CONTAS DO YOUTUBE ==========
 
-🎯 Neste Episódio:
-• 🎮 Gameplay envolvente e dinâmico
-• 🗺️ Exploração de ambientes impressionantes
-• ⚔️ Desafios estratégicos e intensos
-• 🎯 Objetivos emocionantes e recompensadores
-• 💡 Revelações surpreendentes
+class PerfilYouTube:
+    """Uma conta do YouTube: credenciais, fila e vagas de upload próprias"""
+    def __init__(self, nome, credenciais='credentials.json', token='token.json', vagas=1,
+                 cota_diaria=None, jogos=(), canais=()):
+        self.nome = nome
+        self.credenciais = credenciais
+        self.token = token
+        self.vagas = max(1, int(vagas))
+        self.cota_diaria = cota_diaria
+        self.jogos = {jogo.casefold() for jogo in jogos}
+        self.canais = {int(canal) for canal in canais}
+        self.projeto = obter_projeto_youtube(credenciais)
+        self.fila = FilaUploads()
+        self.em_andamento = 0
+        self.clientes = {}  # vaga -> cliente da API (httplib2 não é thread-safe)
+        self.aguardando_cota_ate = None  # Horário do reset enquanto a fila do perfil está segura
 
-💡 Uma aventura que vai te prender da primeira à última cena!
+class FilaUploads:
+    """Fila de uploads de um perfil: episódios de um mesmo jogo saem em ordem e um de cada vez"""
+    def __init__(self):
+        self.tarefas = []
+        self.jogos_em_envio = set()
+        self._aguardando = []  # Futures de get() esperando uma tarefa liberada
 
-🔖 #{nome_jogo.replace(' ', '')} #Gameplay #Gaming #GameplayPTBR #Viral #Games"""
-                
-                return titulo_fallback, descricao_fallback
+    def qsize(self):
+        return len(self.tarefas)
 
-            return titulo, descricao
-            
-        else:
-            print(f"Erro API DeepSeek: {response.status_code} - {response.text}")
-            titulo_fallback = f"🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial"
-            descricao_fallback = f"""🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial
+    def empty(self):
+        return not self.tarefas
 
-📖 Sinopse
-Uma nova jornada em {nome_jogo} está prestes a começar! Acompanhe esta aventura única cheia de emoções.
+    def posicao_de_entrada(self, tarefa):
+        """Índice onde a tarefa entraria: no fim, mas antes de episódios posteriores do mesmo jogo"""
+        if tarefa.jogo_chave and tarefa.episodio is not None:
+            for i, outra in enumerate(self.tarefas):
+                if outra.jogo_chave == tarefa.jogo_chave and outra.episodio is not None and outra.episodio > tarefa.episodio:
+                    return i
+        return len(self.tarefas)
 
-🎯 Neste Episódio:
-• 🎮 Gameplay de alta qualidade
-• 🗺️ Descobertas impressionantes
-• ⚔️ Desafios emocionantes
-• 🎯 Objetivos importantes
-• 💡 Momentos memoráveis
+    def put_nowait(self, tarefa):
+        indice = self.posicao_de_entrada(tarefa)
+        self.tarefas.insert(indice, tarefa)
+        self._renumerar()
+        self._acordar()
+        return indice + 1
 
-💡 Não perca esta aventura épica!
+    async def put(self, tarefa):
+        return self.put_nowait(tarefa)
 
-🔖 #{nome_jogo.replace(' ', '')} #Gameplay #Gaming #Viral #GameplayBrazil"""
-            
-            return titulo_fallback, descricao_fallback
-            
-    except Exception as e:
-        print(f"Erro ao chamar DeepSeek: {e}")
-        titulo_fallback = f"🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial"
-        descricao_fallback = f"""🎮 {nome_jogo} - Episódio {numero_episodio if numero_episodio else 1}: Aventura Inicial
+    def get_nowait(self):
+        """Próxima tarefa cujo jogo não está sendo enviado por outra vaga"""
+        for i, tarefa in enumerate(self.tarefas):
+            if not tarefa.jogo_chave or tarefa.jogo_chave not in self.jogos_em_envio:
+                del self.tarefas[i]
+                if tarefa.jogo_chave:
+                    self.jogos_em_envio.add(tarefa.jogo_chave)
+                self._renumerar()
+                return tarefa
+        raise asyncio.QueueEmpty
 
-📖 Sinopse
-Embarque nesta incrível aventura em {nome_jogo}! Cada episódio traz novas surpresas e desafios.
+    async def get(self):
+        while True:
+            try:
+                return self.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            futuro = asyncio.get_running_loop().create_future()
+            self._aguardando.append(futuro)
+            try:
+                await futuro
+            finally:
+                if futuro in self._aguardando:
+                    self._aguardando.remove(futuro)
 
-🎯 Neste Episódio:
-• 🎮 Experiência de jogo imersiva
-• 🗺️ Ambientes ricos e detalhados
-• ⚔️ Combates e estratégias únicas
-• 🎯 Progressão emocionante
-• 💡 Histórias cativantes
+    def concluir(self, tarefa):
+        """Libera o jogo da tarefa para o próximo episódio"""
+        self.jogos_em_envio.discard(tarefa.jogo_chave)
+        self._acordar()
 
-💡 Prepare-se para horas de diversão!
+    def devolver(self, tarefa):
+        """Põe de volta na frente da fila uma tarefa retirada que não chegou a começar"""
+        self.jogos_em_envio.discard(tarefa.jogo_chave)
+        self.tarefas.insert(0, tarefa)
+        self._renumerar()
+        self._acordar()
 
-🔖 #{nome_jogo.replace(' ', '')} #Gameplay #Gaming #Viral #Games"""
-        
-        return titulo_fallback, descricao_fallback
+    def remover(self, tarefa):
+        """Tira da fila uma tarefa que ainda não começou; False se ela não estava esperando"""
+        if tarefa not in self.tarefas:
+            return False
+        self.tarefas.remove(tarefa)
+        self._renumerar()
+        return True
 
-async def atualizar_status_upload(ctx, message_id, etapa, progresso=0, total=100, detalhes=""):
-    """Atualiza o status do upload em tempo real"""
-    global ultima_mensagem_status
-    
-    try:
-        # Calcular porcentagem
-        porcentagem = (progresso / total) * 100 if total > 0 else 0
-        
-        # Criar barra de progresso
-        barra_length = 20
-        blocos_preenchidos = int(barra_length * porcentagem / 100)
-        barra = "█" * blocos_preenchidos + "░" * (barra_length - blocos_preenchidos)
-        
-        # Definir cor baseado no progresso
-        cor = 0x00ff00 if porcentagem == 100 else 0x0099ff if porcentagem >= 50 else 0xff9900 if porcentagem >= 25 else 0xff0000
-        
-        embed = discord.Embed(
-            title="📤 Status do Upload - YouTube",
-            description=f"**Etapa:** {etapa}\n{detalhes}",
-            color=cor,
-            timestamp=datetime.now()
-        )
-        
-        embed.add_field(
-            name="📊 Progresso",
-            value=f"```[{barra}] {porcentagem:.1f}%```\n{progresso}/{total}",
-            inline=False
-        )
-        
-        # Atualizar a mensagem
-        try:
-            mensagem = await ctx.channel.fetch_message(message_id)
-            await mensagem.edit(embed=embed)
-            ultima_mensagem_status = mensagem
-        except discord.NotFound:
-            print("Mensagem de status não encontrada, criando nova...")
-            nova_mensagem = await ctx.send(embed=embed)
-            ultima_mensagem_status = nova_mensagem
-        
-    except Exception as e:
-        print(f"Erro ao atualizar status: {e}")
+    def mover(self, tarefa, posicao):
+        """Coloca uma tarefa à espera na posição pedida (1 = próxima a sair); devolve a posição final"""
+        self.tarefas.remove(tarefa)
+        indice = max(0, min(posicao - 1, len(self.tarefas)))
+        self.tarefas.insert(indice, tarefa)
+        self._renumerar()
+        return indice + 1
 
-async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao, thumbnail_path=None, agendar=None):
-    """Faz upload real para o YouTube usando a API com status em tempo real"""
-    global ultima_mensagem_status
+    def esvaziar(self):
+        """Remove e devolve todas as tarefas que ainda não começaram"""
+        tarefas, self.tarefas = self.tarefas, []
+        return tarefas
+
+    def _renumerar(self):
+        for posicao, tarefa in enumerate(self.tarefas, start=1):
+            tarefa.posicao = posicao
+
+    def _acordar(self):
+        aguardando, self._aguardando = self._aguardando, []
+        for futuro in aguardando:
+            if not futuro.done():
+                futuro.set_result(None)
+
+perfis_youtube = None
+nome_perfil_padrao = None
+
+def carregar_perfis(arquivo):
+    """Lê perfis_youtube.json; sem ele, usa um único perfil com credentials.json/token.json"""
+    configuracao = {}
+    if os.path.exists(arquivo):
+        try:
+            with open(arquivo, 'r', encoding='utf-8') as f:
+                configuracao = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Erro ao ler {arquivo}, usando apenas o perfil padrão: {e}")
+    
+    perfis = {}
+    for nome, dados in (configuracao.get('perfis') or {'principal': {}}).items():
+        perfis[nome] = PerfilYouTube(
+            nome,
+            credenciais=dados.get('credentials', 'credentials.json'),
+            token=dados.get('token', 'token.json'),
+            vagas=dados.get('vagas', 1),
+            cota_diaria=dados.get('cota_diaria'),
+            jogos=dados.get('jogos', []),
+            canais=dados.get('canais', []),
+        )
+        if perfis[nome].cota_diaria:
+            obter_registro_cota().definir_limite(perfis[nome].projeto, perfis[nome].cota_diaria)
     
-    try:
-        # Etapa 1: Autenticação
-        await atualizar_status_upload(ctx, status_message.id, "🔐 Autenticando com YouTube", 10, 100, "Conectando à API do YouTube...")
-        
-        youtube = autenticar_youtube()
-        if not youtube:
-            await atualizar_status_upload(ctx, status_message.id, "❌ Falha na autenticação", 0, 100, "Não foi possível autenticar com o YouTube")
-            return {"status": "erro", "mensagem": "Falha na autenticação do YouTube"}
-        
-        # Etapa 2: Preparando upload
-        await atualizar_status_upload(ctx, status_message.id, "📦 Preparando upload", 25, 100, "Configurando metadados do vídeo...")
-        
-        # Configurações do vídeo
-        body = {
-            'snippet': {
+    padrao = configuracao.get('padrao')
+    if padrao not in perfis:
+        padrao = next(iter(perfis))
+    return perfis, padrao
+
+def obter_perfis():
+    global perfis_youtube, nome_perfil_padrao
+    if perfis_youtube is None:
+        perfis_youtube, nome_perfil_padrao = carregar_perfis(ARQUIVO_PERFIS)
+    return perfis_youtube
+
+def obter_perfil_padrao():
+    return obter_perfis()[nome_perfil_padrao]
+
+def rotear_perfil(video_info, id_canal=None):
+    """Escolhe o perfil pelo jogo do arquivo; se nenhum reclamar o jogo, pelo canal do Discord"""
+    perfis = obter_perfis()
+    nome_jogo, _ = extrair_info_arquivo(os.path.basename(video_info['video']))
+    chave = nome_jogo.casefold()
+    for perfil in perfis.values():
+        if chave in perfil.jogos:
+            return perfil
+    for perfil in perfis.values():
+        if id_canal in perfil.canais:
+            return perfil
+    return obter_perfil_padrao()
+
+def canais_permitidos():
+    """Canal principal mais os canais associados a algum perfil"""
+    canais = {CANAL_DISCORD_ID}
+    for perfil in obter_perfis().values():
+        canais |= perfil.canais
+    return canais
+
+def total_na_fila():
+    return sum(perfil.fila.qsize() for perfil in obter_perfis().values())
+
+def uploads_em_andamento():
+    return sum(perfil.em_andamento for perfil in obter_perfis().values())
+
+async def obter_cliente_youtube(perfil, vaga=0):
+    """Cliente da API em cache por perfil e vaga; autenticação e refresh rodam fora do event loop"""
+    cliente = perfil.clientes.get(vaga)
+    if cliente is None:
+        cliente = await executar_em_thread(autenticar_youtube, perfil)
+        if cliente:
+            perfil.clientes[vaga] = cliente
+    return cliente
+
+# ========== LEITOR DE CHUNKS DO UPLOAD ==========
+
+class VideoAlteradoDuranteUpload(OSError):
+    """O arquivo do vídeo encolheu depois que o upload começou"""
+    pass
+
+class MediaVideoMapeado(MediaUpload):
+    """Vídeo do upload resumível lido direto do arquivo, com memória fixa por upload.
+    
+    No modo padrão entrega o próprio arquivo como stream: o cliente HTTP lê cada chunk em
+    blocos pequenos, como o MediaFileUpload, e um vídeo truncado no meio do envio só encurta
+    a leitura. Com usar_mmap, serve memoryviews sobre um mmap e devolve ao kernel as páginas
+    já confirmadas; antes de cada chunk confere se o arquivo encolheu, porque ler uma página
+    que deixou de existir mata o processo com SIGBUS."""
+    def __init__(self, caminho, chunksize=TAMANHO_CHUNK_UPLOAD, mimetype=None, usar_mmap=False):
+        self._caminho = caminho
+        self._chunksize = chunksize
+        self._mimetype = mimetype or mimetypes.guess_type(caminho)[0] or 'application/octet-stream'
+        self._arquivo = open(caminho, 'rb')
+        self._tamanho = os.fstat(self._arquivo.fileno()).st_size
+        self._mapa = None
+        self._liberado_ate = 0
+        if usar_mmap and self._tamanho:
+            try:
+                self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ mmap indisponível para {os.path.basename(caminho)} ({e}); lendo direto do arquivo")
+        if self._mapa is not None and hasattr(self._mapa, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mapa.madvise(mmap.MADV_SEQUENTIAL)
+
+    @property
+    def modo(self):
+        return 'mmap' if self._mapa is not None else 'arquivo'
+
+    def chunksize(self):
+        return self._chunksize
+
+    def mimetype(self):
+        return self._mimetype
+
+    def size(self):
+        return self._tamanho
+
+    def resumable(self):
+        return True
+
+    def has_stream(self):
+        return self._mapa is None
+
+    def stream(self):
+        return self._arquivo
+
+    def getbytes(self, begin, length):
+        if self._mapa is None:
+            self._arquivo.seek(begin)
+            return self._arquivo.read(length)
+        
+        tamanho_atual = os.fstat(self._arquivo.fileno()).st_size
+        if tamanho_atual < self._tamanho:
+            raise VideoAlteradoDuranteUpload(
+                f"{os.path.basename(self._caminho)} encolheu de {self._tamanho} para {tamanho_atual} bytes durante o upload"
+            )
+        self._liberar_confirmado(begin)
+        return memoryview(self._mapa)[begin:begin + length]
+
+    def _liberar_confirmado(self, begin):
+        """O chunk pedido começa no offset confirmado pelo YouTube: as páginas anteriores saem do RSS
+        (continuam no page cache; se um erro fizer o envio voltar, o kernel relê do disco)"""
+        if not hasattr(self._mapa, 'madvise') or not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        fim = begin - begin % mmap.PAGESIZE
+        if fim > self._liberado_ate:
+            self._mapa.madvise(mmap.MADV_DONTNEED, self._liberado_ate, fim - self._liberado_ate)
+            self._liberado_ate = fim
+
+    def fechar(self):
+        if self._mapa is not None:
+            try:
+                self._mapa.close()
+                self._mapa = None
+            except BufferError:
+                pass  # Ainda há um memoryview do último chunk vivo; o coletor fecha o mapa depois
+        self._arquivo.close()
+
+    def __del__(self):
+        if getattr(self, '_arquivo', None) is not None:
+            self.fechar()
+
+# ========== LIMITADOR DE BANDA DE UPLOAD ==========
+
+def mbps_para_bytes(mbps):
+    return float(mbps or 0) * 1_000_000 / 8
+
+def _minutos_do_dia(horario):
+    horas, minutos = horario.split(':')
+    return int(horas) * 60 + int(minutos)
+
+class BaldeTokens:
+    """Balde de tokens em bytes; envios maiores que o balde viram dívida paga com espera"""
+    def __init__(self, taxa=0.0):
+        self.taxa = taxa  # bytes/s; 0 = sem limite
+        self.tokens = 0.0
+        self.ultimo = time.monotonic()
+
+    def _reabastecer(self):
+        agora = time.monotonic()
+        if self.taxa:
+            # Rajada máxima de 1 segundo de banda acumulada
+            self.tokens = min(self.taxa, self.tokens + (agora - self.ultimo) * self.taxa)
+        self.ultimo = agora
+
+    def ajustar(self, taxa):
+        if taxa != self.taxa:
+            self._reabastecer()
+            self.taxa = taxa
+            self.tokens = min(self.tokens, taxa)
+
+    def reservar(self, nbytes):
+        """Desconta os bytes e devolve quantos segundos esperar antes de enviá-los"""
+        self._reabastecer()
+        if not self.taxa:
+            return 0.0
+        self.tokens -= nbytes
+        return max(0.0, -self.tokens / self.taxa)
+
+class LimitadorBanda:
+    """Limites de banda global e por envio, com faixas de horário, ajustáveis sem reiniciar"""
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.config = {
+            'global_mbps': LIMITE_BANDA_GLOBAL_MBPS,
+            'por_envio_mbps': LIMITE_BANDA_ENVIO_MBPS,
+            'horarios': [],
+        }
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.config.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao ler {arquivo}, usando limites de banda do .env: {e}")
+        self.balde_global = BaldeTokens()
+        self.baldes_envio = {}  # (perfil, vaga) -> BaldeTokens
+        self.bytes_enviados = 0
+        self.espera_total = 0.0
+
+    def limites_atuais(self, agora=None):
+        """Limites em vigor agora: a primeira faixa de horário que cobre o momento, senão os padrões"""
+        agora = agora or datetime.now()
+        minuto = agora.hour * 60 + agora.minute
+        for faixa in self.config['horarios']:
+            inicio, fim = _minutos_do_dia(faixa['inicio']), _minutos_do_dia(faixa['fim'])
+            # Faixas como 22:00-06:00 atravessam a meia-noite
+            dentro = inicio <= minuto < fim if inicio <= fim else (minuto >= inicio or minuto < fim)
+            if dentro:
+                return {
+                    'global_mbps': faixa['global_mbps'],
+                    'por_envio_mbps': faixa['por_envio_mbps'],
+                    'faixa': f"{faixa['inicio']}-{faixa['fim']}",
+                }
+        return {
+            'global_mbps': self.config['global_mbps'],
+            'por_envio_mbps': self.config['por_envio_mbps'],
+            'faixa': None,
+        }
+
+    def ativo(self):
+        limites = self.limites_atuais()
+        return bool(limites['global_mbps'] or limites['por_envio_mbps'])
+
+    def tamanho_chunk(self):
+        """Chunk do upload: sem limite, o padrão; com limite, ~SEGUNDOS_CHUNK_LIMITADO da menor taxa em vigor.
+        Cada chunk é um PUT com ida e volta ao YouTube: chunks fixos e pequenos travariam a vazão pelo RTT
+        bem abaixo de um limite alto, e chunks grandes demais deixariam um limite baixo em rajadas"""
+        limites = self.limites_atuais()
+        taxas = [mbps_para_bytes(mbps) for mbps in (limites['global_mbps'], limites['por_envio_mbps']) if mbps]
+        if not taxas:
+            return TAMANHO_CHUNK_UPLOAD
+        blocos = max(1, round(min(taxas) * SEGUNDOS_CHUNK_LIMITADO / TAMANHO_CHUNK_UPLOAD_MINIMO))
+        return min(blocos * TAMANHO_CHUNK_UPLOAD_MINIMO, TAMANHO_CHUNK_UPLOAD_MAXIMO)
+
+    async def aguardar(self, chave, nbytes):
+        """Segura o envio de `nbytes` até caber nos baldes global e da vaga"""
+        limites = self.limites_atuais()
+        self.balde_global.ajustar(mbps_para_bytes(limites['global_mbps']))
+        balde_envio = self.baldes_envio.setdefault(chave, BaldeTokens())
+        balde_envio.ajustar(mbps_para_bytes(limites['por_envio_mbps']))
+        
+        espera = max(self.balde_global.reservar(nbytes), balde_envio.reservar(nbytes))
+        self.bytes_enviados += nbytes
+        if espera <= 0:
+            return
+        self.espera_total += espera
+        # Esperar em fatias curtas: se o !banda tirar o limite, o envio segue na hora
+        fim = time.monotonic() + espera
+        while time.monotonic() < fim:
+            await asyncio.sleep(min(fim - time.monotonic(), 0.5))
+            if not self.ativo():
+                break
+
+    def definir_padrao(self, chave, mbps):
+        self.config[chave] = mbps
+        self.salvar()
+
+    def definir_faixa(self, inicio, fim, global_mbps, por_envio_mbps):
+        # Uma faixa por horário de início; redefinir substitui a anterior
+        self.config['horarios'] = [f for f in self.config['horarios'] if f['inicio'] != inicio]
+        self.config['horarios'].append({
+            'inicio': inicio, 'fim': fim, 'global_mbps': global_mbps, 'por_envio_mbps': por_envio_mbps,
+        })
+        self.config['horarios'].sort(key=lambda f: f['inicio'])
+        self.salvar()
+
+    def remover_faixa(self, inicio):
+        antes = len(self.config['horarios'])
+        self.config['horarios'] = [f for f in self.config['horarios'] if f['inicio'] != inicio]
+        self.salvar()
+        return len(self.config['horarios']) < antes
+
+    def salvar(self):
+        temporario = f"{self.arquivo}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.arquivo)
+
+    def resumo(self):
+        return {
+            'limites_atuais': self.limites_atuais(),
+            'config': self.config,
+            'bytes_enviados': self.bytes_enviados,
+            'espera_total_s': round(self.espera_total, 1),
+        }
+
+limitador_banda = None
+
+def obter_limitador_banda():
+    global limitador_banda
+    if limitador_banda is None:
+        limitador_banda = LimitadorBanda(ARQUIVO_BANDA)
+    return limitador_banda
+
+def formatar_limite(mbps):
+    return f"{mbps:g} Mbps" if mbps else "sem limite"
+
+# ========== ÍNDICE DA PASTA DE VÍDEOS ==========
+
+# Extensões aceitas por tipo de arquivo, na ordem de prioridade (a última vence em caso de empate de nome)
+EXTENSOES_POR_TIPO = {
+    'video': ['.mp4', '.avi', '.mkv', '.mov'],
+    'legendas': ['.srt'],
+    'thumb': ['.jpg', '.jpeg', '.png'],
+    'contexto': ['.txt', '.json'],
+}
+TIPO_POR_EXTENSAO = {ext: tipo for tipo, extensoes in EXTENSOES_POR_TIPO.items() for ext in extensoes}
+
+class IndicePastaVideos:
+    """Índice incremental dos pacotes (vídeo, contexto, thumbnail, legendas) da pasta de vídeos"""
+    def __init__(self, pasta):
+        self.pasta = pasta
+        self.versao = 0  # Muda sempre que algum arquivo entra ou sai do índice
+        self.bytes_total = 0  # Soma dos tamanhos indexados, mantida a cada entrada/saída
+        self._arquivos = {}  # caminho -> {'tipo', 'nome_base', 'extensao', 'tamanho', 'mtime'}
+        self._mtimes_pastas = {}  # pasta -> st_mtime_ns da última varredura
+        self._pacotes = None
+        self._lock = threading.RLock()
+
+    def _entrada(self, caminho, stat):
+        nome_base, extensao = os.path.splitext(os.path.basename(caminho))
+        tipo = TIPO_POR_EXTENSAO.get(extensao.lower())
+        if not tipo or nome_base.startswith('.'):
+            return None
+        return {
+            'tipo': tipo,
+            'nome_base': nome_base,
+            'extensao': extensao.lower(),
+            'tamanho': stat.st_size,
+            'mtime': stat.st_mtime,
+        }
+
+    def _guardar(self, caminho, dados):
+        anterior = self._arquivos.get(caminho)
+        self.bytes_total += dados['tamanho'] - (anterior['tamanho'] if anterior else 0)
+        self._arquivos[caminho] = dados
+        self.versao += 1
+
+    def _descartar(self, caminho):
+        dados = self._arquivos.pop(caminho, None)
+        if dados is None:
+            return False
+        self.bytes_total -= dados['tamanho']
+        self.versao += 1
+        return True
+
+    def _varrer_pasta(self, pasta):
+        """Relista uma única pasta e devolve as subpastas encontradas"""
+        subpastas = []
+        vistos = set()
+        try:
+            with os.scandir(pasta) as entradas:
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        subpastas.append(entrada.path)
+                    elif entrada.is_file():
+                        dados = self._entrada(entrada.path, entrada.stat())
+                        if dados:
+                            vistos.add(entrada.path)
+                            if self._arquivos.get(entrada.path) != dados:
+                                self._guardar(entrada.path, dados)
+        except FileNotFoundError:
+            pass
+        
+        # Remover do índice o que sumiu desta pasta (sem tocar nas subpastas)
+        for caminho in [c for c in self._arquivos if os.path.dirname(c) == pasta and c not in vistos]:
+            self._descartar(caminho)
+        return subpastas
+
+    def _reconferir_arquivos(self, pasta):
+        """Pasta sem mudança no mtime: um arquivo que cresceu (ou encolheu) no lugar não muda a pasta,
+        então cada arquivo conhecido dela é conferido pelo próprio stat"""
+        for caminho in [c for c in self._arquivos if os.path.dirname(c) == pasta]:
+            try:
+                stat = os.stat(caminho)
+            except FileNotFoundError:
+                self._descartar(caminho)
+                continue
+            anterior = self._arquivos[caminho]
+            if anterior['tamanho'] != stat.st_size or anterior['mtime'] != stat.st_mtime:
+                self._guardar(caminho, {**anterior, 'tamanho': stat.st_size, 'mtime': stat.st_mtime})
+
+    def atualizar(self):
+        """Reescaneia as pastas cujo mtime mudou desde a última varredura; nas outras, só confere o stat dos arquivos conhecidos"""
+        with self._lock:
+            versao_anterior = self.versao
+            pendentes = [self.pasta]
+            pastas_vistas = set()
+            
+            while pendentes:
+                pasta = pendentes.pop()
+                pastas_vistas.add(pasta)
+                try:
+                    mtime = os.stat(pasta).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                
+                if self._mtimes_pastas.get(pasta) != mtime:
+                    self._mtimes_pastas[pasta] = mtime
+                    pendentes.extend(self._varrer_pasta(pasta))
+                else:
+                    self._reconferir_arquivos(pasta)
+                    pendentes.extend(p for p in self._mtimes_pastas if os.path.dirname(p) == pasta)
+            
+            # Pastas removidas levam seus arquivos junto
+            for pasta in [p for p in self._mtimes_pastas if p not in pastas_vistas]:
+                del self._mtimes_pastas[pasta]
+                for caminho in [c for c in self._arquivos if os.path.dirname(c) == pasta]:
+                    self._descartar(caminho)
+            
+            if self.versao != versao_anterior:
+                self._pacotes = None
+
+    def registrar_arquivo(self, caminho):
+        """Adiciona um arquivo recém-criado ao índice sem esperar a próxima varredura"""
+        with self._lock:
+            dados = self._entrada(caminho, os.stat(caminho))
+            if dados:
+                self._guardar(caminho, dados)
+                self._pacotes = None
+
+    def remover_arquivo(self, caminho):
+        with self._lock:
+            if self._descartar(caminho):
+                self._pacotes = None
+
+    def pacotes(self):
+        """Agrupa os arquivos por nome base (todos os pacotes, com ou sem vídeo)"""
+        with self._lock:
+            if self._pacotes is None:
+                pacotes = {}
+                # Ordenar pela prioridade da extensão para que a última (mais prioritária) vença
+                ordem = sorted(
+                    self._arquivos.items(),
+                    key=lambda item: (EXTENSOES_POR_TIPO[item[1]['tipo']].index(item[1]['extensao']), item[0])
+                )
+                for caminho, dados in ordem:
+                    pacote = pacotes.setdefault(dados['nome_base'], {'nome_base': dados['nome_base']})
+                    pacote[dados['tipo']] = caminho
+                self._pacotes = pacotes
+            return self._pacotes
+
+    def tamanho_arquivo(self, caminho):
+        dados = self._arquivos.get(caminho)
+        return dados['tamanho'] if dados else 0
+
+indice_videos = None
+
+def obter_indice_videos():
+    """Devolve o índice da pasta atual (recriado se PASTA_VIDEOS mudar)"""
+    global indice_videos
+    if indice_videos is None or indice_videos.pasta != PASTA_VIDEOS:
+        indice_videos = IndicePastaVideos(PASTA_VIDEOS)
+    return indice_videos
+
+def listar_arquivos_vinculados():
+    """Lista vídeos e arquivos relacionados com o mesmo nome base"""
+    indice = obter_indice_videos()
+    indice.atualizar()
+    
+    # Retorna apenas os que têm vídeo (cópias, pois o fluxo de seleção altera os dicionários)
+    return {k: dict(v) for k, v in indice.pacotes().items() if 'video' in v}
+
+# ========== RESPOSTAS ESTRUTURADAS DO DEEPSEEK ==========
+
+LIMITE_TITULO_YOUTUBE = 100  # Caracteres
+LIMITE_DESCRICAO_YOUTUBE = 5000  # Bytes (UTF-8)
+LIMITE_HASHTAGS = 15  # Acima disso o YouTube ignora todas as hashtags do vídeo
+LIMITE_TAGS_YOUTUBE = 500  # Caracteres somados das tags do snippet
+
+estatisticas_deepseek = {
+    'chamadas': 0, 'tokens_prompt': 0, 'tokens_resposta': 0,
+    'respostas': 0, 'validas': 0, 'corrigidas': 0, 'reparadas': 0, 'sem_resposta': 0,
+    'lotes': 0, 'episodios_em_lote': 0,
+}
+
+def resumo_deepseek():
+    """Contadores das chamadas ao DeepSeek e taxa de respostas aproveitadas de primeira"""
+    resumo = dict(estatisticas_deepseek)
+    respostas = resumo['respostas']
+    resumo['taxa_sucesso_json'] = round(resumo['validas'] / respostas, 3) if respostas else None
+    resumo['taxa_aproveitamento'] = round((resumo['validas'] + resumo['corrigidas']) / respostas, 3) if respostas else None
+    return resumo
+
+async def ler_stream_deepseek(resposta, ao_receber):
+    """Lê os eventos SSE do chat completions; devolve (texto completo, uso de tokens)"""
+    partes = []
+    uso = {}
+    async for linha in resposta.content:
+        linha = linha.decode('utf-8').strip()
+        if not linha.startswith('data:'):
+            continue
+        dados = linha[5:].strip()
+        if dados == '[DONE]':
+            break
+        evento = json.loads(dados)
+        uso = evento.get('usage') or uso
+        for escolha in evento.get('choices') or []:
+            pedaco = (escolha.get('delta') or {}).get('content')
+            if pedaco:
+                partes.append(pedaco)
+                await ao_receber(pedaco)
+    return "".join(partes), uso
+
+async def chamar_deepseek(mensagens, max_tokens=2000, formato_json=False, ao_receber=None):
+    """Uma chamada ao chat completions do DeepSeek; devolve o texto da resposta (exceção se falhar)
+    
+    Com `ao_receber`, a resposta vem em streaming e cada pedaço de texto é passado a ele assim que chega.
+    """
+    if isinstance(mensagens, str):
+        mensagens = [{"role": "user", "content": mensagens}]
+    dados = {
+        "model": "deepseek-chat",
+        "messages": mensagens,
+        "max_tokens": max_tokens,
+        "temperature": 0.7
+    }
+    if formato_json:
+        dados["response_format"] = {"type": "json_object"}
+    if ao_receber:
+        dados["stream"] = True
+        dados["stream_options"] = {"include_usage": True}
+    headers = {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {DEEPSEEK_API_KEY}"
+    }
+    
+    sessao = await obter_sessao_http()
+    async with sessao.post(DEEPSEEK_API_URL, headers=headers, json=dados, timeout=aiohttp.ClientTimeout(total=120)) as resposta:
+        if resposta.status != 200:
+            raise RuntimeError(f"DeepSeek respondeu {resposta.status}: {(await resposta.text())[:200]}")
+        if ao_receber:
+            texto, uso = await ler_stream_deepseek(resposta, ao_receber)
+        else:
+            resultado = await resposta.json(content_type=None)
+            texto, uso = resultado['choices'][0]['message']['content'], resultado.get('usage') or {}
+    
+    estatisticas_deepseek['chamadas'] += 1
+    estatisticas_deepseek['tokens_prompt'] += uso.get('prompt_tokens', 0)
+    estatisticas_deepseek['tokens_resposta'] += uso.get('completion_tokens', 0)
+    return texto
+
+def extrair_json_resposta(texto):
+    """Primeiro objeto/lista JSON do texto, tolerando cercas ``` e comentários antes ou depois"""
+    texto = texto.strip()
+    if texto.startswith("```"):
+        texto = re.sub(r'^```[a-zA-Z]*\s*|\s*```$', '', texto)
+    try:
+        return json.loads(texto)
+    except ValueError:
+        pass
+    
+    decodificador = json.JSONDecoder()
+    for i, caractere in enumerate(texto):
+        if caractere in '{[':
+            try:
+                return decodificador.raw_decode(texto, i)[0]
+            except ValueError:
+                continue
+    raise ValueError("Nenhum JSON encontrado na resposta")
+
+ESCAPES_JSON = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+class LeitorJSONParcial:
+    """Lê um objeto JSON que chega aos pedaços e expõe os campos de texto já recebidos, mesmo incompletos"""
+    def __init__(self):
+        self.texto = ""
+
+    def alimentar(self, pedaco):
+        self.texto += pedaco
+
+    def campo(self, nome):
+        """(valor até agora, completo?) do campo de texto `nome`; (None, False) se ainda não começou"""
+        inicio = re.search(r'"%s"\s*:\s*"' % re.escape(nome), self.texto)
+        if not inicio:
+            return None, False
+        
+        partes = []
+        i = inicio.end()
+        texto = self.texto
+        while i < len(texto):
+            caractere = texto[i]
+            if caractere == '"':
+                return "".join(partes), True
+            if caractere == '\\':
+                if i + 1 >= len(texto):
+                    break
+                codigo = texto[i + 1]
+                if codigo == 'u':
+                    if i + 6 > len(texto):
+                        break
+                    try:
+                        ponto = int(texto[i + 2:i + 6], 16)
+                    except ValueError:
+                        i += 6
+                        continue
+                    if 0xD800 <= ponto < 0xDC00:
+                        # Emoji chega como par substituto (\ud83c\udfae): espera a segunda metade e junta as duas
+                        seguinte = texto[i + 6:i + 12]
+                        if len(seguinte) < 6 and '\\u'.startswith(seguinte[:2]):
+                            break
+                        try:
+                            baixo = int(seguinte[2:], 16) if seguinte.startswith('\\u') else None
+                        except ValueError:
+                            baixo = None
+                        if baixo is not None and 0xDC00 <= baixo < 0xE000:
+                            partes.append(chr(0x10000 + ((ponto - 0xD800) << 10) + (baixo - 0xDC00)))
+                            i += 12
+                            continue
+                    partes.append(chr(ponto))
+                    i += 6
+                    continue
+                partes.append(ESCAPES_JSON.get(codigo, codigo))
+                i += 2
+                continue
+            partes.append(caractere)
+            i += 1
+        return "".join(partes), False
+
+    def final(self):
+        return extrair_json_resposta(self.texto)
+
+def montar_descricao(dados):
+    """Descrição publicada: o texto do JSON mais a linha de hashtags"""
+    descricao = str(dados.get('descricao') or dados.get('description') or '').strip()
+    hashtags = dados.get('hashtags') or []
+    if isinstance(hashtags, str):
+        hashtags = hashtags.split()
+    hashtags = ['#' + re.sub(r'\s+', '', str(h)).lstrip('#') for h in hashtags if str(h).strip('# ')]
+    if hashtags and '🔖' not in descricao:
+        descricao += "\n\n🔖 " + " ".join(dict.fromkeys(hashtags))
+    return descricao
+
+def interpretar_metadados(dados):
+    """(título, descrição) de um objeto da resposta; ValueError se faltar algum campo"""
+    if not isinstance(dados, dict):
+        raise ValueError("a resposta não é um objeto JSON")
+    titulo = dados.get('titulo') or dados.get('title')
+    if not isinstance(titulo, str) or not titulo.strip():
+        raise ValueError("campo 'titulo' ausente ou vazio")
+    descricao = montar_descricao(dados)
+    if not descricao:
+        raise ValueError("campo 'descricao' ausente ou vazio")
+    return titulo.strip(), descricao
+
+def validar_metadados(titulo, descricao):
+    """Problemas que fariam o YouTube recusar ou ignorar os metadados (lista vazia = tudo certo)"""
+    problemas = []
+    if len(titulo) > LIMITE_TITULO_YOUTUBE:
+        problemas.append(f"título com {len(titulo)} caracteres (máximo {LIMITE_TITULO_YOUTUBE})")
+    tamanho = len(descricao.encode('utf-8'))
+    if tamanho > LIMITE_DESCRICAO_YOUTUBE:
+        problemas.append(f"descrição com {tamanho} bytes (máximo {LIMITE_DESCRICAO_YOUTUBE})")
+    if any(c in titulo + descricao for c in '<>'):
+        problemas.append("os caracteres < e > não são aceitos pelo YouTube")
+    hashtags = len(re.findall(r'#\w+', descricao))
+    if hashtags > LIMITE_HASHTAGS:
+        problemas.append(f"{hashtags} hashtags (máximo {LIMITE_HASHTAGS}; acima disso o YouTube ignora todas)")
+    return problemas
+
+def reparar_metadados(titulo, descricao):
+    """Ajusta localmente aos limites do YouTube (último recurso depois da re-pergunta)"""
+    titulo = titulo.replace('<', '').replace('>', '').strip()
+    if len(titulo) > LIMITE_TITULO_YOUTUBE:
+        cortado = titulo[:LIMITE_TITULO_YOUTUBE]
+        titulo = (cortado.rsplit(' ', 1)[0] if ' ' in cortado else cortado).rstrip(' -:|,')
+    
+    descricao = descricao.replace('<', '').replace('>', '')
+    contagem = [0]
+    def manter_hashtag(achado):
+        contagem[0] += 1
+        return achado.group(0) if contagem[0] <= LIMITE_HASHTAGS else ''
+    descricao = re.sub(r'#\w+', manter_hashtag, descricao)
+    descricao = re.sub(r'[ \t]+\n', '\n', descricao).rstrip()
+    if len(descricao.encode('utf-8')) > LIMITE_DESCRICAO_YOUTUBE:
+        descricao = descricao.encode('utf-8')[:LIMITE_DESCRICAO_YOUTUBE].decode('utf-8', 'ignore').rstrip()
+    return titulo, descricao
+
+def tags_da_descricao(descricao):
+    """Tags do snippet a partir das hashtags da descrição, dentro do limite de 500 caracteres do YouTube"""
+    tags = []
+    total = 0
+    for tag in dict.fromkeys(h[1:] for h in re.findall(r'#\w+', descricao)):
+        custo = len(tag) + (1 if tags else 0)  # A vírgula entre tags também conta
+        if total + custo > LIMITE_TAGS_YOUTUBE:
+            break
+        tags.append(tag)
+        total += custo
+    return tags
+
+def montar_prompt_metadados(contexto, nome_jogo, numero_episodio):
+    """Prompt de um episódio, pedindo a resposta como um objeto JSON"""
+    info_episodio = f"Nome do Jogo: {nome_jogo}\n"
+    if numero_episodio:
+        info_episodio += f"Número do Episódio: {numero_episodio}\n"
+    info_episodio += f"Contexto Adicional: {contexto}"
+    episodio = numero_episodio if numero_episodio else 1
+
+    return f"""
+    COM BASE NAS INFORMAÇÕES ABAIXO, GERAR METADADOS OTIMIZADOS PARA VÍDEO DE GAMEPLAY:
+
+    INFORMAÇÕES DO EPISÓDIO:
+    {info_episodio}
+
+    REGRAS ESTRITAS PARA FORMATAÇÃO:
+
+    TÍTULO (OBRIGATÓRIO):
+    - SEMPRE iniciar com: "🎮 {nome_jogo} - Episódio {episodio}:"
+    - Título criativo: 3-5 palavras que capturem a essência sem spoilers
+    - Tom: misterioso e convidativo
+    - No máximo {LIMITE_TITULO_YOUTUBE} caracteres no total
+
+    DESCRIÇÃO (ESTRUTURA EXATA, SEM AS HASHTAGS):
+    🎮 [Título Completo]
+    
+    📖 Sinopse
+    [4-6 linhas descrevendo contexto e atmosfera]
+    [Introduzir conflito sem spoilers]
+    [Estabelecer progressão emocional]
+    
+    🎯 Neste Episódio:
+    • [Item 1 com emoji relevante]
+    • [Item 2 com emoji relevante] 
+    • [Item 3 com emoji relevante]
+    • [Item 4 com emoji relevante]
+    • [Item 5 com emoji relevante]
+    
+    💡 [Frase de impacto em 1 linha - gancho emocional]
+
+    HASHTAGS: 6-8 hashtags prioritárias incluindo #Gameplay e variações
+
+    LÓGICA DE CONTEÚDO:
+    - Mapear elementos-chave: personagens, locais, mecânicas, progressão emocional
+    - Evitar completamente spoilers
+    - Usar tom envolvente e misterioso
+    - Incluir 5-8 palavras-chave semanticamente relacionadas
+    - Não usar os caracteres < e >
+
+    FORMATO DE RESPOSTA: apenas um objeto JSON, sem texto fora dele:
+    {{"titulo": "🎮 {nome_jogo} - Episódio {episodio}: [Título Criativo]", "descricao": "[descrição com \\n entre as linhas]", "hashtags": ["#Gameplay", "..."]}}
+    """
+
+async def gerar_metadados_deepseek(contexto, nome_jogo, numero_episodio, ao_parcial=None):
+    """Gera título e descrição otimizados para gameplay usando a API do DeepSeek (resposta em JSON)
+    
+    Com `ao_parcial`, a resposta vem em streaming e ele recebe o LeitorJSONParcial a cada pedaço.
+    Devolve None quando não há resposta aproveitável (quem chama cai no gerador local).
+    """
+    if not DEEPSEEK_API_KEY:
+        return None
+    
+    estatisticas_deepseek['respostas'] += 1
+    mensagens = [{"role": "user", "content": montar_prompt_metadados(contexto, nome_jogo, numero_episodio)}]
+    aproveitavel = None
+    
+    for tentativa in range(2):
+        leitor = LeitorJSONParcial()
+        async def receber(pedaco):
+            leitor.alimentar(pedaco)
+            await ao_parcial(leitor)
+        
+        try:
+            resposta = await chamar_deepseek(mensagens, formato_json=True, ao_receber=receber if ao_parcial else None)
+        except Exception as e:
+            print(f"Erro ao chamar DeepSeek: {e}")
+            break
+        
+        try:
+            titulo, descricao = interpretar_metadados(extrair_json_resposta(resposta))
+            aproveitavel = (titulo, descricao)
+            problemas = validar_metadados(titulo, descricao)
+        except ValueError as e:
+            problemas = [str(e)]
+        
+        if not problemas:
+            estatisticas_deepseek['validas' if tentativa == 0 else 'corrigidas'] += 1
+            return titulo, descricao
+        
+        # Uma única re-pergunta, dizendo exatamente o que corrigir
+        print(f"⚠️ Resposta do DeepSeek fora do formato: {'; '.join(problemas)}")
+        mensagens += [
+            {"role": "assistant", "content": resposta},
+            {"role": "user", "content": f"A resposta não seguiu as regras: {'; '.join(problemas)}. "
+                                        "Responda novamente apenas com o objeto JSON corrigido."},
+        ]
+    
+    if aproveitavel:
+        estatisticas_deepseek['reparadas'] += 1
+        return reparar_metadados(*aproveitavel)
+    
+    estatisticas_deepseek['sem_resposta'] += 1
+    return None
+
+# ========== GERADORES DE METADADOS ==========
+
+PALAVRAS_VAZIAS = frozenset("""
+a o as os um uma uns umas de da do das dos em na no nas nos por pela pelo pelas pelos para pra com sem sob
+sobre entre até após e ou mas nem que se como quando onde porque pois já não sim mais menos muito muita
+muitos muitas pouco pouca tudo todo toda todos todas este esta estes estas esse essa esses essas aquele
+aquela aqueles aquelas isto isso aquilo ele ela eles elas eu você vocês nós seu sua seus suas meu minha
+nosso nossa ao aos à às é são foi ser estar está estão era tem têm ter vai vão há também só ainda então
+aqui ali lá cada outro outra outros outras mesmo mesma depois antes agora sempre nunca neste nesta nesse
+nessa episódio episodio jogo contexto adicional parte vamos vemos fazemos temos primeiro primeira
+the and of to in on for with from this that is are was it at by an be as we our
+""".split())
+
+RE_NOME_PROPRIO = re.compile(r"\b[A-ZÀ-Ý][\wÀ-ÿ'-]+(?:\s+(?:d[aeo]s?\s+)?[A-ZÀ-Ý][\wÀ-ÿ'-]+)*")
+RE_PALAVRA = re.compile(r"[^\W\d_][\w'-]*")
+
+EMOJIS_TOPICOS = ["🗺️", "⚔️", "🧩", "🎯", "💡"]
+TOPICOS_GENERICOS = [
+    "Gameplay intenso e envolvente", "Exploração de novos territórios", "Desafios estratégicos",
+    "Objetivos e missões desafiadoras", "Momentos épicos e inesquecíveis",
+]
+DESTAQUES_GENERICOS = ["Aventura Inicial", "Novos Caminhos", "Segredos Ocultos", "Desafio Inesperado", "Rumo ao Desconhecido"]
+FORMATOS_DESTAQUE = {
+    1: ["Os Segredos de {a}", "{a} à Vista", "O Caminho até {a}"],
+    2: ["{a} e {b}", "Entre {a} e {b}"],
+}
+GANCHOS = [
+    "Uma aventura que vai te prender do início ao fim!", "Nada é o que parece.",
+    "Cada escolha conta a partir daqui.", "O pior ainda está por vir.",
+]
+
+# Modelo do gerador local; cada jogo pode sobrescrever qualquer chave em geradores_metadados.json
+MODELO_LOCAL_PADRAO = {
+    'titulo': "🎮 {jogo} - Episódio {episodio}: {destaque}",
+    'descricao': "{titulo}\n\n📖 Sinopse\n{sinopse}\n\n🎯 Neste Episódio:\n{topicos}\n\n💡 {gancho}",
+    'sinopse': "Embarque nesta jornada em {jogo}, cheia de desafios e descobertas. A cada episódio, novas aventuras aguardam!",
+    'hashtags': ["#{jogo_tag}", "#Gameplay", "#Gaming", "#GameplayPTBR", "#Games", "#Jogos"],
+}
+
+def extrair_palavras_chave(texto, evitar=(), limite=5):
+    """Termos mais marcantes do texto: nomes próprios (sequências com maiúscula) valem mais que palavras soltas"""
+    evitar = {palavra.casefold() for termo in evitar for palavra in termo.split()}
+    pontos = Counter()
+    formas = {}
+    for achado in RE_NOME_PROPRIO.finditer(texto):
+        termo = achado.group(0)
+        chave = termo.casefold()
+        if chave in PALAVRAS_VAZIAS or set(chave.split()) <= evitar:
+            continue
+        # Uma palavra só, em início de frase, tem maiúscula pela posição e não por ser nome
+        if ' ' not in termo and texto[:achado.start()].rstrip()[-1:] in ('', '.', '!', '?', ':'):
+            continue
+        pontos[chave] += 2
+        formas.setdefault(chave, termo)
+    for palavra in RE_PALAVRA.findall(texto):
+        chave = palavra.casefold()
+        if len(chave) < 4 or chave in PALAVRAS_VAZIAS or chave in evitar:
+            continue
+        pontos[chave] += 1
+        formas.setdefault(chave, palavra)
+    
+    # Uma palavra já usada num termo escolhido não aparece de novo ("Mantis" depois de "Mantis Lords")
+    escolhidos = []
+    usadas = set()
+    for chave, _ in pontos.most_common():
+        palavras = set(chave.split())
+        if palavras & usadas:
+            continue
+        escolhidos.append(formas[chave])
+        usadas |= palavras
+        if len(escolhidos) == limite:
+            break
+    return escolhidos
+
+def capitalizar(termo):
+    return termo[:1].upper() + termo[1:]
+
+def resumir_contexto(texto, limite=350):
+    """Primeiras frases do contexto, até o limite de caracteres"""
+    frases = []
+    tamanho = 0
+    for frase in re.split(r'(?<=[.!?])\s+', " ".join(texto.split())):
+        if frases and tamanho + len(frase) > limite:
+            break
+        frases.append(frase)
+        tamanho += len(frase) + 1
+    return truncar(" ".join(frases), limite)
+
+class ValoresModelo(dict):
+    """Valores dos modelos locais; uma chave desconhecida vira texto vazio em vez de erro"""
+    def __missing__(self, chave):
+        return ""
+
+def gerar_metadados_local(contexto, nome_jogo, numero_episodio, modelo=None):
+    """Título e descrição montados a partir do contexto, sem rede: palavras-chave e o modelo do jogo"""
+    modelo = modelo or MODELO_LOCAL_PADRAO
+    episodio = numero_episodio if numero_episodio else 1
+    texto = contexto.split("Contexto Adicional:", 1)[1] if "Contexto Adicional:" in contexto else ""
+    palavras = extrair_palavras_chave(texto, evitar=(nome_jogo,))
+    
+    destaques = [capitalizar(p) for p in palavras[:2]]
+    if destaques:
+        formatos = FORMATOS_DESTAQUE[len(destaques)]
+        destaque = formatos[episodio % len(formatos)].format(a=destaques[0], b=destaques[-1])
+    else:
+        destaque = DESTAQUES_GENERICOS[(episodio - 1) % len(DESTAQUES_GENERICOS)]
+    
+    topicos = [capitalizar(p) for p in palavras] + TOPICOS_GENERICOS[len(palavras):]
+    valores = ValoresModelo(
+        jogo=nome_jogo,
+        jogo_tag=re.sub(r'\W', '', nome_jogo),
+        episodio=episodio,
+        destaque=destaque,
+        palavras=", ".join(palavras),
+        topicos="\n".join(f"• {emoji} {topico}" for emoji, topico in zip(EMOJIS_TOPICOS, topicos)),
+        gancho=GANCHOS[episodio % len(GANCHOS)],
+    )
+    valores['sinopse'] = resumir_contexto(texto) or modelo['sinopse'].format_map(valores)
+    valores['titulo'] = modelo['titulo'].format_map(valores).strip()
+    
+    hashtags = [h.format_map(valores) for h in modelo['hashtags']]
+    hashtags += ["#" + re.sub(r'\W', '', capitalizar(p)) for p in palavras[:2]]
+    descricao = montar_descricao({
+        'descricao': modelo['descricao'].format_map(valores),
+        'hashtags': [h for h in hashtags if len(h) > 1],
+    })
+    titulo = valores['titulo']
+    if validar_metadados(titulo, descricao):
+        titulo, descricao = reparar_metadados(titulo, descricao)
+    return titulo, descricao
+
+class ConfigGeradores:
+    """Gerador de metadados de cada jogo e modelos do gerador local, ajustáveis pelo !gerador"""
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.config = {'provedores': {}, 'modelos': {}}
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.config.update(json.load(f))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao ler {arquivo}, usando o gerador padrão: {e}")
+
+    def provedor(self, nome_jogo):
+        """Gerador do jogo: o definido para ele, senão o padrão do !gerador, senão o do .env"""
+        provedores = self.config['provedores']
+        return provedores.get(nome_jogo.casefold()) or provedores.get('*') or GERADOR_METADADOS
+
+    def definir_provedor(self, nome, nome_jogo=None):
+        chave = nome_jogo.casefold() if nome_jogo else '*'
+        if nome is None:
+            self.config['provedores'].pop(chave, None)
+        else:
+            self.config['provedores'][chave] = nome
+        self.salvar()
+
+    def modelo(self, nome_jogo):
+        """Modelo local do jogo: o padrão com as chaves que o arquivo sobrescreve ('*' vale para todos)"""
+        modelos = self.config['modelos']
+        modelo = dict(MODELO_LOCAL_PADRAO)
+        modelo.update(modelos.get('*') or {})
+        modelo.update(modelos.get(nome_jogo.casefold()) or {})
+        return modelo
+
+    def salvar(self):
+        temporario = f"{self.arquivo}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.config, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.arquivo)
+
+config_geradores = None
+
+def obter_config_geradores():
+    global config_geradores
+    if config_geradores is None:
+        config_geradores = ConfigGeradores(ARQUIVO_GERADORES)
+    return config_geradores
+
+class GeradorMetadados(ABC):
+    """Interface dos geradores: `gerar` devolve (título, descrição) ou None quando não conseguiu gerar"""
+    nome = None
+    descricao = ""
+
+    def disponivel(self):
+        return True
+
+    @abstractmethod
+    async def gerar(self, contexto, nome_jogo, numero_episodio, ao_parcial=None):
+        """(título, descrição) do episódio; `ao_parcial(texto)` recebe o texto parcial de quem transmite"""
+
+class GeradorDeepSeek(GeradorMetadados):
+    nome = "deepseek"
+    descricao = "API do DeepSeek (streaming, JSON validado)"
+
+    def disponivel(self):
+        return bool(DEEPSEEK_API_KEY)
+
+    async def gerar(self, contexto, nome_jogo, numero_episodio, ao_parcial=None):
+        return await gerar_metadados_deepseek(contexto, nome_jogo, numero_episodio, ao_parcial=ao_parcial)
+
+class GeradorLocal(GeradorMetadados):
+    nome = "local"
+    descricao = "palavras-chave do contexto e modelos por jogo, sem rede"
+
+    async def gerar(self, contexto, nome_jogo, numero_episodio, ao_parcial=None):
+        modelo = obter_config_geradores().modelo(nome_jogo)
+        try:
+            return gerar_metadados_local(contexto, nome_jogo, numero_episodio, modelo)
+        except (KeyError, IndexError, ValueError) as e:
+            # Modelo do arquivo com chave inválida: o padrão nunca falha
+            print(f"⚠️ Modelo local de {nome_jogo} inválido ({e}), usando o padrão")
+            return gerar_metadados_local(contexto, nome_jogo, numero_episodio)
+
+GERADORES_METADADOS = {gerador.nome: gerador for gerador in (GeradorDeepSeek(), GeradorLocal())}
+
+async def gerar_metadados(contexto, nome_jogo, numero_episodio, ao_parcial=None, ao_segunda_tentativa=None):
+    """Gera com o gerador configurado para o jogo; o local cobre indisponibilidade, falha, lentidão ou disjuntor aberto.
+    `ao_segunda_tentativa()` avisa que uma segunda chamada começou e o texto parcial pode não ser o que vai valer"""
+    local = GERADORES_METADADOS['local']
+    gerador = GERADORES_METADADOS.get(obter_config_geradores().provedor(nome_jogo), local)
+    if gerador is not local and gerador.disponivel():
+        resultado = await chamar_gerador_protegido(
+            gerador, contexto, nome_jogo, numero_episodio, ao_parcial=ao_parcial, ao_segunda_tentativa=ao_segunda_tentativa
+        )
+        if resultado:
+            return resultado
+        print(f"⚠️ Sem resposta do gerador {gerador.nome} para {nome_jogo} (disjuntor {obter_disjuntor(gerador.nome).estado}), usando o gerador local")
+    return await local.gerar(contexto, nome_jogo, numero_episodio)
+
+# ========== DISJUNTOR DOS GERADORES DE METADADOS ==========
+
+FALHAS_PARA_ABRIR_DISJUNTOR = 3  # Falhas seguidas (ou respostas acima do SLO) que abrem o disjuntor
+TEMPO_DISJUNTOR_ABERTO = 120  # Segundos servindo o gerador local antes de testar o gerador de novo
+AMOSTRAS_MINIMAS_HEDGE = 10  # Latências necessárias antes de confiar no p95 para a segunda tentativa
+LIMITES_HISTOGRAMA = (0.5, 1, 2, 5, 10, 20, 30)  # Segundos; o último balde fica acima de 30 s
+
+class HistogramaLatencia:
+    """Latências em baldes fixos (para o !status) e as mais recentes (para os percentis)"""
+    def __init__(self, limites=LIMITES_HISTOGRAMA, max_recentes=200):
+        self.limites = limites
+        self.baldes = [0] * (len(limites) + 1)
+        self.recentes = deque(maxlen=max_recentes)
+
+    def registrar(self, segundos):
+        self.baldes[bisect.bisect_left(self.limites, segundos)] += 1
+        self.recentes.append(segundos)
+
+    def percentil(self, percentil):
+        return calcular_percentil(self.recentes, percentil)
+
+    def formatar(self):
+        """Baldes com contagem, em uma linha: `≤1s 12 | ≤2s 3 | >30s 1`"""
+        nomes = [f"≤{limite:g}s" for limite in self.limites] + [f">{self.limites[-1]:g}s"]
+        return " | ".join(f"{nome} {quantidade}" for nome, quantidade in zip(nomes, self.baldes) if quantidade)
+
+class DisjuntorGerador:
+    """Disjuntor de um gerador: abre com falhas seguidas ou lentidão e deixa o local responder na hora"""
+    FECHADO, ABERTO, MEIO_ABERTO = "fechado", "aberto", "meio-aberto"
+
+    def __init__(self, nome, falhas_para_abrir=FALHAS_PARA_ABRIR_DISJUNTOR, tempo_aberto=TEMPO_DISJUNTOR_ABERTO, slo=SLO_GERADOR_METADADOS):
+        self.nome = nome
+        self.falhas_para_abrir = falhas_para_abrir
+        self.tempo_aberto = tempo_aberto
+        self.slo = slo
+        self.estado = self.FECHADO
+        self.falhas_seguidas = 0
+        self.aberto_em = 0.0
+        self.aberturas = 0
+        self.recusadas = 0
+        self.segundas_tentativas = 0
+        self.vitorias_segunda = 0
+        self.histograma = HistogramaLatencia()
+        self._teste_em_andamento = False
+
+    def permite(self):
+        """Se a chamada pode ir ao gerador; aberto, só uma chamada de teste depois do tempo de espera"""
+        if self.estado == self.ABERTO:
+            if time.monotonic() - self.aberto_em < self.tempo_aberto:
+                self.recusadas += 1
+                return False
+            self.estado = self.MEIO_ABERTO
+        if self.estado == self.MEIO_ABERTO:
+            if self._teste_em_andamento:
+                self.recusadas += 1
+                return False
+            self._teste_em_andamento = True
+        return True
+
+    def registrar(self, sucesso, duracao):
+        self._teste_em_andamento = False
+        self.histograma.registrar(duracao)
+        if sucesso and duracao <= self.slo:
+            self.falhas_seguidas = 0
+            if self.estado != self.FECHADO:
+                print(f"✅ Disjuntor do gerador {self.nome} fechado")
+                self.estado = self.FECHADO
+            return
+        
+        self.falhas_seguidas += 1
+        if self.estado == self.MEIO_ABERTO or self.falhas_seguidas >= self.falhas_para_abrir:
+            self.estado = self.ABERTO
+            self.aberto_em = time.monotonic()
+            self.aberturas += 1
+            motivo = "lento demais" if sucesso else "falhando"
+            print(f"⚡ Disjuntor do gerador {self.nome} aberto ({motivo}); usando o gerador local por {self.tempo_aberto}s")
+
+    def desistir(self):
+        """A chamada foi cancelada por quem pediu: não conta como sucesso nem como falha"""
+        self._teste_em_andamento = False
+
+    def atraso_segunda_tentativa(self):
+        """p95 das latências recentes, ou None enquanto não há amostras suficientes"""
+        if len(self.histograma.recentes) < AMOSTRAS_MINIMAS_HEDGE:
+            return None
+        return self.histograma.percentil(95)
+
+    def resumo(self):
+        reabre = self.tempo_aberto - (time.monotonic() - self.aberto_em) if self.estado == self.ABERTO else 0
+        return {
+            'estado': self.estado,
+            'falhas_seguidas': self.falhas_seguidas,
+            'aberturas': self.aberturas,
+            'recusadas': self.recusadas,
+            'testa_em_s': round(max(0.0, reabre), 1),
+            'segundas_tentativas': self.segundas_tentativas,
+            'vitorias_segunda': self.vitorias_segunda,
+            'p50_s': round(self.histograma.percentil(50), 2),
+            'p95_s': round(self.histograma.percentil(95), 2),
+            'baldes': dict(zip([f"<={l:g}" for l in LIMITES_HISTOGRAMA] + [f">{LIMITES_HISTOGRAMA[-1]:g}"], self.histograma.baldes)),
+        }
+
+disjuntores_geradores = {}
+
+def obter_disjuntor(nome):
+    disjuntor = disjuntores_geradores.get(nome)
+    if disjuntor is None:
+        disjuntor = disjuntores_geradores[nome] = DisjuntorGerador(nome)
+    return disjuntor
+
+def _resultado_tentativa(tarefa):
+    """Resultado de uma tentativa concluída (None se falhou ou foi cancelada)"""
+    if tarefa.cancelled():
+        return None
+    if tarefa.exception() is not None:
+        print(f"⚠️ Erro no gerador de metadados: {tarefa.exception()}")
+        return None
+    return tarefa.result()
+
+async def chamar_gerador_protegido(gerador, contexto, nome_jogo, numero_episodio, ao_parcial=None, ao_segunda_tentativa=None):
+    """Chama o gerador com disjuntor, limite de tempo e, se ativado, uma segunda tentativa após o p95"""
+    disjuntor = obter_disjuntor(gerador.nome)
+    if not disjuntor.permite():
+        return None
+    
+    inicio = time.monotonic()
+    atraso_segunda = disjuntor.atraso_segunda_tentativa() if HEDGE_GERADOR_METADADOS else None
+    tentativas = [asyncio.ensure_future(gerador.gerar(contexto, nome_jogo, numero_episodio, ao_parcial=ao_parcial))]
+    pendentes = set(tentativas)
+    resultado = None
+    try:
+        while pendentes and resultado is None:
+            decorrido = time.monotonic() - inicio
+            espera = TIMEOUT_GERADOR_METADADOS - decorrido
+            if espera <= 0:
+                print(f"⏰ Gerador {gerador.nome} passou de {TIMEOUT_GERADOR_METADADOS:g}s")
+                break
+            segunda_pendente = atraso_segunda is not None and len(tentativas) == 1
+            if segunda_pendente:
+                espera = min(espera, max(0.0, atraso_segunda - decorrido))
+            
+            prontas, pendentes = await asyncio.wait(pendentes, timeout=espera, return_when=asyncio.FIRST_COMPLETED)
+            for tarefa in prontas:
+                resultado = resultado or _resultado_tentativa(tarefa)
+                if resultado and tarefa is not tentativas[0]:
+                    disjuntor.vitorias_segunda += 1
+            
+            if resultado is None and pendentes and segunda_pendente and time.monotonic() - inicio >= atraso_segunda:
+                # Segunda tentativa sem streaming: a prévia segue mostrando a primeira, que pode perder,
+                # então quem acompanha trava a aprovação até o resultado que vencer
+                disjuntor.segundas_tentativas += 1
+                if ao_segunda_tentativa:
+                    ao_segunda_tentativa()
+                segunda = asyncio.ensure_future(gerador.gerar(contexto, nome_jogo, numero_episodio))
+                tentativas.append(segunda)
+                pendentes.add(segunda)
+    except asyncio.CancelledError:
+        disjuntor.desistir()
+        raise
+    finally:
+        for tarefa in tentativas:
+            if not tarefa.done():
+                tarefa.cancel()
+    
+    disjuntor.registrar(resultado is not None, time.monotonic() - inicio)
+    return resultado
+
+# ========== CARREGAMENTO DO CONTEXTO ==========
+
+LIMITE_BYTES_CONTEXTO = 256 * 1024  # O resto de um arquivo maior nem é lido
+TAMANHO_BLOCO_CONTEXTO = 64 * 1024
+CARACTERES_POR_TOKEN = 4  # Estimativa para texto em português no tokenizador do DeepSeek
+
+class ErroContexto(Exception):
+    """Arquivo de contexto que não dá para usar (binário ou ilegível)"""
+
+def detectar_codificacao(amostra):
+    """Codificação provável dos bytes: BOM, UTF-16 sem BOM, UTF-8 válido, senão cp1252"""
+    if amostra.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig'
+    if amostra.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+    if b'\x00' in amostra:
+        # Texto UTF-16 sem BOM tem um byte nulo a cada dois caracteres ASCII
+        pares, impares = amostra[0::2], amostra[1::2]
+        if impares.count(0) > len(impares) * 0.4 and not pares.count(0):
+            return 'utf-16-le'
+        if pares.count(0) > len(pares) * 0.4 and not impares.count(0):
+            return 'utf-16-be'
+        raise ErroContexto("o arquivo de contexto parece binário")
+    try:
+        amostra.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError as e:
+        # Um caractere cortado no fim da amostra não conta contra o UTF-8
+        if e.start >= len(amostra) - 3 and e.reason == 'unexpected end of data':
+            return 'utf-8'
+        return 'cp1252'
+
+def achatar_json(dados, prefixo=""):
+    """Linhas "chave: valor" de um JSON aninhado; listas de valores simples viram uma linha só"""
+    linhas = []
+    if isinstance(dados, dict):
+        for chave, valor in dados.items():
+            linhas.extend(achatar_json(valor, f"{prefixo}.{chave}" if prefixo else str(chave)))
+    elif isinstance(dados, list):
+        if all(not isinstance(item, (dict, list)) for item in dados):
+            valores = [str(item) for item in dados if item not in (None, "")]
+            if valores:
+                linhas.append(f"{prefixo}: {', '.join(valores)}" if prefixo else ", ".join(valores))
+        else:
+            for i, item in enumerate(dados, 1):
+                linhas.extend(achatar_json(item, f"{prefixo}.{i}" if prefixo else str(i)))
+    elif dados not in (None, ""):
+        linhas.append(f"{prefixo}: {dados}" if prefixo else str(dados))
+    return linhas
+
+def ajustar_ao_orcamento(texto, tokens):
+    """Corta o texto para caber em `tokens`: começo (onde costuma estar o resumo) e um pedaço do fim"""
+    if tokens <= 0:
+        return "", bool(texto)
+    limite = tokens * CARACTERES_POR_TOKEN
+    if len(texto) <= limite:
+        return texto, False
+    inicio = texto[:int(limite * 0.75)]
+    tamanho_fim = int(limite * 0.2)
+    # texto[-0:] seria o texto inteiro: orçamentos pequenos ficam só com o começo
+    fim = texto[-tamanho_fim:] if tamanho_fim > 0 else ""
+    # Cortar em quebras de linha quando houver, para não entregar meia frase
+    if '\n' in inicio:
+        inicio = inicio.rsplit('\n', 1)[0]
+    if '\n' in fim:
+        fim = fim.split('\n', 1)[1]
+    if not fim:
+        return f"{inicio.rstrip()}\n[...]", True
+    return f"{inicio.rstrip()}\n[...]\n{fim.lstrip()}", True
+
+@lru_cache(maxsize=256)
+def _ler_contexto_versao(caminho, mtime_ns, tamanho, orcamento_tokens):
+    """Lê e prepara uma versão do arquivo; a chave inclui mtime e tamanho, então editar o arquivo invalida o cache"""
+    blocos = []
+    lidos = 0
+    with open(caminho, 'rb') as arquivo:
+        while lidos < LIMITE_BYTES_CONTEXTO:
+            bloco = arquivo.read(min(TAMANHO_BLOCO_CONTEXTO, LIMITE_BYTES_CONTEXTO - lidos))
+            if not bloco:
+                break
+            blocos.append(bloco)
+            lidos += len(bloco)
+    dados = b"".join(blocos)
+    cortado_em_bytes = tamanho > lidos
+    
+    codificacao = detectar_codificacao(dados[:TAMANHO_BLOCO_CONTEXTO])
+    # Bytes inválidos depois da amostra (ou um caractere cortado pelo limite) viram � em vez de erro
+    texto = dados.decode(codificacao, errors='replace')
+    texto = texto.replace('\r\n', '\n').strip()
+    
+    formato = 'texto'
+    if caminho.lower().endswith('.json') and not cortado_em_bytes:
+        try:
+            texto = "\n".join(achatar_json(json.loads(texto)))
+            formato = 'json'
+        except ValueError:
+            pass  # JSON inválido: vai como texto mesmo
+    
+    texto, cortado_no_orcamento = ajustar_ao_orcamento(texto, orcamento_tokens)
+    return {
+        'texto': texto,
+        'codificacao': codificacao,
+        'formato': formato,
+        'tamanho': tamanho,
+        'bytes_lidos': lidos,
+        'truncado': cortado_em_bytes or cortado_no_orcamento,
+    }
+
+def ler_contexto_arquivo(caminho, orcamento_tokens=None):
+    """Contexto pronto para o prompt: até o limite de bytes, codificação detectada, JSON achatado e dentro do orçamento"""
+    estado = os.stat(caminho)
+    return _ler_contexto_versao(caminho, estado.st_mtime_ns, estado.st_size, orcamento_tokens or ORCAMENTO_TOKENS_CONTEXTO)
+
+def montar_contexto_video(video_info, nome_jogo, numero_episodio):
+    """Texto de contexto enviado ao gerador: jogo, episódio e o .txt/.json do vídeo (se houver)"""
+    contexto = f"Jogo: {nome_jogo}"
+    if numero_episodio:
+        contexto += f" | Episódio: {numero_episodio}"
+    if video_info.get('contexto'):
+        contexto += f"\nContexto Adicional: {ler_contexto_arquivo(video_info['contexto'])['texto']}"
+    return contexto
+
+async def carregar_contexto_video(video_info, nome_jogo, numero_episodio):
+    """montar_contexto_video fora do event loop (a primeira leitura de um arquivo vai ao disco)"""
+    return await executar_em_thread(montar_contexto_video, video_info, nome_jogo, numero_episodio)
+
+# ========== GERAÇÃO DE METADADOS EM LOTE ==========
+
+def chave_metadados(nome_jogo, numero_episodio, contexto):
+    """Identifica um pedido de metadados: o mesmo jogo, episódio e contexto reaproveitam o resultado"""
+    return hashlib.sha256(json.dumps([nome_jogo, numero_episodio, contexto], ensure_ascii=False).encode('utf-8')).hexdigest()[:32]
+
+class CacheMetadados:
+    """Títulos e descrições gerados antes do processamento (pelo !lote), persistidos em JSON"""
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.entradas = {}
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.entradas = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao ler {arquivo}, iniciando cache vazio: {e}")
+        # Descartar gerações antigas (vídeos que provavelmente já foram enviados)
+        limite = (datetime.now() - timedelta(days=30)).isoformat(timespec='seconds')
+        self.entradas = {chave: entrada for chave, entrada in self.entradas.items() if entrada.get('data', '') >= limite}
+
+    def obter(self, chave):
+        entrada = self.entradas.get(chave)
+        return (entrada['titulo'], entrada['descricao']) if entrada else None
+
+    def guardar(self, chave, titulo, descricao, jogo=None, episodio=None):
+        self.entradas[chave] = {
+            'titulo': titulo,
+            'descricao': descricao,
+            'jogo': jogo,
+            'episodio': episodio,
+            'data': datetime.now().isoformat(timespec='seconds'),
+        }
+
+    def descartar(self, chave):
+        if self.entradas.pop(chave, None):
+            self.salvar()
+
+    def salvar(self):
+        temporario = f"{self.arquivo}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.entradas, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.arquivo)
+
+cache_metadados = None
+
+def obter_cache_metadados():
+    global cache_metadados
+    if cache_metadados is None:
+        cache_metadados = CacheMetadados(ARQUIVO_METADADOS)
+    return cache_metadados
+
+def montar_prompt_lote(nome_jogo, itens):
+    """Um único prompt com as regras uma vez só e o contexto de cada episódio"""
+    blocos = "\n\n".join(f"### Episódio {episodio}\n{contexto}" for episodio, contexto in itens)
+    return f"""GERAR METADADOS OTIMIZADOS PARA {len(itens)} EPISÓDIOS DE GAMEPLAY DO JOGO "{nome_jogo}".
+
+REGRAS PARA CADA EPISÓDIO:
+- Título: "🎮 {nome_jogo} - Episódio [X]: [Título Criativo 3-5 palavras]", misterioso e sem spoilers
+- Descrição, nesta estrutura:
+🎮 [Título Completo]
+
+📖 Sinopse
+[4-6 linhas de contexto e atmosfera, sem spoilers]
+
+🎯 Neste Episódio:
+• [5 itens, cada um com um emoji relevante]
+
+💡 [Frase de impacto em 1 linha]
+- Hashtags: 6-8, incluindo #Gameplay, no campo "hashtags" (não na descrição)
+- Limites do YouTube: título com até {LIMITE_TITULO_YOUTUBE} caracteres, sem os caracteres < e >
+- Cada episódio tem título e sinopse próprios, baseados no seu contexto
+
+EPISÓDIOS:
+
+{blocos}
+
+FORMATO DE RESPOSTA: apenas um objeto JSON, sem texto fora dele:
+{{"episodios": [{{"episodio": <número>, "titulo": "<título>", "descricao": "<descrição>", "hashtags": ["#Gameplay", "..."]}}]}}
+"""
+
+def interpretar_resposta_lote(dados, episodios):
+    """Títulos e descrições por episódio; itens ausentes ou malformados ficam de fora, os fora dos limites são ajustados"""
+    itens = dados.get('episodios') if isinstance(dados, dict) else dados
+    if not isinstance(itens, list):
+        return {}
+    
+    resultado = {}
+    for posicao, item in enumerate(itens):
+        try:
+            titulo, descricao = interpretar_metadados(item)
+        except ValueError:
+            continue
+        try:
+            episodio = int(item.get('episodio', item.get('episode')))
+        except (TypeError, ValueError):
+            # Sem número: confiar na ordem em que os episódios foram pedidos
+            episodio = episodios[posicao] if posicao < len(episodios) else None
+        if episodio in episodios and episodio not in resultado:
+            if validar_metadados(titulo, descricao):
+                # Sem re-pergunta no lote: um item fora dos limites não justifica repetir o pedido inteiro
+                estatisticas_deepseek['reparadas'] += 1
+                titulo, descricao = reparar_metadados(titulo, descricao)
+            resultado[episodio] = (titulo, descricao)
+    return resultado
+
+async def gerar_metadados_lote(nome_jogo, itens):
+    """Gera metadados de vários episódios de um jogo numa só requisição; devolve {episódio: (título, descrição)}"""
+    episodios = [episodio for episodio, _ in itens]
+    try:
+        resposta = await chamar_deepseek(montar_prompt_lote(nome_jogo, itens), max_tokens=min(8000, 900 * len(itens)), formato_json=True)
+        gerados = interpretar_resposta_lote(extrair_json_resposta(resposta), episodios)
+    except Exception as e:
+        print(f"⚠️ Lote de {nome_jogo} falhou ({e}); os episódios serão gerados um a um")
+        gerados = {}
+    
+    estatisticas_deepseek['lotes'] += 1
+    estatisticas_deepseek['episodios_em_lote'] += len(gerados)
+    return gerados
+
+async def preparar_lote_metadados(jogo=None):
+    """Gera em lote os metadados dos vídeos da pasta que ainda não têm; devolve um resumo por jogo"""
+    cache = obter_cache_metadados()
+    pendentes = {}
+    sem_numero = []
+    for nome_base, video_info in listar_arquivos_vinculados().items():
+        nome_jogo, numero_episodio, _ = analisar_nome_arquivo(video_info['video'])
+        if jogo and nome_jogo.casefold() != jogo.casefold():
+            continue
+        if obter_config_geradores().provedor(nome_jogo) != 'deepseek' or not DEEPSEEK_API_KEY:
+            # O gerador local é instantâneo; não há o que adiantar em lote
+            continue
+        if numero_episodio is None:
+            # O número inferido depende da fila no momento do processamento; fica para o fluxo normal
+            sem_numero.append(nome_base)
+            continue
+        try:
+            contexto = await carregar_contexto_video(video_info, nome_jogo, numero_episodio)
+        except (OSError, ErroContexto) as e:
+            print(f"⚠️ Contexto de {nome_base} ignorado no lote: {e}")
+            continue
+        chave = chave_metadados(nome_jogo, numero_episodio, contexto)
+        itens = pendentes.setdefault(nome_jogo, [])
+        # Dois arquivos com o mesmo episódio (partes) não podem ser distinguidos na resposta do lote
+        if cache.obter(chave) is None and all(episodio != numero_episodio for episodio, _, _ in itens):
+            itens.append((numero_episodio, contexto, chave))
+    
+    resumo = {}
+    for nome_jogo, itens in pendentes.items():
+        if not itens:
+            continue
+        itens.sort()
+        gerados_jogo = 0
+        for inicio in range(0, len(itens), TAMANHO_LOTE_DEEPSEEK):
+            lote = itens[inicio:inicio + TAMANHO_LOTE_DEEPSEEK]
+            gerados = await gerar_metadados_lote(nome_jogo, [(episodio, contexto) for episodio, contexto, _ in lote])
+            for episodio, contexto, chave in lote:
+                if episodio in gerados:
+                    cache.guardar(chave, *gerados[episodio], jogo=nome_jogo, episodio=episodio)
+            gerados_jogo += len(gerados)
+        resumo[nome_jogo] = {'pedidos': len(itens), 'gerados': gerados_jogo}
+    
+    if resumo:
+        await executar_em_thread(cache.salvar)
+    return resumo, sem_numero
+
+async def atualizar_status_upload(ctx, message_id, etapa, progresso=0, total=100, detalhes=""):
+    """Atualiza o status do upload em tempo real"""
+    global ultima_mensagem_status
+    
+    try:
+        # Calcular porcentagem
+        porcentagem = (progresso / total) * 100 if total > 0 else 0
+        
+        # Criar barra de progresso
+        barra_length = 20
+        blocos_preenchidos = int(barra_length * porcentagem / 100)
+        barra = "█" * blocos_preenchidos + "░" * (barra_length - blocos_preenchidos)
+        
+        # Definir cor baseado no progresso
+        cor = 0x00ff00 if porcentagem == 100 else 0x0099ff if porcentagem >= 50 else 0xff9900 if porcentagem >= 25 else 0xff0000
+        
+        # Painel já conhecido (a mensagem da tarefa); só busca no Discord se for uma mensagem nova para o bot
+        painel = paineis_embed.get(message_id)
+        if painel is None:
+            try:
+                painel = obter_painel(await ctx.channel.fetch_message(message_id))
+            except discord.NotFound:
+                print("Mensagem de status não encontrada, criando nova...")
+                painel = PainelEmbed()
+                _guardar_painel(message_id, painel)
+        
+        if await painel.atualizar(
+            ctx, MODELO_STATUS_UPLOAD,
+            descricao=f"**Etapa:** {etapa}\n{detalhes}",
+            cor=cor,
+            progresso=f"```[{barra}] {porcentagem:.1f}%```\n{progresso}/{total}"
+        ):
+            ultima_mensagem_status = painel.mensagem
+        
+    except Exception as e:
+        print(f"Erro ao atualizar status: {e}")
+
+async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao, thumbnail_path=None, agendar=None, perfil=None, vaga=0, tarefa=None, relator=None):
+    """Faz upload real para o YouTube usando a API com status em tempo real (relator: para onde vão as etapas e a cota)"""
+    global ultima_mensagem_status
+    
+    perfil = perfil or obter_perfil_padrao()
+    relator = relator or RelatorDiscord(ctx, status_message.id, tarefa)
+    request = None
+    media = None
+    
+    try:
+        # Etapa 1: Autenticação
+        await relator.etapa("🔐 Autenticando com YouTube", 10, 100, "Conectando à API do YouTube...")
+        
+        youtube = await obter_cliente_youtube(perfil, vaga)
+        if not youtube:
+            await relator.etapa("❌ Falha na autenticação", 0, 100, "Não foi possível autenticar com o YouTube")
+            return {"status": "erro", "mensagem": "Falha na autenticação do YouTube"}
+        
+        # Etapa 2: Preparando upload
+        await relator.etapa("📦 Preparando upload", 25, 100, "Configurando metadados do vídeo...")
+        
+        # Edições manuais não passam pela validação do DeepSeek; o YouTube recusaria o vídeo inteiro
+        problemas = validar_metadados(titulo, descricao)
+        if problemas:
+            print(f"⚠️ Metadados ajustados aos limites do YouTube: {'; '.join(problemas)}")
+            titulo, descricao = reparar_metadados(titulo, descricao)
+        
+        # Configurações do vídeo
+        body = {
+            'snippet': {
                 'title': titulo,
                 'description': descricao,
-                'tags': [],  # Você pode adicionar tags aqui
+                'tags': tags_da_descricao(descricao),
                 'categoryId': '22'  # Categoria "People & Blogs"
             },
             'status': {
@@ -1442,11 +4564,13 @@ async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao
             body['status']['privacyStatus'] = 'public'
         
         # Etapa 3: Iniciando upload
-        await atualizar_status_upload(ctx, status_message.id, "⏫ Iniciando upload do vídeo", 40, 100, "Enviando arquivo de vídeo...")
+        await relator.etapa("⏫ Iniciando upload do vídeo", 40, 100, "Enviando arquivo de vídeo...")
         
         # Faz o upload do vídeo com monitoramento de progresso
         file_size = os.path.getsize(video_path)
-        media = MediaFileUpload(video_path, chunksize=1024*1024, resumable=True)  # 1MB chunks
+        limitador = obter_limitador_banda()
+        tamanho_chunk = limitador.tamanho_chunk()
+        media = MediaVideoMapeado(video_path, chunksize=tamanho_chunk, usar_mmap=LEITOR_UPLOAD == 'mmap')
         
         request = youtube.videos().insert(
             part=','.join(body.keys()),
@@ -1456,12 +4580,43 @@ async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao
         
         # Etapa 4: Upload em progresso - MELHORIA: Monitoramento real do progresso
         response = None
+        if tarefa is not None and tarefa.sessao_upload:
+            response = await retomar_sessao_resumivel(request, tarefa.sessao_upload, file_size)
+            if request.resumable_uri:
+                print(f"♻️ Retomando upload de {titulo} a partir de {request.resumable_progress}/{file_size} bytes")
         last_update = datetime.now()
         chunk_count = 0
+        progresso_estimado = 40
+        inicio_envio = time.monotonic()
+        cota_insert_registrada = False
         
         while response is None:
-            status, response = request.next_chunk()
+            # Pausa e cancelamento pelo dono valem entre um chunk e outro
+            if controle_uploads.pausado and not controle_uploads.cancelada(tarefa):
+                await relator.etapa(
+                    "⏸️ Upload pausado", progresso_estimado, 100,
+                    f"Parado após {chunk_count} chunk(s); continua do mesmo ponto com !retomar"
+                )
+                pausa = time.monotonic()
+                await controle_uploads.aguardar_liberacao(tarefa)
+                inicio_envio += time.monotonic() - pausa  # A pausa não entra na velocidade do envio
+                await relator.etapa("📤 Upload em andamento", progresso_estimado, 100, "Upload retomado")
+            await controle_uploads.aguardar_liberacao(tarefa)
+            
+            # Respeitar os limites de banda antes de cada chunk
+            await limitador.aguardar((perfil.nome, vaga), min(tamanho_chunk, file_size - request.resumable_progress))
+            
+            # O YouTube cobra o videos.insert quando a sessão é aberta, mesmo que o envio falhe depois
+            if not request.resumable_uri and not cota_insert_registrada:
+                relator.registrar_cota(perfil.projeto, 'videos.insert')
+                cota_insert_registrada = True
+            
+            # O envio do chunk bloqueia; em thread, as vagas de outros perfis enviam em paralelo
+            status, response = await executar_com_recuo(request.next_chunk, "envio do vídeo")
             chunk_count += 1
+            if tarefa is not None:
+                # Ponto de retomada que o checkpoint salva se o bot for desligado
+                tarefa.sessao_upload = {'uri': request.resumable_uri, 'enviado': request.resumable_progress, 'tamanho': file_size}
             
             if status:
                 # Progresso baseado no número de chunks processados (estimativa)
@@ -1469,8 +4624,7 @@ async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao
                 
                 # Atualizar a cada 5 chunks ou a cada 10 segundos
                 if chunk_count % 5 == 0 or (datetime.now() - last_update).seconds >= 10:
-                    await atualizar_status_upload(
-                        ctx, status_message.id, 
+                    await relator.etapa(
                         "📤 Upload em andamento", 
                         progresso_estimado, 100, 
                         f"Processando... ({chunk_count} chunks enviados)"
@@ -1480,24 +4634,26 @@ async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao
                 # Se não há status, ainda estamos no início do upload
                 if chunk_count % 10 == 0:
                     progresso_estimado = min(40 + (chunk_count * 1), 85)
-                    await atualizar_status_upload(
-                        ctx, status_message.id,
+                    await relator.etapa(
                         "📤 Preparando upload",
                         progresso_estimado, 100,
                         "Inicializando transmissão de dados..."
                     )
         
         video_id = response['id']
+        segundos_envio = time.monotonic() - inicio_envio
+        if tarefa is not None:
+            tarefa.video_enviado = video_id
+            tarefa.sessao_upload = None
         print(f"Vídeo enviado com ID: {video_id}")
         
         # Etapa 5: Processamento no YouTube
-        await atualizar_status_upload(ctx, status_message.id, "🔧 Processamento no YouTube", 92, 100, "YouTube está processando o vídeo...")
+        await relator.etapa("🔧 Processamento no YouTube", 92, 100, "YouTube está processando o vídeo...")
         
         # Simular progresso do processamento
         for i in range(3):
             await asyncio.sleep(1)
-            await atualizar_status_upload(
-                ctx, status_message.id,
+            await relator.etapa(
                 "🔧 Processamento no YouTube",
                 92 + (i * 2), 100,
                 f"Processando vídeo... ({i+1}/3)"
@@ -1506,25 +4662,30 @@ async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao
         # Upload da thumbnail se existir - COM TRATAMENTO DE ERRO MELHORADO
         if thumbnail_path and os.path.exists(thumbnail_path):
             try:
-                await atualizar_status_upload(ctx, status_message.id, "🖼️ Enviando thumbnail", 98, 100, "Enviando imagem de thumbnail...")
+                await relator.etapa("🖼️ Enviando thumbnail", 98, 100, "Enviando imagem de thumbnail...")
                 
                 # Aguardar um pouco para garantir que o vídeo esteja processado
                 await asyncio.sleep(5)
                 
-                youtube.thumbnails().set(
+                relator.registrar_cota(perfil.projeto, 'thumbnails.set')
+                await executar_com_recuo(youtube.thumbnails().set(
                     videoId=video_id,
                     media_body=MediaFileUpload(thumbnail_path)
-                ).execute()
+                ).execute, "thumbnail")
                 print("Thumbnail definida com sucesso.")
             except HttpError as e:
-                if e.resp.status == 404:
+                if erro_de_cota(e):
+                    relator.marcar_cota_esgotada(perfil.projeto)
+                    print(f"Thumbnail não definida: cota do YouTube esgotada")
+                elif e.resp.status == 404:
                     print(f"Erro 404 ao definir thumbnail: Vídeo ainda não está disponível. Tentando novamente em 10 segundos...")
                     await asyncio.sleep(10)
                     try:
-                        youtube.thumbnails().set(
+                        relator.registrar_cota(perfil.projeto, 'thumbnails.set')
+                        await executar_em_thread(youtube.thumbnails().set(
                             videoId=video_id,
                             media_body=MediaFileUpload(thumbnail_path)
-                        ).execute()
+                        ).execute)
                         print("Thumbnail definida com sucesso na segunda tentativa.")
                     except HttpError as e2:
                         print(f"Erro ao definir thumbnail na segunda tentativa: {e2}")
@@ -1534,18 +4695,51 @@ async def upload_youtube_real(ctx, status_message, video_path, titulo, descricao
                 print(f"Erro ao definir thumbnail: {e}")
         
         # Etapa 6: Concluído
-        await atualizar_status_upload(ctx, status_message.id, "✅ Upload concluído!", 100, 100, "Vídeo publicado com sucesso!")
+        await relator.etapa("✅ Upload concluído!", 100, 100, "Vídeo publicado com sucesso!")
         
         return {
             "status": "sucesso",
             "video_id": video_id,
-            "url": f"https://youtube.com/watch?v={video_id}"
+            "url": f"https://youtube.com/watch?v={video_id}",
+            "bytes": file_size,
+            "segundos_envio": segundos_envio
         }
+    
+    except UploadCancelado:
+        encerrada = await encerrar_sessao_resumivel(request)
+        detalhe = "a sessão de upload no YouTube foi encerrada" if encerrada else "nenhuma sessão de upload aberta no YouTube"
+        await relator.etapa("🛑 Upload cancelado", 0, 100, f"Cancelado pelo dono; {detalhe}")
+        return {"status": "cancelado", "mensagem": f"Cancelado pelo dono; {detalhe}."}
+    
+    except UploadInterrompido:
+        enviado = request.resumable_progress if request is not None else 0
+        await relator.etapa(
+            "🔌 Upload interrompido", progresso_estimado, 100,
+            f"Bot desligando; {enviado}/{file_size} bytes já estão no YouTube e o envio continua após reiniciar"
+        )
+        return {"status": "interrompido", "mensagem": "Interrompido pelo desligamento do bot."}
+    
+    except UploadReservaPerdida:
+        # Sem DELETE e sem eventos: a sessão e o painel agora são do trabalhador que assumiu a reserva
+        return {"status": "reserva_perdida", "mensagem": "Reserva do broker assumida por outro trabalhador."}
+        
+    except HttpError as e:
+        if erro_de_cota(e):
+            relator.marcar_cota_esgotada(perfil.projeto)
+            await relator.etapa("⛽ Cota do YouTube esgotada", 0, 100, "O upload será retomado após o reset diário da cota")
+            return {"status": "erro", "mensagem": "Cota diária do YouTube esgotada", "cota_esgotada": True}
+        print(f"Erro no upload do YouTube: {e}")
+        await relator.etapa("❌ Erro no upload", 0, 100, f"Erro: {str(e)}")
+        return {"status": "erro", "mensagem": str(e)}
         
     except Exception as e:
         print(f"Erro no upload do YouTube: {e}")
-        await atualizar_status_upload(ctx, status_message.id, "❌ Erro no upload", 0, 100, f"Erro: {str(e)}")
+        await relator.etapa("❌ Erro no upload", 0, 100, f"Erro: {str(e)}")
         return {"status": "erro", "mensagem": str(e)}
+    
+    finally:
+        if media is not None:
+            media.fechar()
 
 def gerar_opcoes_agendamento():
     """Gera opções de agendamento para os próximos 24 dias (limite do Discord: 25 opções)"""
@@ -1588,22 +4782,1118 @@ def gerar_opcoes_agendamento():
             # Segunda semana com indicação
             label = f"🗓️ Próxima {data.strftime('%A')} - {data_meio_dia.strftime('%d/%m')}"
         else:
-            # Datas mais distantes
-            semanas = (i + 6) // 7  # Calcula o número de semanas
-            label = f"🗓️ Em {semanas} semana(s) - {data_meio_dia.strftime('%d/%m')}"
+            # Datas mais distantes
+            semanas = (i + 6) // 7  # Calcula o número de semanas
+            label = f"🗓️ Em {semanas} semana(s) - {data_meio_dia.strftime('%d/%m')}"
+        
+        opcoes.append(discord.SelectOption(
+            label=label,
+            description=data_meio_dia.strftime("%d/%m/%Y às %H:%M"),
+            value=data_meio_dia.strftime("%Y-%m-%dT%H:%M:%S"),
+            emoji="📅" if i <= 7 else "🗓️"
+        ))
+        
+        # Parar quando atingir 25 opções (já incluímos a publicação imediata)
+        if len(opcoes) >= 25:
+            break
+    
+    return opcoes
+
+# ========== CONTROLE DE ESPAÇO EM DISCO ==========
+
+GB = 1024**3
+INTERVALO_VERIFICACAO_ESPACO = 64 * 1024**2  # Bytes baixados entre conferências do disco quando o tamanho não foi anunciado
+
+def bytes_liberados_pela_fila():
+    """Bytes que a fila ainda vai apagar da pasta (os arquivos de cada tarefa somem após o upload)"""
+    indice = obter_indice_videos()
+    caminhos = {tarefa.video_info.get(tipo) for tarefa in fila_ativa.values() for tipo in ('video', 'contexto', 'thumb', 'legendas')}
+    caminhos.discard(None)
+    return sum(indice.tamanho_arquivo(caminho) for caminho in caminhos)
+
+class ReservaEspaco:
+    """Bytes anunciados de uma ingestão e quanto deles já está no disco ou no índice da pasta"""
+    def __init__(self, anunciado):
+        self.anunciado = anunciado
+        self.gravados = 0  # Arquivos já baixados do pacote (em .parcial ou publicados)
+        self.recebendo = 0  # Bytes do arquivo em download
+        self.publicados = 0  # Bytes que já entraram no índice da pasta
+
+    def receber(self, recebidos):
+        self.recebendo = recebidos
+
+    def concluir_arquivo(self, tamanho):
+        self.gravados += tamanho
+        self.recebendo = 0
+
+    def publicar(self, tamanho):
+        self.publicados += tamanho
+
+    def a_gravar(self):
+        """Parte do anunciado que ainda não chegou ao disco (o espaço livre já desconta o resto)"""
+        return max(0, self.anunciado - self.gravados - self.recebendo)
+
+    def fora_do_indice(self):
+        """Bytes do pacote que a pasta vai ganhar e o índice ainda não conta"""
+        return max(self.anunciado, self.gravados + self.recebendo) - self.publicados
+
+class ControleEspacoDisco:
+    """Admissão da ingestão pelo disco: tamanho da pasta (pelo índice), espaço livre e o que a fila vai liberar"""
+    def __init__(self):
+        self.esperas = 0
+        self.recusadas = 0
+        self._reservas = []  # ReservaEspaco das ingestões em andamento
+        self._aguardando = []
+
+    @property
+    def reservado(self):
+        """Bytes anunciados pelas ingestões em andamento que ainda não foram gravados"""
+        return sum(reserva.a_gravar() for reserva in self._reservas)
+
+    def situacao(self):
+        indice = obter_indice_videos()
+        indice.atualizar()
+        uso = shutil.disk_usage(PASTA_VIDEOS if os.path.isdir(PASTA_VIDEOS) else '.')
+        liberar = bytes_liberados_pela_fila()
+        return {
+            'pasta': indice.bytes_total,
+            'livre': uso.free,
+            'total': uso.total,
+            'reservado': self.reservado,
+            'chegando': sum(reserva.fora_do_indice() for reserva in self._reservas),
+            'liberar': liberar,
+            'livre_projetado': uso.free - self.reservado + liberar,
+        }
+
+    def resumo(self):
+        situacao = self.situacao()
+        return {**situacao, 'esperas': self.esperas, 'recusadas': self.recusadas, 'aguardando': len(self._aguardando)}
+
+    def avaliar(self, tamanho):
+        """('aceitar' | 'desacelerar' | 'aguardar' | 'recusar', motivo) para uma ingestão de `tamanho` bytes.
+        'desacelerar' espera a fila liberar espaço e segue mesmo assim; 'aguardar' só segue se o espaço voltar"""
+        s = self.situacao()
+        livre_depois = s['livre'] - s['reservado'] - tamanho
+        pasta_depois = s['pasta'] + s['chegando'] + tamanho
+        minimo = ESPACO_LIVRE_MINIMO_GB * GB
+        
+        if LIMITE_PASTA_VIDEOS_GB and pasta_depois > LIMITE_PASTA_VIDEOS_GB * GB:
+            if pasta_depois - s['liberar'] > LIMITE_PASTA_VIDEOS_GB * GB:
+                return 'recusar', (f"a pasta de vídeos ficaria com {pasta_depois / GB:.1f} GB "
+                                   f"(limite: {LIMITE_PASTA_VIDEOS_GB:g} GB), mesmo depois da fila liberar {s['liberar'] / GB:.1f} GB")
+            return 'aguardar', f"a pasta de vídeos passaria do limite de {LIMITE_PASTA_VIDEOS_GB:g} GB"
+        if livre_depois < minimo:
+            if livre_depois + s['liberar'] < minimo:
+                return 'recusar', (f"sobrariam {max(livre_depois, 0) / GB:.1f} GB livres no disco "
+                                   f"(mínimo: {ESPACO_LIVRE_MINIMO_GB:g} GB), mesmo depois da fila liberar {s['liberar'] / GB:.1f} GB")
+            return 'aguardar', f"sobrariam {max(livre_depois, 0) / GB:.1f} GB livres no disco (mínimo: {ESPACO_LIVRE_MINIMO_GB:g} GB)"
+        if livre_depois < ESPACO_LIVRE_ALERTA_GB * GB and s['liberar']:
+            return 'desacelerar', f"sobrariam {livre_depois / GB:.1f} GB livres no disco (alerta: {ESPACO_LIVRE_ALERTA_GB:g} GB)"
+        return 'aceitar', None
+
+    async def admitir(self, tamanho, ao_aguardar=None):
+        """Reserva `tamanho` bytes para uma ingestão, esperando a fila liberar espaço se preciso.
+        Devolve a ReservaEspaco, que a ingestão atualiza conforme grava. Levanta ErroIngestao se o espaço não couber (ou não voltar em ESPERA_ADMISSAO)"""
+        prazo = time.monotonic() + ESPERA_ADMISSAO
+        avisado = False
+        while True:
+            decisao, motivo = self.avaliar(tamanho)
+            restante = prazo - time.monotonic()
+            if decisao == 'aceitar' or (decisao == 'desacelerar' and restante <= 0):
+                break
+            if decisao == 'recusar' or restante <= 0:
+                self.recusadas += 1
+                print(f"💽 Ingestão recusada por espaço em disco: {motivo}")
+                raise ErroIngestao(f"sem espaço em disco: {motivo}")
+            
+            if not avisado:
+                avisado = True
+                self.esperas += 1
+                print(f"💽 Ingestão aguardando a fila liberar espaço: {motivo}")
+                if ao_aguardar:
+                    await ao_aguardar(motivo)
+            # Acorda quando a fila apagar arquivos; a releitura periódica cobre o que for apagado à mão
+            futuro = asyncio.get_running_loop().create_future()
+            self._aguardando.append(futuro)
+            try:
+                await asyncio.wait_for(futuro, timeout=min(restante, 60))
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if futuro in self._aguardando:
+                    self._aguardando.remove(futuro)
+        
+        reserva = ReservaEspaco(tamanho)
+        self._reservas.append(reserva)
+        return reserva
+
+    def liberar_reserva(self, reserva):
+        if reserva in self._reservas:
+            self._reservas.remove(reserva)
+        self.espaco_liberado()
+
+    def verificar_transferencia(self):
+        """Durante o download (tamanho não anunciado ou maior que o anunciado): para antes de encher o disco"""
+        livre = shutil.disk_usage(PASTA_VIDEOS if os.path.isdir(PASTA_VIDEOS) else '.').free
+        if livre < ESPACO_LIVRE_MINIMO_GB * GB:
+            self.recusadas += 1
+            raise ErroIngestao(f"sem espaço em disco: restam {livre / GB:.1f} GB livres (mínimo: {ESPACO_LIVRE_MINIMO_GB:g} GB)")
+
+    def espaco_liberado(self):
+        """Chamado quando arquivos saem da pasta: reavalia as ingestões em espera"""
+        aguardando, self._aguardando = self._aguardando, []
+        for futuro in aguardando:
+            if not futuro.done():
+                futuro.set_result(None)
+
+controle_espaco = ControleEspacoDisco()
+
+# ========== INGESTÃO DE ARQUIVOS EM STREAMING ==========
+
+class ErroIngestao(Exception):
+    """Arquivo recusado ou transferência interrompida durante a ingestão"""
+
+sessao_http = None  # aiohttp.ClientSession compartilhada (criada sob demanda dentro do loop)
+
+async def obter_sessao_http():
+    """Devolve a sessão HTTP assíncrona do bot, criando-a se necessário"""
+    global sessao_http
+    if sessao_http is None or sessao_http.closed:
+        sessao_http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, sock_connect=30, sock_read=120))
+    return sessao_http
+
+async def executar_em_thread(funcao, *args):
+    """Executa uma função bloqueante no executor padrão, sem segurar o event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, funcao, *args)
+
+def sanitizar_nome_base(nome):
+    """Remove separadores de pasta e caracteres inválidos no Windows de um nome de arquivo"""
+    nome = re.sub(r'[<>:"/\\|?*\x00-\x1f]', '', os.path.basename(nome)).strip(' .')
+    return nome or f"video_{int(time.time())}"
+
+def verificar_assinatura(extensao, cabecalho):
+    """Confere os primeiros bytes do arquivo com o formato esperado pela extensão"""
+    if extensao in ('.mp4', '.mov'):
+        return cabecalho[4:8] in (b'ftyp', b'moov', b'mdat', b'wide', b'free', b'skip', b'pnot')
+    if extensao == '.mkv':
+        return cabecalho.startswith(b'\x1a\x45\xdf\xa3')
+    if extensao == '.avi':
+        return cabecalho.startswith(b'RIFF') and cabecalho[8:12] == b'AVI '
+    if extensao in ('.jpg', '.jpeg'):
+        return cabecalho.startswith(b'\xff\xd8\xff')
+    if extensao == '.png':
+        return cabecalho.startswith(b'\x89PNG\r\n\x1a\n')
+    if extensao == '.json':
+        texto = cabecalho.lstrip(b'\xef\xbb\xbf \t\r\n')
+        return b'\x00' not in cabecalho and texto[:1] in (b'{', b'[', b'')
+    # .txt e .srt: texto puro, sem bytes nulos
+    return b'\x00' not in cabecalho
+
+async def baixar_em_streaming(url, destino, extensao, limite, ao_progredir=None):
+    """Baixa uma URL para `destino` em blocos, validando tamanho e formato durante a transferência"""
+    sessao = await obter_sessao_http()
+    recebidos = 0
+    cabecalho = b""
+    assinatura_ok = False
+    
+    async with sessao.get(url) as resposta:
+        if resposta.status != 200:
+            raise ErroIngestao(f"download falhou com HTTP {resposta.status}")
+        total = resposta.content_length
+        if total and total > limite:
+            raise ErroIngestao(f"arquivo tem {total / 1024**2:.1f} MB (limite: {limite / 1024**2:.1f} MB)")
+        
+        with open(destino, 'wb') as arquivo:
+            async for bloco in resposta.content.iter_chunked(TAMANHO_CHUNK_INGESTAO):
+                recebidos += len(bloco)
+                if recebidos > limite:
+                    raise ErroIngestao(f"arquivo ultrapassou o limite de {limite / 1024**2:.1f} MB")
+                
+                # Validar o formato assim que houver bytes suficientes, antes de baixar o resto
+                if not assinatura_ok and len(cabecalho) < 64:
+                    cabecalho += bloco[:64 - len(cabecalho)]
+                    if len(cabecalho) >= 16:
+                        if not verificar_assinatura(extensao, cabecalho):
+                            raise ErroIngestao(f"conteúdo não corresponde a um arquivo {extensao}")
+                        assinatura_ok = True
+                
+                await executar_em_thread(arquivo.write, bloco)
+                if ao_progredir:
+                    await ao_progredir(recebidos, total)
+    
+    if recebidos == 0:
+        raise ErroIngestao("arquivo vazio")
+    if not assinatura_ok and not verificar_assinatura(extensao, cabecalho):
+        raise ErroIngestao(f"conteúdo não corresponde a um arquivo {extensao}")
+    return recebidos
+
+destinos_em_ingestao = set()  # Caminhos finais já prometidos a ingestões em andamento
+
+def destino_ocupado(destino):
+    """O caminho já existe, pertence a uma tarefa da fila ou está sendo recebido por outra ingestão"""
+    if os.path.exists(destino) or destino in destinos_em_ingestao:
+        return True
+    return any(destino in tarefa.video_info.values() for tarefa in fila_ativa.values())
+
+def nome_base_ocupado(nome_base):
+    """Já existe um pacote (na pasta, na fila ou chegando) com esse nome base"""
+    indice = obter_indice_videos()
+    indice.atualizar()
+    if nome_base in indice.pacotes():
+        return True
+    if any(tarefa.video_info.get('nome_base') == nome_base for tarefa in fila_ativa.values()):
+        return True
+    return any(os.path.splitext(os.path.basename(destino))[0] == nome_base for destino in destinos_em_ingestao)
+
+async def ingerir_pacote(itens, nome_base, ao_progredir=None, ao_aguardar=None, renomear=False):
+    """Baixa vários arquivos de um mesmo vídeo e só os publica na pasta quando todos estiverem válidos
+    
+    `itens` é uma lista de (url, nome_arquivo, tamanho_anunciado). Devolve {tipo: caminho}.
+    Nunca sobrescreve: com `renomear`, um pacote novo cujo nome já existe ganha um sufixo " (2)", " (3)"...;
+    sem ele (arquivo que falta num pacote existente), um destino já ocupado recusa o arquivo.
+    Antes de baixar, o controle de espaço em disco reserva os tamanhos anunciados (podendo esperar a fila
+    liberar espaço, com `ao_aguardar(motivo)` avisando quem pediu, ou recusar o pacote).
+    """
+    nome_base = sanitizar_nome_base(nome_base)
+    if renomear:
+        original, numero = nome_base, 1
+        while nome_base_ocupado(nome_base):
+            numero += 1
+            nome_base = f"{original} ({numero})"
+    
+    # Reservar os destinos antes de qualquer await, para duas ingestões não escolherem o mesmo caminho
+    destinos = []
+    for _, nome_arquivo, _ in itens:
+        destino = os.path.join(PASTA_VIDEOS, f"{nome_base}{os.path.splitext(nome_arquivo)[1].lower()}")
+        if destino_ocupado(destino) or destino in destinos:
+            raise ErroIngestao(f"`{os.path.basename(destino)}` já existe na pasta ou na fila")
+        destinos.append(destino)
+    destinos_em_ingestao.update(destinos)
+    
+    preparados = []  # (tipo, temporario, destino)
+    reserva = None
+    proxima_verificacao = [INTERVALO_VERIFICACAO_ESPACO]
+    
+    try:
+        reserva = await controle_espaco.admitir(sum(tamanho or 0 for _, _, tamanho in itens), ao_aguardar)
+        for (url, nome_arquivo, tamanho_anunciado), destino in zip(itens, destinos):
+            extensao = os.path.splitext(nome_arquivo)[1].lower()
+            tipo = TIPO_POR_EXTENSAO.get(extensao)
+            if not tipo:
+                raise ErroIngestao(f"`{nome_arquivo}`: extensão {extensao or '(nenhuma)'} não suportada")
+            
+            limite = LIMITES_INGESTAO[tipo]
+            if tamanho_anunciado and tamanho_anunciado > limite:
+                raise ErroIngestao(f"`{nome_arquivo}`: {tamanho_anunciado / 1024**2:.1f} MB excede o limite de {limite / 1024**2:.1f} MB")
+            
+            # Temporário único (oculto para o índice): ingestões simultâneas nunca dividem o mesmo arquivo
+            descritor, temporario = tempfile.mkstemp(dir=PASTA_VIDEOS, prefix=f".{nome_base}.", suffix=".parcial")
+            os.close(descritor)
+            preparados.append((tipo, temporario, destino))
+            
+            async def progresso_item(recebidos, total, nome=nome_arquivo, anunciado=tamanho_anunciado):
+                reserva.receber(recebidos)
+                # Sem tamanho anunciado (ou passando dele) a reserva não cobre: conferir o disco de tempos em tempos
+                if (not anunciado or recebidos > anunciado) and recebidos >= proxima_verificacao[0]:
+                    proxima_verificacao[0] = recebidos + INTERVALO_VERIFICACAO_ESPACO
+                    controle_espaco.verificar_transferencia()
+                if ao_progredir:
+                    await ao_progredir(nome, recebidos, total)
+            
+            try:
+                await baixar_em_streaming(url, temporario, extensao, limite, progresso_item)
+            except ErroIngestao as e:
+                raise ErroIngestao(f"`{nome_arquivo}`: {e}")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise ErroIngestao(f"`{nome_arquivo}`: falha na transferência ({e})")
+            reserva.concluir_arquivo(os.path.getsize(temporario))
+        
+        # Tudo validado: publicar os arquivos (os.replace é atômico) e registrar o pacote no índice
+        for _, _, destino in preparados:
+            if os.path.exists(destino):
+                raise ErroIngestao(f"`{os.path.basename(destino)}` apareceu na pasta durante o download")
+        indice = obter_indice_videos()
+        publicados = {}
+        for tipo, temporario, destino in preparados:
+            tamanho = os.path.getsize(temporario)
+            os.replace(temporario, destino)
+            indice.registrar_arquivo(destino)
+            reserva.publicar(tamanho)
+            publicados[tipo] = destino
+        return publicados
+    
+    finally:
+        destinos_em_ingestao.difference_update(destinos)
+        for _, temporario, _ in preparados:
+            if os.path.exists(temporario):
+                try:
+                    os.remove(temporario)
+                except OSError as e:
+                    print(f"❌ Erro ao remover arquivo parcial {temporario}: {e}")
+        # Publicado, o pacote passa a contar pelo índice; recusado, o espaço volta para quem espera
+        controle_espaco.liberar_reserva(reserva)
+
+# ========== SONDAGEM E VALIDAÇÃO DE MÍDIA ==========
+
+class ErroSondagem(Exception):
+    """Estrutura do arquivo de mídia inválida, truncada ou não suportada"""
+
+# Codecs que o YouTube processa sem conversão problemática
+CODECS_VIDEO_CONHECIDOS = {
+    'avc1', 'avc3', 'hvc1', 'hev1', 'av01', 'vp08', 'vp09', 'mp4v', 'apcn', 'apch', 'apcs', 'apco', 'ap4h',
+    'V_MPEG4/ISO/AVC', 'V_MPEGH/ISO/HEVC', 'V_AV1', 'V_VP8', 'V_VP9', 'V_MPEG4/ISO/ASP',
+    'H264', 'h264', 'X264', 'x264', 'XVID', 'xvid', 'DIVX', 'divx', 'MJPG', 'mjpg',
+}
+DURACAO_MAXIMA_YOUTUBE = 12 * 3600  # Vídeos acima de 12 horas são recusados pelo YouTube
+LARGURA_MINIMA_THUMB = 640  # Mínimo exigido pelo YouTube para thumbnails personalizadas
+
+cache_sondagem = {}  # (caminho, tamanho, mtime) -> resultado da sondagem
+
+def _atomos_mp4(arquivo, inicio, fim):
+    """Percorre os átomos MP4/MOV entre `inicio` e `fim` devolvendo (tipo, início dos dados, tamanho dos dados)"""
+    posicao = inicio
+    while posicao + 8 <= fim:
+        arquivo.seek(posicao)
+        cabecalho = arquivo.read(8)
+        if len(cabecalho) < 8:
+            break
+        tamanho, tipo = struct.unpack('>I4s', cabecalho)
+        tamanho_cabecalho = 8
+        if tamanho == 1:
+            tamanho = struct.unpack('>Q', arquivo.read(8))[0]
+            tamanho_cabecalho = 16
+        elif tamanho == 0:
+            tamanho = fim - posicao
+        
+        if tamanho < tamanho_cabecalho or posicao + tamanho > fim:
+            raise ErroSondagem(f"átomo '{tipo.decode('latin-1')}' truncado ou corrompido no byte {posicao}")
+        yield tipo, posicao + tamanho_cabecalho, tamanho - tamanho_cabecalho
+        posicao += tamanho
+
+def _filho_mp4(arquivo, inicio, tamanho, caminho_tipos):
+    """Desce pela hierarquia de átomos (ex.: [b'mdia', b'minf', b'stbl']) e devolve (início, tamanho)"""
+    for tipo_procurado in caminho_tipos:
+        for tipo, dados, tamanho_dados in _atomos_mp4(arquivo, inicio, inicio + tamanho):
+            if tipo == tipo_procurado:
+                inicio, tamanho = dados, tamanho_dados
+                break
+        else:
+            return None
+    return inicio, tamanho
+
+def sondar_mp4(arquivo, tamanho_arquivo):
+    info = {'formato': 'mp4', 'faixas': []}
+    atomos = {tipo: (dados, tamanho) for tipo, dados, tamanho in _atomos_mp4(arquivo, 0, tamanho_arquivo)}
+    
+    if b'moov' not in atomos:
+        raise ErroSondagem("átomo 'moov' ausente (gravação interrompida antes de finalizar?)")
+    if b'mdat' not in atomos:
+        raise ErroSondagem("átomo 'mdat' ausente (arquivo sem dados de mídia)")
+    
+    inicio_moov, tamanho_moov = atomos[b'moov']
+    escala = duracao = duracao_mehd = None
+    fragmentado = b'moof' in atomos
+    for tipo, dados, tamanho in _atomos_mp4(arquivo, inicio_moov, inicio_moov + tamanho_moov):
+        if tipo == b'mvhd':
+            arquivo.seek(dados)
+            versao = arquivo.read(4)[0]
+            if versao == 1:
+                _, _, escala, duracao = struct.unpack('>QQIQ', arquivo.read(28))
+            else:
+                _, _, escala, duracao = struct.unpack('>IIII', arquivo.read(16))
+            # Todos os bits em 1 = duração desconhecida (gravação ao vivo)
+            if duracao == (0xFFFFFFFFFFFFFFFF if versao == 1 else 0xFFFFFFFF):
+                duracao = None
         
-        opcoes.append(discord.SelectOption(
-            label=label,
-            description=data_meio_dia.strftime("%d/%m/%Y às %H:%M"),
-            value=data_meio_dia.strftime("%Y-%m-%dT%H:%M:%S"),
-            emoji="📅" if i <= 7 else "🗓️"
-        ))
+        elif tipo == b'mvex':
+            # MP4 fragmentado: a duração do mvhd fica zerada e, quando existe, a real está no mehd
+            fragmentado = True
+            mehd = _filho_mp4(arquivo, dados, tamanho, [b'mehd'])
+            if mehd:
+                arquivo.seek(mehd[0])
+                versao_mehd = arquivo.read(4)[0]
+                if versao_mehd == 1:
+                    duracao_fragmentos = struct.unpack('>Q', arquivo.read(8))[0]
+                    desconhecida = 0xFFFFFFFFFFFFFFFF
+                else:
+                    duracao_fragmentos = struct.unpack('>I', arquivo.read(4))[0]
+                    desconhecida = 0xFFFFFFFF
+                if duracao_fragmentos and duracao_fragmentos != desconhecida:
+                    duracao_mehd = duracao_fragmentos
         
-        # Parar quando atingir 25 opções (já incluímos a publicação imediata)
-        if len(opcoes) >= 25:
+        elif tipo == b'trak':
+            faixa = {}
+            tkhd = _filho_mp4(arquivo, dados, tamanho, [b'tkhd'])
+            if tkhd and tkhd[1] >= 8:
+                # Largura e altura ficam nos últimos 8 bytes do tkhd, em ponto fixo 16.16
+                arquivo.seek(tkhd[0] + tkhd[1] - 8)
+                largura, altura = struct.unpack('>II', arquivo.read(8))
+                faixa['largura'], faixa['altura'] = largura >> 16, altura >> 16
+            
+            hdlr = _filho_mp4(arquivo, dados, tamanho, [b'mdia', b'hdlr'])
+            if hdlr:
+                arquivo.seek(hdlr[0] + 8)
+                faixa['tipo'] = {b'vide': 'video', b'soun': 'audio'}.get(arquivo.read(4), 'outro')
+            
+            stsd = _filho_mp4(arquivo, dados, tamanho, [b'mdia', b'minf', b'stbl', b'stsd'])
+            if stsd and stsd[1] >= 16:
+                arquivo.seek(stsd[0] + 12)
+                faixa['codec'] = arquivo.read(4).decode('latin-1').strip()
+            info['faixas'].append(faixa)
+    
+    if fragmentado:
+        info['fragmentado'] = True
+        if not duracao:
+            # Sem mehd (ou com ele vazio), só percorrendo todos os fragmentos: fica desconhecida
+            duracao = duracao_mehd
+    info['duracao'] = duracao / escala if escala and duracao is not None else None
+    return info
+
+def _ler_vint(arquivo, manter_marcador=False):
+    """Lê um inteiro de tamanho variável do EBML (IDs mantêm o bit marcador, tamanhos não)"""
+    primeiro = arquivo.read(1)
+    if not primeiro:
+        raise EOFError
+    primeiro = primeiro[0]
+    comprimento = 1
+    mascara = 0x80
+    while comprimento <= 8 and not (primeiro & mascara):
+        mascara >>= 1
+        comprimento += 1
+    if comprimento > 8:
+        raise ErroSondagem("inteiro EBML inválido")
+    
+    valor = primeiro if manter_marcador else primeiro & (mascara - 1)
+    resto = arquivo.read(comprimento - 1)
+    if len(resto) < comprimento - 1:
+        raise EOFError
+    for byte in resto:
+        valor = (valor << 8) | byte
+    
+    desconhecido = not manter_marcador and valor == (1 << (7 * comprimento)) - 1
+    return valor, desconhecido
+
+def _elementos_ebml(arquivo, inicio, fim):
+    """Percorre os elementos EBML entre `inicio` e `fim` devolvendo (id, início dos dados, tamanho ou None)"""
+    posicao = inicio
+    while posicao < fim:
+        arquivo.seek(posicao)
+        try:
+            id_elemento, _ = _ler_vint(arquivo, manter_marcador=True)
+            tamanho, desconhecido = _ler_vint(arquivo)
+        except EOFError:
+            raise ErroSondagem(f"elemento EBML truncado no byte {posicao}")
+        dados = arquivo.tell()
+        if desconhecido:
+            yield id_elemento, dados, None
+            return
+        if dados + tamanho > fim:
+            raise ErroSondagem(f"elemento EBML 0x{id_elemento:X} ultrapassa o fim do arquivo (truncado?)")
+        yield id_elemento, dados, tamanho
+        posicao = dados + tamanho
+
+def _ler_uint(arquivo, posicao, tamanho):
+    arquivo.seek(posicao)
+    return int.from_bytes(arquivo.read(tamanho), 'big')
+
+def sondar_mkv(arquivo, tamanho_arquivo):
+    info = {'formato': 'mkv', 'faixas': []}
+    elementos = list(_elementos_ebml(arquivo, 0, tamanho_arquivo))
+    if not elementos or elementos[0][0] != 0x1A45DFA3:
+        raise ErroSondagem("cabeçalho EBML ausente")
+    
+    segmento = next(((dados, tamanho) for id_el, dados, tamanho in elementos if id_el == 0x18538067), None)
+    if segmento is None:
+        raise ErroSondagem("elemento Segment ausente")
+    inicio_segmento, tamanho_segmento = segmento
+    fim_segmento = tamanho_arquivo if tamanho_segmento is None else inicio_segmento + tamanho_segmento
+    
+    escala_tempo = 1000000
+    duracao = None
+    achou_faixas = False
+    for id_el, dados, tamanho in _elementos_ebml(arquivo, inicio_segmento, fim_segmento):
+        if tamanho is None:
+            break  # Cluster de tamanho desconhecido (gravação ao vivo): cabeçalhos já ficaram para trás
+        
+        if id_el == 0x1549A966:  # Info
+            for id_info, dados_info, tamanho_info in _elementos_ebml(arquivo, dados, dados + tamanho):
+                if id_info == 0x2AD7B1:  # TimecodeScale
+                    escala_tempo = _ler_uint(arquivo, dados_info, tamanho_info)
+                elif id_info == 0x4489:  # Duration
+                    arquivo.seek(dados_info)
+                    duracao = struct.unpack('>f' if tamanho_info == 4 else '>d', arquivo.read(tamanho_info))[0]
+        
+        elif id_el == 0x1654AE6B:  # Tracks
+            achou_faixas = True
+            for id_faixa, dados_faixa, tamanho_faixa in _elementos_ebml(arquivo, dados, dados + tamanho):
+                if id_faixa != 0xAE:  # TrackEntry
+                    continue
+                faixa = {}
+                for id_campo, dados_campo, tamanho_campo in _elementos_ebml(arquivo, dados_faixa, dados_faixa + tamanho_faixa):
+                    if id_campo == 0x83:  # TrackType
+                        faixa['tipo'] = {1: 'video', 2: 'audio'}.get(_ler_uint(arquivo, dados_campo, tamanho_campo), 'outro')
+                    elif id_campo == 0x86:  # CodecID
+                        arquivo.seek(dados_campo)
+                        faixa['codec'] = arquivo.read(tamanho_campo).decode('ascii', 'replace').rstrip('\x00')
+                    elif id_campo == 0xE0:  # Video
+                        for id_video, dados_video, tamanho_video in _elementos_ebml(arquivo, dados_campo, dados_campo + tamanho_campo):
+                            if id_video == 0xB0:
+                                faixa['largura'] = _ler_uint(arquivo, dados_video, tamanho_video)
+                            elif id_video == 0xBA:
+                                faixa['altura'] = _ler_uint(arquivo, dados_video, tamanho_video)
+                info['faixas'].append(faixa)
+        
+        elif id_el == 0x1F43B675 and achou_faixas:  # Cluster: o resto do arquivo são dados de mídia
             break
     
-    return opcoes
+    if not achou_faixas:
+        raise ErroSondagem("elemento Tracks ausente")
+    info['duracao'] = duracao * escala_tempo / 1e9 if duracao is not None else None
+    return info
+
+def sondar_avi(arquivo, tamanho_arquivo):
+    info = {'formato': 'avi', 'faixas': []}
+    arquivo.seek(0)
+    cabecalho = arquivo.read(12)
+    if cabecalho[:4] != b'RIFF' or cabecalho[8:12] != b'AVI ':
+        raise ErroSondagem("cabeçalho RIFF/AVI ausente")
+    
+    arquivo.seek(12)
+    lista = arquivo.read(12)
+    if lista[:4] != b'LIST' or lista[8:12] != b'hdrl':
+        raise ErroSondagem("lista 'hdrl' ausente")
+    tamanho_hdrl = struct.unpack('<I', lista[4:8])[0]
+    dados_hdrl = arquivo.read(min(tamanho_hdrl - 4, 1024 * 1024))
+    
+    posicao_avih = dados_hdrl.find(b'avih')
+    if posicao_avih < 0:
+        raise ErroSondagem("cabeçalho 'avih' ausente")
+    campos = struct.unpack('<10I', dados_hdrl[posicao_avih + 8:posicao_avih + 48])
+    microssegundos_quadro, total_quadros = campos[0], campos[4]
+    info['duracao'] = total_quadros * microssegundos_quadro / 1e6 if microssegundos_quadro else None
+    
+    faixa_video = {'tipo': 'video', 'largura': campos[8], 'altura': campos[9]}
+    posicao = 0
+    while True:
+        posicao = dados_hdrl.find(b'strh', posicao)
+        if posicao < 0:
+            break
+        tipo_fluxo = dados_hdrl[posicao + 8:posicao + 12]
+        if tipo_fluxo == b'vids':
+            faixa_video['codec'] = dados_hdrl[posicao + 12:posicao + 16].decode('latin-1').strip('\x00 ')
+        elif tipo_fluxo == b'auds':
+            info['faixas'].append({'tipo': 'audio'})
+        posicao += 4
+    info['faixas'].insert(0, faixa_video)
+    return info
+
+def sondar_imagem(arquivo, tamanho_arquivo):
+    arquivo.seek(0)
+    cabecalho = arquivo.read(24)
+    if cabecalho.startswith(b'\x89PNG\r\n\x1a\n') and cabecalho[12:16] == b'IHDR':
+        largura, altura = struct.unpack('>II', cabecalho[16:24])
+        return {'formato': 'png', 'largura': largura, 'altura': altura}
+    
+    if cabecalho.startswith(b'\xff\xd8'):
+        posicao = 2
+        while posicao + 4 <= tamanho_arquivo:
+            arquivo.seek(posicao)
+            marcador = arquivo.read(4)
+            if marcador[0] != 0xFF:
+                raise ErroSondagem(f"marcador JPEG inválido no byte {posicao}")
+            tipo = marcador[1]
+            if tipo == 0xFF:
+                posicao += 1  # Bytes de preenchimento
+                continue
+            tamanho_segmento = struct.unpack('>H', marcador[2:4])[0]
+            # SOF0..SOF15, exceto DHT (C4), JPG (C8) e DAC (CC)
+            if 0xC0 <= tipo <= 0xCF and tipo not in (0xC4, 0xC8, 0xCC):
+                altura, largura = struct.unpack('>HH', arquivo.read(5)[1:5])
+                return {'formato': 'jpg', 'largura': largura, 'altura': altura}
+            if tipo == 0xDA:
+                break  # Início dos dados comprimidos sem SOF antes
+            posicao += 2 + tamanho_segmento
+        raise ErroSondagem("JPEG sem cabeçalho de quadro (SOF)")
+    
+    raise ErroSondagem("formato de imagem não reconhecido (use JPG ou PNG)")
+
+SONDAS_POR_EXTENSAO = {
+    '.mp4': sondar_mp4,
+    '.mov': sondar_mp4,
+    '.mkv': sondar_mkv,
+    '.avi': sondar_avi,
+    '.jpg': sondar_imagem,
+    '.jpeg': sondar_imagem,
+    '.png': sondar_imagem,
+}
+
+def sondar_midia(caminho):
+    """Lê só os cabeçalhos do arquivo e devolve formato, duração, faixas e resolução (com cache)"""
+    stat = os.stat(caminho)
+    chave = (caminho, stat.st_size, stat.st_mtime)
+    if chave in cache_sondagem:
+        return cache_sondagem[chave]
+    
+    extensao = os.path.splitext(caminho)[1].lower()
+    sonda = SONDAS_POR_EXTENSAO.get(extensao)
+    try:
+        if sonda is None:
+            raise ErroSondagem(f"extensão {extensao} não suportada")
+        with open(caminho, 'rb') as arquivo:
+            resultado = sonda(arquivo, stat.st_size)
+        resultado['erro'] = None
+    except (ErroSondagem, struct.error, IndexError) as e:
+        resultado = {'formato': extensao.lstrip('.'), 'erro': str(e) or "estrutura inválida"}
+    
+    resultado['tamanho'] = stat.st_size
+    if len(cache_sondagem) >= 512:
+        cache_sondagem.pop(next(iter(cache_sondagem)))
+    cache_sondagem[chave] = resultado
+    return resultado
+
+def validar_pacote_video(video_info):
+    """Valida vídeo e thumbnail contra os limites do YouTube antes de gastar banda"""
+    problemas = []
+    avisos = []
+    resultado = {'problemas': problemas, 'avisos': avisos, 'video': None, 'thumb': None}
+    
+    caminho_video = video_info.get('video')
+    if not caminho_video or not os.path.exists(caminho_video):
+        problemas.append("arquivo de vídeo não encontrado")
+    else:
+        info = resultado['video'] = sondar_midia(caminho_video)
+        if info['erro']:
+            problemas.append(f"vídeo inválido: {info['erro']}")
+        else:
+            faixas_video = [f for f in info.get('faixas', []) if f.get('tipo') == 'video']
+            if not faixas_video:
+                problemas.append("vídeo sem faixa de imagem")
+            else:
+                faixa = faixas_video[0]
+                codec = faixa.get('codec')
+                if codec and codec not in CODECS_VIDEO_CONHECIDOS:
+                    avisos.append(f"codec de vídeo `{codec}` incomum; o YouTube pode recusar no processamento")
+                if not faixa.get('largura') or not faixa.get('altura'):
+                    avisos.append("resolução não encontrada no cabeçalho")
+            if not any(f.get('tipo') == 'audio' for f in info.get('faixas', [])):
+                avisos.append("vídeo sem faixa de áudio")
+            
+            duracao = info.get('duracao')
+            if duracao is None:
+                if info.get('fragmentado'):
+                    avisos.append("MP4 fragmentado sem duração no cabeçalho; o YouTube calcula no processamento")
+                else:
+                    avisos.append("duração ausente no cabeçalho (gravação não finalizada?)")
+            elif duracao <= 0:
+                problemas.append("duração zero")
+            elif duracao > DURACAO_MAXIMA_YOUTUBE:
+                problemas.append(f"duração de {duracao / 3600:.1f} h excede o limite de 12 h do YouTube")
+    
+    caminho_thumb = video_info.get('thumb')
+    if caminho_thumb and os.path.exists(caminho_thumb):
+        info = resultado['thumb'] = sondar_midia(caminho_thumb)
+        if info['erro']:
+            problemas.append(f"thumbnail inválida: {info['erro']}")
+        else:
+            if info['tamanho'] > LIMITES_INGESTAO['thumb']:
+                problemas.append(f"thumbnail com {info['tamanho'] / 1024**2:.1f} MB (limite do YouTube: 2 MB)")
+            if info['largura'] < LARGURA_MINIMA_THUMB:
+                problemas.append(f"thumbnail com {info['largura']}px de largura (mínimo: {LARGURA_MINIMA_THUMB}px)")
+            elif info['altura'] and abs(info['largura'] / info['altura'] - 16 / 9) > 0.05:
+                avisos.append(f"thumbnail {info['largura']}x{info['altura']} fora da proporção 16:9 recomendada")
+    
+    resultado['valido'] = not problemas
+    return resultado
+
+async def validar_pacote_video_async(video_info):
+    """Versão assíncrona de validar_pacote_video (a leitura dos cabeçalhos roda fora do loop)"""
+    return await executar_em_thread(validar_pacote_video, video_info)
+
+def descrever_midia(info):
+    """Resumo de uma linha de um resultado de sondar_midia"""
+    if not info or info.get('erro'):
+        return "—"
+    partes = [info['formato'].upper()]
+    faixa = next((f for f in info.get('faixas', []) if f.get('tipo') == 'video'), info)
+    if faixa.get('largura') and faixa.get('altura'):
+        partes.append(f"{faixa['largura']}x{faixa['altura']}")
+    if faixa.get('codec'):
+        partes.append(faixa['codec'])
+    if info.get('duracao'):
+        partes.append(str(timedelta(seconds=int(info['duracao']))))
+    partes.append(f"{info['tamanho'] / 1024**2:.1f} MB")
+    return " | ".join(partes)
+
+async def mostrar_validacao_midia(ctx, validacao):
+    """Mostra o resultado da validação pré-upload"""
+    embed = discord.Embed(
+        title="🎞️ Validação de Mídia" if validacao['valido'] else "❌ Mídia Inválida - Upload Bloqueado",
+        color=0x00ff00 if validacao['valido'] else 0xff0000
+    )
+    embed.add_field(name="🎬 Vídeo", value=descrever_midia(validacao['video']), inline=False)
+    embed.add_field(name="🖼️ Thumbnail", value=descrever_midia(validacao['thumb']), inline=False)
+    if validacao['problemas']:
+        embed.add_field(name="❌ Problemas", value="\n".join(f"• {p}" for p in validacao['problemas'])[:1024], inline=False)
+    if validacao['avisos']:
+        embed.add_field(name="⚠️ Avisos", value="\n".join(f"• {a}" for a in validacao['avisos'])[:1024], inline=False)
+    await ctx.send(embed=embed)
+
+# ========== IMPRESSÕES DIGITAIS DE VÍDEOS (DUPLICADOS) ==========
+
+AMOSTRAS_IMPRESSAO_RAPIDA = 16  # Blocos lidos ao longo do arquivo na primeira passada
+TAMANHO_AMOSTRA_IMPRESSAO = 64 * 1024
+JANELA_IMPRESSAO_COMPLETA = 8 * 1024 * 1024  # Bytes por atualização do hash completo
+
+def impressao_rapida(caminho):
+    """Hash de amostras espalhadas pelo arquivo (mais o tamanho): lê ~1 MB mesmo em vídeos de vários GB"""
+    tamanho = os.path.getsize(caminho)
+    hash_rapido = hashlib.blake2b(str(tamanho).encode(), digest_size=16)
+    if tamanho == 0:
+        return hash_rapido.hexdigest()
+    
+    with open(caminho, 'rb') as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        with memoryview(mapa) as visao:
+            if tamanho <= AMOSTRAS_IMPRESSAO_RAPIDA * TAMANHO_AMOSTRA_IMPRESSAO:
+                hash_rapido.update(visao)
+            else:
+                ultimo_inicio = tamanho - TAMANHO_AMOSTRA_IMPRESSAO
+                for i in range(AMOSTRAS_IMPRESSAO_RAPIDA):
+                    inicio = ultimo_inicio * i // (AMOSTRAS_IMPRESSAO_RAPIDA - 1)
+                    hash_rapido.update(visao[inicio:inicio + TAMANHO_AMOSTRA_IMPRESSAO])
+    return hash_rapido.hexdigest()
+
+def impressao_completa(caminho):
+    """SHA-256 do arquivo inteiro, lido via mmap em janelas (sem cópias para objetos bytes)"""
+    hash_completo = hashlib.sha256()
+    if os.path.getsize(caminho) == 0:
+        return hash_completo.hexdigest()
+    
+    with open(caminho, 'rb') as arquivo, mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+        if hasattr(mapa, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            mapa.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mapa) as visao:
+            for inicio in range(0, len(visao), JANELA_IMPRESSAO_COMPLETA):
+                hash_completo.update(visao[inicio:inicio + JANELA_IMPRESSAO_COMPLETA])
+    return hash_completo.hexdigest()
+
+class RegistroImpressoes:
+    """Impressões digitais de todos os vídeos já enviados, persistidas em JSON"""
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.entradas = []
+        self._por_rapida = {}
+        if os.path.exists(arquivo):
+            try:
+                with open(arquivo, 'r', encoding='utf-8') as f:
+                    self.entradas = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao ler {arquivo}, iniciando registro vazio: {e}")
+        for entrada in self.entradas:
+            self._por_rapida.setdefault(entrada['rapida'], []).append(entrada)
+
+    def candidatos(self, rapida):
+        return self._por_rapida.get(rapida, [])
+
+    def registrar(self, rapida, completa, tamanho, video_id, titulo, arquivo_original):
+        entrada = {
+            'rapida': rapida,
+            'completa': completa,
+            'tamanho': tamanho,
+            'video_id': video_id,
+            'titulo': titulo,
+            'arquivo': arquivo_original,
+            'data': datetime.now().isoformat(timespec='seconds'),
+        }
+        self.entradas.append(entrada)
+        self._por_rapida.setdefault(rapida, []).append(entrada)
+        self.salvar()
+        return entrada
+
+    def salvar(self):
+        temporario = f"{self.arquivo}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.entradas, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.arquivo)
+
+registro_impressoes = None
+
+def obter_registro_impressoes():
+    global registro_impressoes
+    if registro_impressoes is None:
+        registro_impressoes = RegistroImpressoes(ARQUIVO_IMPRESSOES)
+    return registro_impressoes
+
+async def verificar_duplicado(video_info):
+    """Procura o vídeo na fila atual e entre os já enviados; devolve a impressão e o duplicado encontrado"""
+    caminho = video_info['video']
+    resultado = {
+        'rapida': await executar_em_thread(impressao_rapida, caminho),
+        'completa': None,
+        'tamanho': os.path.getsize(caminho),
+        'duplicado': None,
+    }
+    
+    # Mesmo arquivo já aguardando na fila (ex.: duas pessoas selecionaram o mesmo vídeo)
+    for tarefa in fila_ativa.values():
+        impressao = getattr(tarefa, 'impressao', None)
+        if tarefa.video_info.get('video') == caminho or (impressao and impressao['rapida'] == resultado['rapida']):
+            resultado['duplicado'] = {'origem': 'fila', 'titulo': tarefa.titulo}
+            return resultado
+    
+    # Só calcula o hash completo quando a amostragem bate com algum upload anterior
+    candidatos = obter_registro_impressoes().candidatos(resultado['rapida'])
+    if candidatos:
+        resultado['completa'] = await executar_em_thread(impressao_completa, caminho)
+        for entrada in candidatos:
+            if entrada['completa'] == resultado['completa']:
+                resultado['duplicado'] = {
+                    'origem': 'enviado',
+                    'titulo': entrada['titulo'],
+                    'url': f"https://youtube.com/watch?v={entrada['video_id']}",
+                    'data': entrada['data'],
+                }
+                break
+    return resultado
+
+async def registrar_impressao_upload(tarefa, resultado):
+    """Guarda a impressão do vídeo recém-enviado (antes da limpeza automática apagar o arquivo)"""
+    try:
+        caminho = tarefa.video_info['video']
+        impressao = getattr(tarefa, 'impressao', None) or {}
+        rapida = impressao.get('rapida') or await executar_em_thread(impressao_rapida, caminho)
+        completa = impressao.get('completa') or await executar_em_thread(impressao_completa, caminho)
+        obter_registro_impressoes().registrar(
+            rapida, completa, os.path.getsize(caminho), resultado['video_id'], tarefa.titulo, os.path.basename(caminho)
+        )
+    except Exception as e:
+        print(f"❌ Erro ao registrar impressão digital do upload: {e}")
+
+# ========== HISTÓRICO DE UPLOADS ==========
+
+ESQUEMA_HISTORICO = """
+CREATE TABLE IF NOT EXISTS uploads (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL,
+    status TEXT NOT NULL,
+    video_id TEXT,
+    url TEXT,
+    titulo TEXT,
+    jogo TEXT,
+    jogo_chave TEXT,
+    episodio INTEGER,
+    parte INTEGER,
+    perfil TEXT,
+    arquivo TEXT,
+    bytes INTEGER,
+    duracao_video REAL,
+    segundos_total REAL,
+    segundos_envio REAL,
+    mb_por_segundo REAL,
+    tentativas INTEGER,
+    agendamento TEXT,
+    hash_titulo TEXT,
+    hash_descricao TEXT,
+    impressao TEXT,
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_uploads_jogo_episodio ON uploads (jogo_chave, episodio);
+CREATE INDEX IF NOT EXISTS idx_uploads_episodio ON uploads (episodio);
+CREATE INDEX IF NOT EXISTS idx_uploads_data ON uploads (data);
+"""
+
+def hash_texto(texto):
+    """SHA-256 curto de um texto (para saber se título/descrição se repetem sem guardar cópias)"""
+    return hashlib.sha256((texto or "").encode('utf-8')).hexdigest()[:16]
+
+class HistoricoUploads:
+    """Histórico local de uploads em SQLite, indexado por jogo, episódio e data"""
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self._lock = threading.Lock()
+        # As gravações e consultas rodam em thread (executar_em_thread)
+        self.conexao = sqlite3.connect(arquivo, check_same_thread=False)
+        self.conexao.row_factory = sqlite3.Row
+        with self._lock, self.conexao:
+            self.conexao.executescript(ESQUEMA_HISTORICO)
+
+    def registrar(self, **dados):
+        dados.setdefault('data', datetime.now().isoformat(timespec='seconds'))
+        if dados.get('jogo'):
+            dados['jogo_chave'] = dados['jogo'].casefold()
+        colunas = ", ".join(dados)
+        marcadores = ", ".join(f":{coluna}" for coluna in dados)
+        with self._lock, self.conexao:
+            self.conexao.execute(f"INSERT INTO uploads ({colunas}) VALUES ({marcadores})", dados)
+
+    def ultimos(self, limite=10, jogo=None):
+        """Últimos uploads, de todos os jogos ou de um (nome exato; senão, trecho do nome)"""
+        with self._lock:
+            if not jogo:
+                consulta = self.conexao.execute("SELECT * FROM uploads ORDER BY data DESC, id DESC LIMIT ?", (limite,))
+                return [dict(linha) for linha in consulta]
+            
+            linhas = self.conexao.execute(
+                "SELECT * FROM uploads WHERE jogo_chave = ? ORDER BY data DESC, id DESC LIMIT ?",
+                (jogo.casefold(), limite)
+            ).fetchall()
+            if not linhas:
+                # % e _ do nome do jogo são literais, não curingas do LIKE
+                trecho = re.sub(r'([\\%_])', r'\\\1', jogo.casefold())
+                linhas = self.conexao.execute(
+                    "SELECT * FROM uploads WHERE jogo_chave LIKE ? ESCAPE '\\' ORDER BY data DESC, id DESC LIMIT ?",
+                    (f"%{trecho}%", limite)
+                ).fetchall()
+            return [dict(linha) for linha in linhas]
+
+    def resumo_desde(self, inicio):
+        """Totais dos uploads bem-sucedidos a partir de uma data (contagem, bytes, tempo de envio, MB/s médio)"""
+        with self._lock:
+            linha = self.conexao.execute(
+                "SELECT COUNT(*) AS uploads, COALESCE(SUM(bytes), 0) AS bytes, "
+                "COALESCE(SUM(segundos_envio), 0) AS segundos, COALESCE(SUM(tentativas), 0) AS tentativas "
+                "FROM uploads WHERE status = 'sucesso' AND data >= ?",
+                (inicio.isoformat(timespec='seconds'),)
+            ).fetchone()
+        resumo = dict(linha)
+        resumo['mb_por_segundo'] = resumo['bytes'] / (1024 * 1024) / resumo['segundos'] if resumo['segundos'] else None
+        return resumo
+
+    def episodios_publicados(self):
+        """Pares (jogo, episódio) enviados com sucesso"""
+        with self._lock:
+            return self.conexao.execute(
+                "SELECT DISTINCT jogo_chave, episodio FROM uploads "
+                "WHERE status = 'sucesso' AND jogo_chave IS NOT NULL AND episodio IS NOT NULL"
+            ).fetchall()
+
+historico_uploads = None
+
+def obter_historico_uploads():
+    global historico_uploads
+    if historico_uploads is None:
+        historico_uploads = HistoricoUploads(ARQUIVO_HISTORICO)
+    return historico_uploads
+
+def inicio_da_semana(agora=None):
+    """Segunda-feira 00:00 da semana atual"""
+    agora = agora or datetime.now()
+    return (agora - timedelta(days=agora.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+async def registrar_historico_upload(tarefa, resultado, duracao_video=None, segundos_total=None, tentativas=1):
+    """Grava o resultado do upload no histórico (antes da limpeza automática apagar o arquivo)"""
+    try:
+        caminho = tarefa.video_info['video']
+        jogo, _, parte = analisar_nome_arquivo(caminho)
+        episodio = tarefa.episodio
+        tamanho = resultado.get('bytes')
+        if tamanho is None and os.path.exists(caminho):
+            tamanho = os.path.getsize(caminho)
+        segundos_envio = resultado.get('segundos_envio')
+        impressao = getattr(tarefa, 'impressao', None) or {}
+        
+        await executar_em_thread(partial(
+            obter_historico_uploads().registrar,
+            status=resultado['status'],
+            video_id=resultado.get('video_id'),
+            url=resultado.get('url'),
+            titulo=tarefa.titulo,
+            jogo=jogo,
+            episodio=episodio,
+            parte=parte,
+            perfil=tarefa.perfil.nome if tarefa.perfil else None,
+            arquivo=os.path.basename(caminho),
+            bytes=tamanho,
+            duracao_video=duracao_video,
+            segundos_total=segundos_total,
+            segundos_envio=segundos_envio,
+            mb_por_segundo=tamanho / (1024 * 1024) / segundos_envio if tamanho and segundos_envio else None,
+            tentativas=tentativas,
+            agendamento=tarefa.agendar if tarefa.agendar and tarefa.agendar != "imediato" else None,
+            hash_titulo=hash_texto(tarefa.titulo),
+            hash_descricao=hash_texto(tarefa.descricao),
+            impressao=impressao.get('rapida'),
+            erro=resultado.get('mensagem') if resultado['status'] != 'sucesso' else None,
+        ))
+        if resultado['status'] == 'sucesso':
+            obter_catalogo_episodios().registrar_publicado(jogo, episodio)
+    except Exception as e:
+        print(f"❌ Erro ao registrar upload no histórico: {e}")
+
+# ========== CATÁLOGO DE EPISÓDIOS ==========
+
+class CatalogoEpisodios:
+    """Episódios de cada jogo já publicados (histórico), na fila e na pasta: próximo número e lacunas"""
+    def __init__(self):
+        self.publicados = {}  # jogo (casefold) -> {episódios}
+        self.na_pasta = {}
+        self._historico_carregado = False
+        self._versao_pasta = None
+
+    def _carregar_historico(self):
+        if self._historico_carregado:
+            return
+        self._historico_carregado = True
+        try:
+            for jogo_chave, episodio in obter_historico_uploads().episodios_publicados():
+                self.publicados.setdefault(jogo_chave, set()).add(episodio)
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar episódios do histórico: {e}")
+
+    def _atualizar_pasta(self):
+        indice = obter_indice_videos()
+        if indice.versao == self._versao_pasta:
+            return
+        na_pasta = {}
+        for pacote in indice.pacotes().values():
+            if pacote.get('video'):
+                jogo, episodio, _ = analisar_nome_arquivo(pacote['video'])
+                if episodio is not None:
+                    na_pasta.setdefault(jogo.casefold(), set()).add(episodio)
+        self.na_pasta = na_pasta
+        self._versao_pasta = indice.versao
+
+    def registrar_publicado(self, jogo, episodio):
+        if jogo and episodio is not None:
+            self._carregar_historico()
+            self.publicados.setdefault(jogo.casefold(), set()).add(episodio)
+
+    def _na_fila(self, chave):
+        return {t.episodio for t in fila_ativa.values() if t.jogo_chave == chave and t.episodio is not None}
+
+    def ja_publicado(self, jogo, episodio):
+        self._carregar_historico()
+        return episodio in self.publicados.get(jogo.casefold(), ())
+
+    def proximo_episodio(self, jogo):
+        """Número seguinte ao maior episódio já publicado ou na fila (1 para um jogo novo)"""
+        self._carregar_historico()
+        chave = jogo.casefold()
+        conhecidos = self.publicados.get(chave, set()) | self._na_fila(chave)
+        return max(conhecidos) + 1 if conhecidos else 1
+
+    def lacunas(self, jogo, ate=None):
+        """Episódios que faltam (nem publicados, nem na fila, nem na pasta) entre o primeiro conhecido e `ate`"""
+        self._carregar_historico()
+        self._atualizar_pasta()
+        chave = jogo.casefold()
+        conhecidos = self.publicados.get(chave, set()) | self.na_pasta.get(chave, set()) | self._na_fila(chave)
+        if not conhecidos:
+            return []
+        fim = ate if ate is not None else max(conhecidos)
+        return [n for n in range(min(conhecidos), fim) if n not in conhecidos]
+
+catalogo_episodios = None
+
+def obter_catalogo_episodios():
+    global catalogo_episodios
+    if catalogo_episodios is None:
+        catalogo_episodios = CatalogoEpisodios()
+    return catalogo_episodios
+
+def formatar_lacunas(lacunas, limite=5):
+    """'3, 4, 7' ou '3, 4, 7, 9, 10 e mais 2'"""
+    texto = ", ".join(str(n) for n in lacunas[:limite])
+    return f"{texto} e mais {len(lacunas) - limite}" if len(lacunas) > limite else texto
 
 # ========== NOVAS FUNÇÕES PARA VERIFICAÇÃO DE ARQUIVOS OBRIGATÓRIOS ==========
 
@@ -1621,15 +5911,15 @@ async def verificar_arquivos_obrigatorios(ctx, video_info):
             return (m.author == ctx.author and 
                    m.channel == ctx.channel and 
                    m.attachments and 
-                   any(att.filename.lower().endswith('.txt') for att in m.attachments))
+                   any(att.filename.lower().endswith(('.txt', '.json')) for att in m.attachments))
         
         try:
             msg_contexto = await bot.wait_for('message', timeout=TIMEOUT_INTERACOES, check=check_arquivo_contexto)
-            arquivo_contexto = msg_contexto.attachments[0]
+            arquivo_contexto = next(att for att in msg_contexto.attachments if att.filename.lower().endswith(('.txt', '.json')))
             
-            # Salvar o arquivo de contexto
-            caminho_contexto = os.path.join(PASTA_VIDEOS, f"{nome_base}.txt")
-            await arquivo_contexto.save(caminho_contexto)
+            # Salvar o arquivo de contexto (streaming, validado antes de entrar na pasta)
+            publicados = await ingerir_pacote([(arquivo_contexto.url, arquivo_contexto.filename, arquivo_contexto.size)], nome_base)
+            caminho_contexto = publicados['contexto']
             video_info['contexto'] = caminho_contexto
             
             await ctx.send(f"✅ **Arquivo de contexto salvo:** `{caminho_contexto}`")
@@ -1637,6 +5927,9 @@ async def verificar_arquivos_obrigatorios(ctx, video_info):
         except asyncio.TimeoutError:
             await ctx.send("⏰ Tempo esgotado para envio do arquivo de contexto. Processo cancelado.")
             return False
+        except ErroIngestao as e:
+            await ctx.send(f"❌ **Arquivo de contexto recusado:** {e}")
+            return False
     
     # Verificar arquivo de thumbnail
     if not video_info.get('thumb'):
@@ -1652,12 +5945,11 @@ async def verificar_arquivos_obrigatorios(ctx, video_info):
         
         try:
             msg_thumbnail = await bot.wait_for('message', timeout=TIMEOUT_INTERACOES, check=check_arquivo_thumbnail)
-            arquivo_thumbnail = msg_thumbnail.attachments[0]
+            arquivo_thumbnail = next(att for att in msg_thumbnail.attachments if att.filename.lower().endswith(('.jpg', '.jpeg', '.png')))
             
-            # Salvar o arquivo de thumbnail
-            extensao = os.path.splitext(arquivo_thumbnail.filename)[1].lower()
-            caminho_thumbnail = os.path.join(PASTA_VIDEOS, f"{nome_base}{extensao}")
-            await arquivo_thumbnail.save(caminho_thumbnail)
+            # Salvar o arquivo de thumbnail (streaming, validado antes de entrar na pasta)
+            publicados = await ingerir_pacote([(arquivo_thumbnail.url, arquivo_thumbnail.filename, arquivo_thumbnail.size)], nome_base)
+            caminho_thumbnail = publicados['thumb']
             video_info['thumb'] = caminho_thumbnail
             
             await ctx.send(f"✅ **Arquivo de thumbnail salvo:** `{caminho_thumbnail}`")
@@ -1665,6 +5957,9 @@ async def verificar_arquivos_obrigatorios(ctx, video_info):
         except asyncio.TimeoutError:
             await ctx.send("⏰ Tempo esgotado para envio do arquivo de thumbnail. Processo cancelado.")
             return False
+        except ErroIngestao as e:
+            await ctx.send(f"❌ **Thumbnail recusada:** {e}")
+            return False
     
     return True
 
@@ -1743,6 +6038,14 @@ async def on_ready():
         bot.loop.create_task(gerenciador_fila_uploads())
         print('🔄 Gerenciador de fila de uploads iniciado')
     
+    # Iniciar monitor de latência do event loop
+    monitor_loop.iniciar()
+    
+    # SIGTERM em vez de matar os uploads salva a fila para o próximo início
+    if not hasattr(bot, 'sinais_desligamento_instalados'):
+        bot.sinais_desligamento_instalados = True
+        instalar_sinais_desligamento()
+    
     # Verificar se o bot tem acesso ao canal específico
     canal = bot.get_channel(CANAL_DISCORD_ID)
     if canal:
@@ -1755,49 +6058,9 @@ async def on_ready():
         await atualizar_fila_global()
     else:
         print(f'❌ Não foi possível acessar o canal com ID: {CANAL_DISCORD_ID}')
-
-@bot.event
-async def on_reaction_add(reaction, user):
-    """Processa reações em mensagens do bot"""
-    global ultima_mensagem_status
-    
-    if user.bot:
-        return
     
-    # Verificar se é uma reação em uma mensagem de seleção de vídeos
-    if reaction.message.id in selecoes_ativas:
-        selecao = selecoes_ativas[reaction.message.id]
-        
-        if user.id != selecao['autor']:
-            return
-        
-        # Emojis numéricos
-        emojis_numeros = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣', '🔟']
-        
-        if str(reaction.emoji) in emojis_numeros:
-            indice = emojis_numeros.index(str(reaction.emoji))
-            lista_arquivos = selecao['arquivos']
-            
-            if indice < len(lista_arquivos):
-                nome_selecionado, video_info = lista_arquivos[indice]
-                
-                # Limpar seleção
-                del selecoes_ativas[reaction.message.id]
-                
-                # Processar vídeo selecionado
-                ctx = selecao.get('interaction')
-                if ctx:
-                    # Se veio de uma interação por botão
-                    class ContextSimulado:
-                        def __init__(self, interaction):
-                            self.channel = interaction.channel
-                            self.author = interaction.user
-                            self.send = interaction.followup.send
-                    ctx_simulado = ContextSimulado(ctx)
-                    await processar_video_selecionado(ctx_simulado, nome_selecionado, video_info)
-                else:
-                    # Se veio de um comando tradicional
-                    await processar_video_selecionado(reaction.message.channel, nome_selecionado, video_info)
+    # Uploads interrompidos pelo último desligamento continuam de onde pararam
+    await restaurar_checkpoint()
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -1820,8 +6083,8 @@ async def comandos(ctx):
 @bot.command()
 @verificar_canal_correto()
 async def listar(ctx):
-    """Lista vídeos para seleção por reação"""
-    await listar_videos_reacao(ctx=ctx)
+    """Lista vídeos num seletor paginado"""
+    await listar_videos_seletor(ctx=ctx)
 
 @bot.command()
 @verificar_canal_correto()
@@ -1841,14 +6104,166 @@ async def home(ctx):
     """Volta ao menu principal"""
     await mostrar_menu_principal(ctx=ctx)
 
+@bot.command()
+@verificar_canal_correto()
+async def enviar(ctx, *urls):
+    """Recebe um vídeo (anexos e/ou URLs) direto na pasta de vídeos, em streaming"""
+    itens = [(att.url, att.filename, att.size) for att in ctx.message.attachments]
+    for url in urls:
+        itens.append((url, unquote(os.path.basename(urlparse(url).path)), None))
+    
+    if not itens:
+        await ctx.send("📥 **Uso:** `!enviar [url ...]` com o vídeo e, opcionalmente, contexto (.txt/.json), thumbnail e legendas anexados ou como URLs.")
+        return
+    
+    tipos = [TIPO_POR_EXTENSAO.get(os.path.splitext(nome)[1].lower()) for _, nome, _ in itens]
+    if tipos.count('video') != 1:
+        await ctx.send("❌ Envie **exatamente um vídeo** (.mp4, .avi, .mkv ou .mov) por vez.")
+        return
+    if any(tipos.count(tipo) > 1 for tipo in set(tipos) if tipo):
+        await ctx.send("❌ Envie no máximo um arquivo de cada tipo (vídeo, contexto, thumbnail, legendas).")
+        return
+    
+    nome_video = itens[tipos.index('video')][1]
+    nome_base = sanitizar_nome_base(os.path.splitext(nome_video)[0])
+    mensagem = await ctx.send(f"📥 Recebendo `{nome_base}` ({len(itens)} arquivo(s))...")
+    ultima_edicao = [0.0]
+    
+    async def progresso(nome, recebidos, total):
+        # Editar no máximo a cada 5 segundos para não esbarrar no rate limit
+        agora = time.monotonic()
+        if agora - ultima_edicao[0] < 5:
+            return
+        ultima_edicao[0] = agora
+        total_txt = f" de {total / 1024**2:.1f} MB" if total else ""
+        try:
+            await mensagem.edit(content=f"📥 Recebendo `{nome}`: {recebidos / 1024**2:.1f} MB{total_txt}...")
+        except discord.HTTPException:
+            pass
+    
+    async def aguardando_espaco(motivo):
+        try:
+            await mensagem.edit(content=f"💽 `{nome_base}` aguardando a fila liberar espaço em disco: {motivo}...")
+        except discord.HTTPException:
+            pass
+    
+    try:
+        publicados = await ingerir_pacote(itens, nome_base, progresso, aguardando_espaco, renomear=True)
+    except ErroIngestao as e:
+        await mensagem.edit(content=f"❌ **Envio recusado:** {e}")
+        return
+    
+    nome_base = os.path.splitext(os.path.basename(publicados['video']))[0]  # Pode ter ganhado sufixo
+    linhas = [f"• {tipo}: `{os.path.basename(caminho)}`" for tipo, caminho in publicados.items()]
+    await mensagem.edit(content=f"✅ **Vídeo recebido:** `{nome_base}`\n" + "\n".join(linhas) + "\n\nUse `!listar` para processá-lo.")
+
+@bot.command()
+@verificar_canal_correto()
+async def metricas(ctx):
+    """Mostra as métricas internas do bot em JSON"""
+    texto = json.dumps(coletar_metricas(), indent=2, ensure_ascii=False)
+    if len(texto) > 1900:
+        texto = texto[:1900] + "\n..."
+    await ctx.send(f"📈 **Métricas do bot:**\n```json\n{texto}\n```")
+
+@bot.command()
+@verificar_canal_correto()
+async def historico(ctx, *args):
+    """Mostra os últimos uploads (de um jogo, se informado) e a velocidade média da semana"""
+    limite = 10
+    if args and args[-1].isdigit():
+        limite = max(1, min(int(args[-1]), 20))
+        args = args[:-1]
+    jogo = " ".join(args).strip() or None
+    
+    banco = obter_historico_uploads()
+    uploads = await executar_em_thread(banco.ultimos, limite, jogo)
+    semana = await executar_em_thread(banco.resumo_desde, inicio_da_semana())
+    
+    embed = discord.Embed(
+        title=f"📚 Histórico de Uploads - {jogo}" if jogo else "📚 Histórico de Uploads",
+        color=0x0099ff
+    )
+    if not uploads:
+        embed.description = f"📭 Nenhum upload registrado{f' para **{jogo}**' if jogo else ''}."
+    
+    for upload in uploads:
+        detalhes = [upload['jogo'] or "?"]
+        if upload['episodio'] is not None:
+            detalhes.append(f"Ep. {upload['episodio']}")
+        if upload['parte'] is not None:
+            detalhes.append(f"Parte {upload['parte']}")
+        valor = f"🎮 {' • '.join(detalhes)} • 📅 {upload['data'].replace('T', ' ')[:16]}\n"
+        if upload['status'] == 'sucesso':
+            valor += f"🔗 {upload['url']}\n"
+            if upload['bytes'] and upload['segundos_envio']:
+                valor += f"📦 {upload['bytes'] / (1024 * 1024):.1f} MB em {upload['segundos_envio']:.0f}s ({upload['mb_por_segundo']:.2f} MB/s)"
+        else:
+            valor += f"❌ {truncar(upload['erro'] or 'Erro no upload', 150)}"
+        if upload['tentativas'] and upload['tentativas'] > 1:
+            valor += f" • 🔁 {upload['tentativas']} tentativas"
+        icone = "✅" if upload['status'] == 'sucesso' else "❌"
+        embed.add_field(name=f"{icone} {truncar(upload['titulo'] or upload['arquivo'] or '?', 240)}", value=valor, inline=False)
+    
+    media = f"{semana['mb_por_segundo']:.2f} MB/s" if semana['mb_por_segundo'] else "-"
+    embed.add_field(
+        name="📈 Esta Semana",
+        value=(
+            f"• Uploads concluídos: `{semana['uploads']}`\n"
+            f"• Enviado: `{semana['bytes'] / (1024 ** 3):.2f} GB`\n"
+            f"• Velocidade média: `{media}`"
+        ),
+        inline=False
+    )
+    embed.set_footer(text=f"Use !historico <jogo> <N> para filtrar • {ARQUIVO_HISTORICO}")
+    await ctx.send(embed=embed)
+
+@bot.command()
+@verificar_canal_correto()
+async def lote(ctx, *, jogo: str = None):
+    """Gera de uma vez os metadados dos vídeos da pasta (de um jogo, se informado)"""
+    if not DEEPSEEK_API_KEY:
+        await ctx.send("❌ `DEEPSEEK_API_KEY` não configurada: a geração em lote precisa da API do DeepSeek.")
+        return
+    
+    mensagem = await ctx.send(f"🧠 Gerando metadados em lote{f' para **{jogo}**' if jogo else ''}...")
+    inicio = time.monotonic()
+    chamadas_antes = estatisticas_deepseek['chamadas']
+    resumo, sem_numero = await preparar_lote_metadados(jogo)
+    
+    embed = discord.Embed(title="🧠 Metadados Gerados em Lote", color=0x00ff00)
+    if not resumo:
+        embed.description = "✅ Nenhum vídeo pendente: todos já têm metadados gerados (ou a pasta está vazia)."
+    for nome_jogo, dados in resumo.items():
+        faltando = dados['pedidos'] - dados['gerados']
+        valor = f"✅ `{dados['gerados']}/{dados['pedidos']}` episódio(s) gerado(s)"
+        if faltando:
+            valor += f"\n⚠️ `{faltando}` sem resposta válida: serão gerados individualmente ao processar"
+        embed.add_field(name=f"🎮 {truncar(nome_jogo, 200)}", value=valor, inline=False)
+    if sem_numero:
+        embed.add_field(
+            name="ℹ️ Sem Número de Episódio",
+            value=truncar(", ".join(f"`{nome}`" for nome in sem_numero), 1000) + "\nO episódio é inferido ao processar; gerados individualmente.",
+            inline=False
+        )
+    embed.set_footer(text=f"{estatisticas_deepseek['chamadas'] - chamadas_antes} requisição(ões) em {time.monotonic() - inicio:.1f}s • use !listar para processar")
+    await mensagem.edit(content=None, embed=embed)
+
 @bot.command()
 @verificar_canal_correto()
 @commands.is_owner()
-async def auth_youtube(ctx):
+async def auth_youtube(ctx, nome_perfil: str = None):
     """Força reautenticação com YouTube (apenas dono)"""
+    perfis = obter_perfis()
+    if nome_perfil and nome_perfil not in perfis:
+        await ctx.send(f"❌ Perfil `{nome_perfil}` não existe. Perfis: {', '.join(f'`{nome}`' for nome in perfis)}")
+        return
+    perfil = perfis[nome_perfil] if nome_perfil else obter_perfil_padrao()
+    
     try:
-        await ctx.send("🔄 Iniciando autenticação com YouTube...")
-        youtube = autenticar_youtube()
+        await ctx.send(f"🔄 Iniciando autenticação com YouTube (perfil `{perfil.nome}`)...")
+        perfil.clientes.clear()
+        youtube = await obter_cliente_youtube(perfil)
         if youtube:
             await ctx.send("✅ Autenticação com YouTube realizada com sucesso!")
         else:
@@ -1856,45 +6271,294 @@ async def auth_youtube(ctx):
     except Exception as e:
         await ctx.send(f"❌ Erro na autenticação: {e}")
 
+@bot.command()
+@verificar_canal_correto()
+@commands.is_owner()
+async def banda(ctx, acao: str = None, *args):
+    """Mostra ou ajusta os limites de banda de upload sem reiniciar (apenas dono)"""
+    limitador = obter_limitador_banda()
+    uso = (
+        "📶 **Uso:**\n"
+        "`!banda` - Mostra os limites\n"
+        "`!banda global <Mbps>` - Limite somado de todos os uploads (0 = sem limite)\n"
+        "`!banda envio <Mbps>` - Limite de cada upload\n"
+        "`!banda horario <HH:MM> <HH:MM> <global> <envio>` - Limites numa faixa de horário\n"
+        "`!banda remover <HH:MM>` - Remove a faixa que começa nesse horário"
+    )
+    
+    try:
+        if acao in ("global", "envio") and len(args) == 1:
+            mbps = float(args[0])
+            if mbps < 0:
+                raise ValueError
+            limitador.definir_padrao('global_mbps' if acao == "global" else 'por_envio_mbps', mbps)
+        elif acao == "horario" and len(args) == 4:
+            inicio, fim = args[0], args[1]
+            if not all(re.fullmatch(r'([01]\d|2[0-3]):[0-5]\d', horario) for horario in (inicio, fim)):
+                raise ValueError
+            global_mbps, envio_mbps = float(args[2]), float(args[3])
+            if global_mbps < 0 or envio_mbps < 0:
+                raise ValueError
+            limitador.definir_faixa(inicio, fim, global_mbps, envio_mbps)
+        elif acao == "remover" and len(args) == 1:
+            if not limitador.remover_faixa(args[0]):
+                await ctx.send(f"❌ Nenhuma faixa começa às `{args[0]}`.")
+                return
+        elif acao is not None:
+            await ctx.send(uso)
+            return
+    except ValueError:
+        await ctx.send("❌ Valores inválidos. Horários no formato `HH:MM` e limites em Mbps (0 = sem limite).\n" + uso)
+        return
+    
+    atuais = limitador.limites_atuais()
+    linhas = [
+        f"**Padrão:** global {formatar_limite(limitador.config['global_mbps'])} | por envio {formatar_limite(limitador.config['por_envio_mbps'])}",
+    ]
+    for faixa in limitador.config['horarios']:
+        linhas.append(
+            f"**{faixa['inicio']}-{faixa['fim']}:** global {formatar_limite(faixa['global_mbps'])} | "
+            f"por envio {formatar_limite(faixa['por_envio_mbps'])}"
+        )
+    faixa_atual = f" (faixa {atuais['faixa']})" if atuais['faixa'] else ""
+    linhas.append(
+        f"\n▶️ **Em vigor agora{faixa_atual}:** "
+        f"global {formatar_limite(atuais['global_mbps'])} | por envio {formatar_limite(atuais['por_envio_mbps'])}"
+    )
+    await ctx.send("📶 **Limites de banda de upload**\n" + "\n".join(linhas))
+
+@bot.command()
+@verificar_canal_correto()
+@commands.is_owner()
+async def gerador(ctx, nome: str = None, *, jogo: str = None):
+    """Mostra ou troca o gerador de metadados, no geral ou de um jogo (apenas dono)"""
+    config = obter_config_geradores()
+    nomes = ", ".join(f"`{n}`" for n in GERADORES_METADADOS)
+    uso = (
+        "🧠 **Uso:**\n"
+        "`!gerador` - Mostra os geradores em uso\n"
+        "`!gerador <nome>` - Gerador padrão de todos os jogos\n"
+        "`!gerador <nome> <jogo>` - Gerador de um jogo\n"
+        "`!gerador remover <jogo>` - Volta o jogo para o gerador padrão\n"
+        f"Geradores: {nomes}"
+    )
+    
+    if nome is not None:
+        nome = nome.lower()
+        if nome == "remover" and jogo:
+            config.definir_provedor(None, jogo)
+        elif nome in GERADORES_METADADOS:
+            config.definir_provedor(nome, jogo)
+        else:
+            await ctx.send(uso)
+            return
+    
+    padrao = config.provedor("*")
+    linhas = [f"**Padrão:** `{padrao}`"]
+    for chave, provedor in sorted(config.config['provedores'].items()):
+        if chave != '*':
+            linhas.append(f"**{chave}:** `{provedor}`")
+    linhas.append("")
+    for gerador_metadados in GERADORES_METADADOS.values():
+        estado = "✅" if gerador_metadados.disponivel() else "⚠️ indisponível (cai no local)"
+        linhas.append(f"`{gerador_metadados.nome}` - {gerador_metadados.descricao} {estado}")
+    await ctx.send("🧠 **Geradores de metadados**\n" + "\n".join(linhas))
+
 @bot.command()
 @verificar_canal_correto()
 @commands.is_owner()
 async def limpar_fila(ctx):
     """Limpa a fila de uploads (apenas dono)"""
-    global fila_uploads, fila_ativa
+    global fila_ativa
     
-    if fila_uploads.empty() and not upload_em_andamento:
+    if not total_na_fila() and not uploads_em_andamento():
         await ctx.send("📭 A fila já está vazia.")
         return
     
-    # Criar nova fila vazia
-    while not fila_uploads.empty():
-        try:
-            fila_uploads.get_nowait()
-            fila_uploads.task_done()
-        except:
-            break
+    # Esvaziar a fila de cada perfil
+    for perfil in obter_perfis().values():
+        for tarefa in perfil.fila.esvaziar():
+            descartar_painel(tarefa.mensagem_status)
     
     fila_ativa.clear()
     
     await ctx.send("🗑️ **Fila limpa!** Todos os uploads pendentes foram removidos.")
     await atualizar_fila_global()
 
+def ler_numero_tarefa(texto):
+    """Número da tarefa em "#12" ou "12"; None se não for um número"""
+    texto = (texto or "").lstrip('#')
+    return int(texto) if texto.isdigit() else None
+
+@bot.command()
+@verificar_canal_correto()
+@commands.is_owner()
+async def pausar(ctx):
+    """Pausa todos os uploads no fim do chunk atual (apenas dono)"""
+    if not controle_uploads.pausar():
+        await ctx.send("⏸️ Os uploads já estão pausados. Use `!retomar` para continuar.")
+        return
+    await ctx.send(
+        f"⏸️ **Uploads pausados.** Os envios em andamento (`{uploads_em_andamento()}`) param no fim do chunk atual "
+        f"e nenhuma tarefa nova começa (`{total_na_fila()}` na fila). Use `!retomar` para continuar."
+    )
+    await atualizar_fila_global()
+
+@bot.command()
+@verificar_canal_correto()
+@commands.is_owner()
+async def retomar(ctx):
+    """Retoma os uploads pausados do ponto em que pararam (apenas dono)"""
+    if not controle_uploads.retomar():
+        await ctx.send("▶️ Os uploads não estão pausados.")
+        return
+    await ctx.send("▶️ **Uploads retomados.** Os envios continuam do chunk em que pararam.")
+    await atualizar_fila_global()
+
+@bot.command()
+@verificar_canal_correto()
+@commands.is_owner()
+async def cancelar(ctx, numero: str = None):
+    """Cancela uma tarefa pelo número: sai da fila ou, se em envio, para no próximo chunk (apenas dono)"""
+    tarefa = localizar_tarefa(ler_numero_tarefa(numero))
+    if tarefa is None:
+        await ctx.send("❌ Tarefa não encontrada. Use `!cancelar <#N>` com o número mostrado na fila.")
+        return
+    
+    if tarefa.perfil.fila.remover(tarefa):
+        # Ainda não tinha começado: sai da fila na hora
+        fila_ativa.pop(tarefa.id_tarefa, None)
+        tarefa.status = "cancelado"
+        await atualizar_status_fila(tarefa)
+        descartar_painel(tarefa.mensagem_status)
+        await ctx.send(f"🛑 **Tarefa `#{tarefa.numero}` removida da fila:** {tarefa.titulo}")
+        await atualizar_fila_global()
+        return
+    
+    controle_uploads.cancelar(tarefa)
+    if tarefa.status == "aguardando_cota":
+        detalhe = "A tarefa sai agora da espera pela cota e libera a vaga."
+    else:
+        detalhe = "O envio para no fim do chunk atual e a sessão de upload no YouTube é encerrada."
+    await ctx.send(f"🛑 **Cancelando `#{tarefa.numero}`:** {tarefa.titulo}\n{detalhe}")
+
+@bot.command()
+@verificar_canal_correto()
+@commands.is_owner()
+async def mover(ctx, numero: str = None, posicao: int = None):
+    """Muda a posição de uma tarefa que ainda está na fila (apenas dono)"""
+    tarefa = localizar_tarefa(ler_numero_tarefa(numero))
+    if tarefa is None or posicao is None or posicao < 1:
+        await ctx.send("❌ Uso: `!mover <#N> <posição>` (posição 1 = próxima a ser enviada).")
+        return
+    fila = tarefa.perfil.fila
+    if tarefa not in fila.tarefas:
+        await ctx.send(f"❌ A tarefa `#{tarefa.numero}` já está sendo enviada.")
+        return
+    
+    nova_posicao = fila.mover(tarefa, posicao)
+    await ctx.send(f"↕️ **Tarefa `#{tarefa.numero}` agora está na posição `{nova_posicao}`** da fila `{tarefa.perfil.nome}`.")
+    # Os painéis só são editados onde a posição mudou de fato
+    for outra in list(fila.tarefas):
+        await atualizar_status_fila(outra)
+    await atualizar_fila_global()
+
+# ========== PRÉVIA DOS METADADOS EM STREAMING ==========
+
+INTERVALO_PREVIA_STREAMING = 1.5  # Segundos mínimos entre edições da prévia (limite de edições do Discord)
+
+class PreviaMetadados:
+    """Embed de validação preenchido enquanto o gerador responde; pedaços próximos viram uma edição só"""
+    def __init__(self, mensagem, view, intervalo=INTERVALO_PREVIA_STREAMING):
+        self.mensagem = mensagem
+        self.view = view
+        self.intervalo = intervalo
+        self.titulo = ""
+        self.descricao = ""
+        self._pendente = False
+        self._tarefa = None
+        self._ultima_edicao = time.monotonic()
+        self._assinatura = assinatura_embed(mensagem.embeds[0]) if getattr(mensagem, 'embeds', None) else None
+        self._view_publicada = view.liberada
+        self._travada = False
+
+    async def receber(self, leitor):
+        """Recebe o JSON parcial a cada pedaço do streaming"""
+        titulo, completo = leitor.campo('titulo')
+        descricao, _ = leitor.campo('descricao')
+        self.titulo = titulo or ""
+        self.descricao = descricao or ""
+        if completo and not self.view.liberada and not self._travada:
+            self.view.liberar()
+            self._ultima_edicao = 0.0  # Botões liberados aparecem na hora, sem esperar o intervalo
+        self._agendar_edicao()
+
+    def bloquear(self):
+        """Segunda tentativa em paralelo: o texto na tela pode ser trocado pelo dela, então aprovar
+        e editar ficam travados até o concluir mostrar o resultado que venceu"""
+        self._travada = True
+        if self.view.liberada:
+            self.view.liberar(False)
+            self._ultima_edicao = 0.0
+        self._agendar_edicao()
+
+    def _agendar_edicao(self):
+        self._pendente = True
+        if self._tarefa is None or self._tarefa.done():
+            self._tarefa = asyncio.get_running_loop().create_task(self._publicar_pendentes())
+
+    async def _publicar_pendentes(self):
+        while self._pendente:
+            espera = self._ultima_edicao + self.intervalo - time.monotonic()
+            if espera > 0:
+                await asyncio.sleep(espera)
+            self._pendente = False
+            await self._editar(montar_embed_validacao(self.titulo, self.descricao, gerando=True))
+
+    async def _editar(self, embed):
+        assinatura = assinatura_embed(embed)
+        mudou_view = self._view_publicada != self.view.liberada
+        if assinatura == self._assinatura and not mudou_view:
+            return
+        self._ultima_edicao = time.monotonic()
+        try:
+            if mudou_view:
+                await self.mensagem.edit(embed=embed, view=self.view)
+            else:
+                await self.mensagem.edit(embed=embed)
+            self._assinatura = assinatura
+            self._view_publicada = self.view.liberada
+        except discord.HTTPException as e:
+            print(f"Erro ao atualizar prévia dos metadados: {e}")
+
+    async def concluir(self, titulo, descricao):
+        """Mostra o resultado final (já validado) e garante os botões liberados"""
+        self.encerrar()
+        self.view.liberar()
+        await self._editar(montar_embed_validacao(titulo, descricao))
+
+    def encerrar(self):
+        self._pendente = False
+        if self._tarefa is not None and not self._tarefa.done():
+            self._tarefa.cancel()
+
 # ========== PROCESSAMENTO DE VÍDEOS (funções atualizadas) ==========
 
-async def processar_edicao_metadados(ctx, video_info, titulo_original, descricao_original):
-    """Processa a edição dos metadados pelo usuário"""
-    view = ValidacaoView(timeout=TIMEOUT_INTERACOES)
+def montar_embed_validacao(titulo, descricao, gerando=False):
+    """Embed de revisão dos metadados; `gerando` indica que o texto ainda está chegando do DeepSeek"""
     embed_validacao = discord.Embed(
         title="✏️ Validação de Metadados - REVISÃO OBRIGATÓRIA",
-        description="**Revise e valide os metadados gerados antes do upload:**",
-        color=0xff9900
+        description=(
+            "🧠 **Gerando título e descrição...** Os botões são liberados assim que o título estiver completo."
+            if gerando else "**Revise e valide os metadados gerados antes do upload:**"
+        ),
+        color=0x0099ff if gerando else 0xff9900
     )
     
-    embed_validacao.add_field(name="🎬 Título Gerado", value=f"```{titulo_original}```", inline=False)
+    embed_validacao.add_field(name="🎬 Título Gerado", value=f"```{titulo or '⏳'}```", inline=False)
     
     # Mostrar descrição de forma organizada
-    linhas_descricao = descricao_original.split('\n')
+    linhas_descricao = descricao.split('\n')
     descricao_preview = ""
     for linha in linhas_descricao[:15]:  # Limitar preview
         if linha.strip():
@@ -1903,7 +6567,7 @@ async def processar_edicao_metadados(ctx, video_info, titulo_original, descricao
     if len(linhas_descricao) > 15:
         descricao_preview += "...\n*(descrição continua)*"
     
-    embed_validacao.add_field(name="📝 Descrição Gerada", value=f"```{descricao_preview}```", inline=False)
+    embed_validacao.add_field(name="📝 Descrição Gerada", value=f"```{truncar(descricao_preview, 1000) or '⏳'}```", inline=False)
     
     embed_validacao.add_field(
         name="📋 Opções de Validação",
@@ -1921,8 +6585,13 @@ async def processar_edicao_metadados(ctx, video_info, titulo_original, descricao
         value="⚠️ **Após o upload bem-sucedido, todos os arquivos deste vídeo serão EXCLUÍDOS automaticamente!**",
         inline=False
     )
-    
-    mensagem_validacao = await ctx.send(embed=embed_validacao, view=view)
+    return embed_validacao
+
+async def processar_edicao_metadados(ctx, video_info, titulo_original, descricao_original, view=None):
+    """Processa a edição dos metadados pelo usuário (`view` já enviada pela prévia em streaming, se houver)"""
+    if view is None:
+        view = ValidacaoView(timeout=TIMEOUT_INTERACOES)
+        await ctx.send(embed=montar_embed_validacao(titulo_original, descricao_original), view=view)
     
     # Aguardar decisão do usuário
     await view.wait()
@@ -2009,7 +6678,7 @@ async def processar_edicao_metadados(ctx, video_info, titulo_original, descricao
         return None, None, False
 
 async def processar_video_selecionado(ctx, nome_arquivo, video_info):
-    """Processa um vídeo selecionado por reação - VERSÃO COM VERIFICAÇÃO DE ARQUIVOS OBRIGATÓRIOS"""
+    """Processa um vídeo selecionado no seletor - VERSÃO COM VERIFICAÇÃO DE ARQUIVOS OBRIGATÓRIOS"""
     global ultima_mensagem_status
     
     await ctx.send(f"🔄 Processando `{nome_arquivo}`...")
@@ -2026,41 +6695,87 @@ async def processar_video_selecionado(ctx, nome_arquivo, video_info):
     # Mostrar status final dos arquivos
     await ctx.send("✅ **Todos os arquivos obrigatórios estão presentes!** Continuando com o processamento...")
     
+    # Validar a mídia antes de gastar API e banda com um arquivo que o YouTube recusaria
+    validacao = await validar_pacote_video_async(video_info)
+    await mostrar_validacao_midia(ctx, validacao)
+    if not validacao['valido']:
+        await ctx.send("❌ **Processo cancelado.** Corrija os arquivos e tente novamente.")
+        return
+    
     # Extrair informações do arquivo
     nome_arquivo_video = os.path.basename(video_info.get('video', ''))
     nome_jogo, numero_episodio = extrair_info_arquivo(nome_arquivo_video)
     
+    # Sem número no nome: seguir a sequência já publicada (ou na fila) deste jogo
+    catalogo = obter_catalogo_episodios()
+    texto_episodio = numero_episodio
+    if not numero_episodio:
+        numero_episodio = catalogo.proximo_episodio(nome_jogo)
+        video_info['episodio_inferido'] = numero_episodio
+        texto_episodio = f"{numero_episodio} (inferido pelo histórico)"
+    
     embed_info = discord.Embed(
         title="🔍 Informações Detectadas do Arquivo",
         color=0x0099ff
     )
     embed_info.add_field(name="🎮 Nome do Jogo", value=nome_jogo, inline=True)
-    embed_info.add_field(name="📺 Episódio", value=numero_episodio if numero_episodio else "Não detectado", inline=True)
+    embed_info.add_field(name="📺 Episódio", value=texto_episodio, inline=True)
     embed_info.add_field(name="📁 Arquivo", value=nome_arquivo_video, inline=False)
     
+    # Só faz sentido comparar com a sequência se o número é mesmo de episódio (e não de "Parte")
+    if analisar_nome_arquivo(nome_arquivo_video)[1] is not None:
+        lacunas = catalogo.lacunas(nome_jogo, ate=numero_episodio)
+        if lacunas:
+            embed_info.add_field(name="⚠️ Episódios Faltando", value=f"Ep. {formatar_lacunas(lacunas)} ainda não foram publicados nem estão na pasta.", inline=False)
+        if catalogo.ja_publicado(nome_jogo, numero_episodio):
+            embed_info.add_field(name="⚠️ Episódio Repetido", value=f"O episódio {numero_episodio} de {nome_jogo} já foi publicado.", inline=False)
+    
     mensagem_info = await ctx.send(embed=embed_info)
     ultima_mensagem_status = mensagem_info
     
     # Ler contexto
-    contexto = f"Jogo: {nome_jogo}"
-    if numero_episodio:
-        contexto += f" | Episódio: {numero_episodio}"
-    
-    if 'contexto' in video_info:
-        try:
-            with open(video_info['contexto'], 'r', encoding='utf-8') as f:
-                contexto_adicional = f.read()
-            contexto += f"\nContexto Adicional: {contexto_adicional}"
-            await ctx.send("📄 Contexto adicional carregado com sucesso.")
-        except Exception as e:
-            await ctx.send(f"⚠️ Erro ao ler contexto adicional: {e}")
-    
-    # Gerar metadados com DeepSeek
-    await ctx.send("🧠 Gerando título e descrição otimizados para gameplay...")
-    titulo_gerado, descricao_gerada = await gerar_metadados_deepseek(contexto, nome_jogo, numero_episodio)
+    try:
+        contexto = await carregar_contexto_video(video_info, nome_jogo, numero_episodio)
+        if video_info.get('contexto'):
+            lido = await executar_em_thread(ler_contexto_arquivo, video_info['contexto'])
+            aviso = ""
+            if lido['truncado']:
+                aviso = f" Arquivo de {lido['tamanho'] / 1024:.0f} KB resumido para ~{ORCAMENTO_TOKENS_CONTEXTO} tokens."
+            await ctx.send(f"📄 Contexto adicional carregado com sucesso ({lido['formato']}, {lido['codificacao']}).{aviso}")
+    except Exception as e:
+        contexto = montar_contexto_video({}, nome_jogo, numero_episodio)
+        await ctx.send(f"⚠️ Erro ao ler contexto adicional: {e}")
+    
+    # Metadados já gerados pelo !lote para este mesmo episódio e contexto dispensam outra chamada
+    chave = chave_metadados(nome_jogo, numero_episodio, contexto)
+    gerados = obter_cache_metadados().obter(chave)
+    view_validacao = None
+    if gerados:
+        await ctx.send("♻️ Usando título e descrição gerados em lote (`!lote`).")
+        titulo_gerado, descricao_gerada = gerados
+    else:
+        # Gerar metadados (DeepSeek ou local), mostrando o texto no embed de validação à medida que chega
+        view_validacao = ValidacaoView(timeout=TIMEOUT_INTERACOES, bloqueada=True)
+        mensagem_validacao = await ctx.send(embed=montar_embed_validacao("", "", gerando=True), view=view_validacao)
+        previa = PreviaMetadados(mensagem_validacao, view_validacao)
+        geracao = asyncio.ensure_future(gerar_metadados(
+            contexto, nome_jogo, numero_episodio, ao_parcial=previa.receber, ao_segunda_tentativa=previa.bloquear
+        ))
+        decisao = asyncio.ensure_future(view_validacao.wait())
+        await asyncio.wait({geracao, decisao}, return_when=asyncio.FIRST_COMPLETED)
+        
+        # Cancelado antes do fim: não há por que esperar o resto da resposta
+        if not geracao.done() and not view_validacao.continuar:
+            geracao.cancel()
+            previa.encerrar()
+            await ctx.send("❌ **Upload cancelado pelo usuário.**")
+            return
+        
+        titulo_gerado, descricao_gerada = await geracao
+        await previa.concluir(titulo_gerado, descricao_gerada)
     
-    # Validação humana dos metadados
-    titulo_final, descricao_final, continuar = await processar_edicao_metadados(ctx, video_info, titulo_gerado, descricao_gerada)
+    # Validação humana dos metadados (quem aprovou durante a geração aprova o texto final)
+    titulo_final, descricao_final, continuar = await processar_edicao_metadados(ctx, video_info, titulo_gerado, descricao_gerada, view=view_validacao)
     
     if not continuar:
         return
@@ -2162,6 +6877,8 @@ async def processar_video_selecionado(ctx, nome_arquivo, video_info):
             video_info.get('thumb'),
             agendar
         )
+        if tarefa is None:
+            return
         
         # OFERECER PRÓXIMO PASSO APÓS ADICIONAR À FILA
         await asyncio.sleep(1)  # Pequena pausa para melhor UX
@@ -2171,7 +6888,11 @@ async def processar_video_selecionado(ctx, nome_arquivo, video_info):
         await ctx.send(f"⏰ Tempo esgotado ({TIMEOUT_INTERACOES//60} minutos). Operação cancelada.")
 
 # Executar o bot
-if __name__ == "__main__":
+if __name__ == "__main__" and MODO_TRABALHADOR:
+    argumentos = ler_argumentos_trabalhador()
+    perfis_trabalhador = [nome.strip() for nome in argumentos.perfis.split(',') if nome.strip()]
+    asyncio.run(executar_trabalhador(argumentos.nome, argumentos.vagas, perfis_trabalhador or None))
+elif __name__ == "__main__":
     # Verificar se a pasta de vídeos existe
     if not os.path.exists(PASTA_VIDEOS):
         os.makedirs(PASTA_VIDEOS)